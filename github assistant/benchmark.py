@@ -0,0 +1,1158 @@
+#!/usr/bin/env python3
+"""
+GitHub PR MCP Server Benchmark
+Yerel sahte GitHub API'si üzerinde tool'ların hız ve bellek ölçümü
+
+Her tool hem doğrudan handle_call_tool ile hem de stdio MCP taşıması
+üzerinden (main() ile başlatılan alt süreç) çalıştırılır. Sonuçlar JSON
+olarak yazılır; --baseline ile önceki bir çalıştırmayla karşılaştırılır.
+
+Örnek:
+    python benchmark.py --iterations 200 --latency-ms 5 --output bench.json
+    python benchmark.py --baseline bench.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "github_pr_server.py")
+REPO_URL = "bench/repo"
+
+# Sahte GitHub API'si
+
+@dataclass
+class FakeGitHubConfig:
+    """Sahte API davranışı"""
+    latency: float = 0.0
+    total_pulls: int = 250
+    total_files: int = 120
+    rate_limit: int = 5000
+    rate_limit_window: float = 3600.0
+    error_rate: float = 0.0
+    etags: bool = True
+
+class FakeGitHubState:
+    """Sahte API'nin paylaşılan durumu ve sayaçları"""
+
+    def __init__(self, config: FakeGitHubConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.random = random.Random(42)
+        self.requests = 0
+        self.errors_injected = 0
+        self.not_modified = 0
+        self.rate_limited = 0
+        # GitHub gibi bütçe token başına tutulur: token -> [kalan, sıfırlanma zamanı]
+        self.budgets: Dict[str, List[float]] = {}
+        self.requests_by_token: Dict[str, int] = {}
+        # Doğrulama senaryoları için yol başına istek sayısı ve sıraya konmuş yanıtlar
+        self.hits: Dict[str, int] = {}
+        self.scripted: Dict[str, List[Tuple[int, Any, Dict[str, str]]]] = {}
+        # Yola gelen istekler yanıtlanmadan önce bu kadar saniye bekletilir
+        self.delays: Dict[str, float] = {}
+        self.next_id = 1000
+
+    def script(self, path: str, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        """Yola gelecek sonraki istek için hazır yanıt sırala"""
+        with self.lock:
+            self.scripted.setdefault(path, []).append((status, payload, headers or {}))
+
+    def record(self, path: str) -> Optional[Tuple[int, Any, Dict[str, str]]]:
+        """İsteği say; yol için sıralanmış yanıt varsa onu döndür"""
+        with self.lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            queue = self.scripted.get(path)
+            return queue.pop(0) if queue else None
+
+    def budget(self, token: str) -> List[float]:
+        """Token'ın bütçesini döndür; pencere dolduysa sıfırla (lock altında çağrılır)"""
+        now = time.time()
+        budget = self.budgets.get(token)
+        if budget is None or now >= budget[1]:
+            budget = self.budgets[token] = [self.config.rate_limit, now + self.config.rate_limit_window]
+        return budget
+
+    def take_budget(self, token: str) -> Tuple[bool, int, int]:
+        """Token'ın hız sınırı bütçesinden bir istek düş"""
+        with self.lock:
+            budget = self.budget(token)
+            self.requests += 1
+            self.requests_by_token[token] = self.requests_by_token.get(token, 0) + 1
+            if budget[0] <= 0:
+                self.rate_limited += 1
+                return False, 0, int(budget[1])
+            budget[0] -= 1
+            return True, int(budget[0]), int(budget[1])
+
+    def inject_error(self) -> bool:
+        """Yapılandırılan oranda geçici hata üret"""
+        with self.lock:
+            if self.random.random() < self.config.error_rate:
+                self.errors_injected += 1
+                return True
+            return False
+
+    def new_id(self) -> int:
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+def fake_user(login: str) -> Dict[str, Any]:
+    return {"login": login, "id": abs(hash(login)) % 100000, "type": "User"}
+
+def fake_pull(owner: str, repo: str, number: int, **overrides) -> Dict[str, Any]:
+    """GitHub PR yanıtına benzeyen sahte payload"""
+    updated = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1700000000 + number * 60))
+    pr = {
+        "id": 5000000 + number,
+        "number": number,
+        "title": f"Benchmark PR #{number}",
+        "body": "Benchmark için oluşturulmuş sahte pull request açıklaması. " * 4,
+        "state": "open",
+        "draft": False,
+        "locked": False,
+        "user": fake_user(f"author{number % 7}"),
+        "head": {"ref": f"feature-{number}", "sha": hashlib.sha1(str(number).encode()).hexdigest()},
+        "base": {"ref": "main", "sha": "0" * 40},
+        "labels": [{"name": "bench", "color": "ededed"}],
+        "requested_reviewers": [fake_user("reviewer1")],
+        "requested_teams": [],
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": updated,
+        "merged": False,
+        "mergeable": True,
+        "mergeable_state": "clean",
+        "comments": 3,
+        "review_comments": 2,
+        "commits": 4,
+        "additions": 120,
+        "deletions": 40,
+        "changed_files": 12,
+        "html_url": f"https://github.com/{owner}/{repo}/pull/{number}",
+        "url": f"https://api.github.com/repos/{owner}/{repo}/pulls/{number}",
+    }
+    pr.update(overrides)
+    return pr
+
+def fake_reviews() -> List[Dict[str, Any]]:
+    return [
+        {"id": i, "state": "APPROVED" if i % 2 else "COMMENTED", "user": fake_user(f"reviewer{i}"), "body": "LGTM"}
+        for i in range(3)
+    ]
+
+def fake_check_runs() -> Dict[str, Any]:
+    return {"total_count": 2, "check_runs": [
+        {"name": "tests", "status": "completed", "conclusion": "success"},
+        {"name": "lint", "status": "completed", "conclusion": "success"},
+    ]}
+
+def fake_file(index: int) -> Dict[str, Any]:
+    return {
+        "sha": hashlib.sha1(str(index).encode()).hexdigest(),
+        "filename": f"src/module_{index}.py",
+        "status": ("modified", "added", "removed", "renamed")[index % 4],
+        "additions": index % 30,
+        "deletions": index % 11,
+        "changes": index % 30 + index % 11,
+        "patch": "@@ -1,3 +1,4 @@\n-old line\n+new line\n+another line\n" * 5,
+    }
+
+def fake_diff(total_files: int) -> bytes:
+    """compare uç noktasının diff medya türündeki ham yanıtı"""
+    sections = []
+    for index in range(total_files):
+        file = fake_file(index)
+        name = file["filename"]
+        sections.append(f"diff --git a/{name} b/{name}\n--- a/{name}\n+++ b/{name}\n{file['patch']}")
+    return "".join(sections).encode()
+
+def fake_search_item(owner: str, repo: str, number: int) -> Dict[str, Any]:
+    """/search/issues sonucundaki PR kaydı"""
+    pr = fake_pull(owner, repo, number)
+    return {
+        "number": number,
+        "title": pr["title"],
+        "state": pr["state"],
+        "draft": pr["draft"],
+        "user": pr["user"],
+        "labels": pr["labels"],
+        "updated_at": pr["updated_at"],
+        "html_url": pr["html_url"],
+        "repository_url": f"https://api.github.com/repos/{owner}/{repo}",
+        "pull_request": {"merged_at": None},
+    }
+
+def fake_graphql_pull(owner: str, repo: str, number: int, query: str) -> Dict[str, Any]:
+    """fake_pull ile aynı PR'ın GraphQL görünümü; bağlantılar yalnızca sorguda istendiyse eklenir"""
+    pr = fake_pull(owner, repo, number)
+    node = {
+        "title": pr["title"],
+        "body": pr["body"],
+        "state": pr["state"].upper(),
+        "url": pr["html_url"],
+        "createdAt": pr["created_at"],
+        "updatedAt": pr["updated_at"],
+        "additions": pr["additions"],
+        "deletions": pr["deletions"],
+        "headRefName": pr["head"]["ref"],
+        "baseRefName": pr["base"]["ref"],
+        "author": {"login": pr["user"]["login"]},
+        "reviews": {"nodes": [{"state": r["state"], "author": {"login": r["user"]["login"]}} for r in fake_reviews()]},
+    }
+    if "reviewRequests" in query:
+        node["reviewRequests"] = {"nodes": (
+            [{"requestedReviewer": {"login": u["login"]}} for u in pr["requested_reviewers"]]
+            + [{"requestedReviewer": {"slug": t["slug"]}} for t in pr["requested_teams"]]
+        )}
+    if "reviewThreads" in query:
+        node["comments"] = {"totalCount": pr["comments"]}
+        node["reviewThreads"] = {"nodes": [{"comments": {"totalCount": pr["review_comments"]}}]}
+    if "statusCheckRollup" in query:
+        contexts = [
+            {"__typename": "CheckRun", "name": c["name"], "status": c["status"].upper(), "conclusion": c["conclusion"].upper()}
+            for c in fake_check_runs()["check_runs"]
+        ]
+        node["commits"] = {"nodes": [{"commit": {"statusCheckRollup": {"contexts": {"nodes": contexts}}}}]}
+    match = re.search(r"files\(first: (\d+)\)", query)
+    if match:
+        change_types = {"added": "ADDED", "removed": "DELETED", "renamed": "RENAMED"}
+        node["changedFiles"] = pr["changed_files"]
+        node["files"] = {"nodes": [
+            {"path": f["filename"], "additions": f["additions"], "deletions": f["deletions"],
+             "changeType": change_types.get(f["status"], "MODIFIED")}
+            for f in map(fake_file, range(int(match[1])))
+        ]}
+    return node
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """GitHub REST API'sinin bu sunucunun kullandığı alt kümesi"""
+
+    protocol_version = "HTTP/1.1"
+    state: FakeGitHubState = None
+
+    def setup(self):
+        super().setup()
+        # Gecikmeli ACK, istemcinin ayrı yazılan POST gövdesini ~40 ms bekletir
+        if hasattr(socket, "TCP_QUICKACK"):
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PATCH(self):
+        self.handle_request("PATCH")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+    def handle_request(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        state = self.state
+        if state.config.latency:
+            time.sleep(state.config.latency)
+
+        url = urlparse(self.path)
+        path = url.path
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        scripted = state.record(path)
+        if state.delays.get(path):
+            time.sleep(state.delays[path])
+        if scripted is not None:
+            return self.send_json(*scripted)
+
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if path == "/rate_limit":
+            with state.lock:
+                remaining, reset = (int(v) for v in state.budget(token))
+            core = {"limit": state.config.rate_limit, "remaining": remaining, "reset": reset, "used": 0}
+            return self.send_json(200, {"resources": {"core": core}, "rate": core}, path=path)
+
+        allowed, remaining, reset = state.take_budget(token)
+        rate_headers = {
+            "X-RateLimit-Limit": str(state.config.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Resource": "core",
+        }
+        if not allowed:
+            return self.send_json(403, {"message": "API rate limit exceeded"}, rate_headers)
+        if state.inject_error():
+            return self.send_json(502, {"message": "Server Error"}, rate_headers)
+
+        status, payload, extra = self.route(method, path, query, body)
+        rate_headers.update(extra)
+        self.send_json(status, payload, rate_headers, path=url.path if method == "GET" else None)
+
+    def route(self, method: str, path: str, query: Dict[str, str], body: Dict[str, Any]):
+        if path == "/graphql":
+            return self.graphql(body)
+        if path == "/user":
+            return 200, fake_user("bench"), {}
+        parts = path.strip("/").split("/")
+        if parts == ["search", "issues"]:
+            return self.search(path, query)
+        if len(parts) == 3 and parts[0] in ("orgs", "users") and parts[2] == "repos":
+            # Sahibin repository'leri; ilki benchmark repository'sidir
+            names = [REPO_URL.split("/")[1]] + [f"service-{i}" for i in range(4)]
+            return 200, [{"name": n, "archived": False, "owner": {"login": parts[1]}} for n in names], {}
+        if len(parts) == 3 and parts[0] == "repos" and method == "GET":
+            return 200, {"id": 900, "name": parts[2], "full_name": f"{parts[1]}/{parts[2]}"}, {}
+        if len(parts) < 4 or parts[0] != "repos":
+            return 404, {"message": "Not Found"}, {}
+        owner, repo, kind = parts[1], parts[2], parts[3]
+        rest = parts[4:]
+
+        if kind == "pulls" and not rest:
+            if method == "POST":
+                number = self.state.new_id()
+                return 201, fake_pull(owner, repo, number, title=body.get("title"), draft=body.get("draft", False)), {}
+            if "head" in query:
+                return 200, [], {}
+            return self.paginated(
+                path, query, self.state.config.total_pulls,
+                lambda i: fake_pull(owner, repo, self.state.config.total_pulls - i)
+            )
+
+        if kind == "pulls" and rest:
+            number = int(rest[0])
+            sub = rest[1:]
+            if not sub:
+                if method == "PATCH":
+                    return 200, fake_pull(owner, repo, number, **body), {}
+                return 200, fake_pull(owner, repo, number), {}
+            if sub == ["reviews"]:
+                if method == "POST":
+                    return 200, {
+                        "id": self.state.new_id(), "state": body.get("event", "COMMENTED"),
+                        "body": body.get("body", ""), "user": fake_user("bench"),
+                        "html_url": f"https://github.com/{owner}/{repo}/pull/{number}#review",
+                    }, {}
+                return 200, fake_reviews(), {}
+            if sub == ["files"]:
+                return self.paginated(path, query, self.state.config.total_files, fake_file)
+            if sub == ["update-branch"]:
+                return 202, {"message": "Updating pull request branch."}, {}
+            if sub == ["merge"]:
+                return 200, {"merged": True, "sha": "a" * 40, "message": "Pull Request successfully merged"}, {}
+            if sub == ["requested_reviewers"]:
+                return 201, fake_pull(
+                    owner, repo, number,
+                    requested_reviewers=[fake_user(r) for r in body.get("reviewers", [])]
+                ), {}
+
+        if kind == "issues" and len(rest) == 2 and rest[1] == "comments":
+            if method == "POST":
+                return 201, {
+                    "id": self.state.new_id(), "body": body.get("body", ""), "user": fake_user("bench"),
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "html_url": f"https://github.com/{owner}/{repo}/pull/{rest[0]}#comment",
+                }, {}
+            return 200, [], {}
+
+        if kind == "contents" and "/".join(rest) == ".github/CODEOWNERS":
+            return 200, b"* @reviewer1\n/src/ @reviewer2 @reviewer3\n", {}
+
+        if kind == "compare" and rest:
+            return 200, fake_diff(self.state.config.total_files), {}
+
+        if kind == "git" and rest[:1] == ["blobs"]:
+            return 200, "\n".join(f"line {i}" for i in range(2000)).encode(), {}
+
+        if kind == "commits" and len(rest) == 2 and rest[1] == "check-runs":
+            return 200, fake_check_runs(), {}
+
+        return 404, {"message": "Not Found"}, {}
+
+    def search(self, path: str, query: Dict[str, str]):
+        """Arama: review yükü sorgularına sayı, diğerlerine benchmark repository'sinin PR'ları"""
+        q = query.get("q", "")
+        owner, repo = REPO_URL.split("/")
+        total = self.state.config.total_pulls
+        if "user-review-requested:" in q:
+            login = q.split("user-review-requested:", 1)[1].split()[0]
+            total = sum(login.encode()) % 7
+        status, items, headers = self.paginated(path, query, total, lambda i: fake_search_item(owner, repo, total - i))
+        return status, {"total_count": total, "incomplete_results": False, "items": items}, headers
+
+    def graphql(self, body: Dict[str, Any]):
+        """Yalnızca sunucunun gönderdiği pullRequest sorgusunu yanıtlar"""
+        query, variables = body.get("query", ""), body.get("variables", {})
+        if "pullRequest(number: $number)" not in query:
+            return 200, {"errors": [{"message": "Sahte API bu sorguyu desteklemiyor"}]}, {}
+        node = fake_graphql_pull(variables["owner"], variables["repo"], variables["number"], query)
+        return 200, {"data": {"repository": {"pullRequest": node}}}, {}
+
+    def paginated(self, path: str, query: Dict[str, str], total: int, make_item):
+        """Link başlığıyla sayfalanmış liste yanıtı"""
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        start = (page - 1) * per_page
+        items = [make_item(i) for i in range(start, min(start + per_page, total))]
+        headers = {}
+        if start + per_page < total:
+            next_query = dict(query, page=str(page + 1), per_page=str(per_page))
+            host = self.headers.get("Host")
+            headers["Link"] = f'<http://{host}{path}?{urlencode(next_query)}>; rel="next"'
+        return 200, items, headers
+
+    def send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None, path: Optional[str] = None):
+        # Ham medya türleri (diff, raw) bayt olarak döner
+        raw = isinstance(payload, bytes)
+        body = payload if raw else json.dumps(payload).encode()
+        headers = dict(headers or {})
+        if path is not None and status == 200 and self.state.config.etags:
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                with self.state.lock:
+                    self.state.not_modified += 1
+                status, body = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain" if raw else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # İstemcinin iptal ettiği isteğin kapanan bağlantısına yazılamaması hata değildir
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+def start_fake_github(config: FakeGitHubConfig) -> Tuple[ThreadingHTTPServer, FakeGitHubState]:
+    """Sahte API'yi arka plan thread'inde başlat"""
+    state = FakeGitHubState(config)
+    handler = type("BoundFakeGitHubHandler", (FakeGitHubHandler,), {"state": state})
+    server = FakeGitHubServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+# Senaryolar
+
+def scenarios(pr_number: int = 42) -> List[Tuple[str, Dict[str, Any]]]:
+    """Her tool için bir çağrı"""
+    return [
+        ("list_pull_requests", {"repo_url": REPO_URL, "limit": 100}),
+        ("get_pull_request", {"repo_url": REPO_URL, "pr_number": pr_number}),
+        ("get_pull_request", {"repo_url": REPO_URL, "pr_number": pr_number, "include_checks": True}),
+        ("get_pull_request", {"repo_url": REPO_URL, "pr_number": pr_number, "backend": "graphql"}),
+        ("get_pr_files", {"repo_url": REPO_URL, "pr_number": pr_number}),
+        ("get_pr_diff", {"repo_url": REPO_URL, "pr_number": pr_number}),
+        ("get_blob", {"repo_url": REPO_URL, "sha": "b" * 40}),
+        ("create_pull_request", {"repo_url": REPO_URL, "title": "Bench", "body": "b", "head": "feature"}),
+        ("add_pr_comment", {"repo_url": REPO_URL, "pr_number": pr_number, "comment": "LGTM"}),
+        ("add_pr_review", {"repo_url": REPO_URL, "pr_number": pr_number, "body": "ok", "event": "APPROVE"}),
+        ("update_pull_request", {"repo_url": REPO_URL, "pr_number": pr_number, "title": "Yeni başlık"}),
+        ("add_pr_reviewers", {"repo_url": REPO_URL, "pr_number": pr_number, "reviewers": ["octocat"]}),
+        ("merge_pull_request", {"repo_url": REPO_URL, "pr_number": pr_number}),
+        ("close_pull_request", {"repo_url": REPO_URL, "pr_number": pr_number}),
+        ("list_pull_requests_multi", {"org": REPO_URL.split("/")[0], "per_repo_limit": 20, "limit": 50}),
+        ("list_pull_requests_multi", {"org": REPO_URL.split("/")[0], "author": "author3", "limit": 50}),
+        ("search_pull_requests", {"query": "benchmark", "repos": [REPO_URL], "limit": 50}),
+        ("auto_assign_reviewers", {
+            "pulls": [{"repo_url": REPO_URL, "pr_number": n} for n in range(1, 6)],
+            "reviewers": ["reviewer1", "reviewer2", "reviewer3", "octocat"],
+            "dry_run": True,
+        }),
+        ("merge_queue", {"pulls": [{"repo_url": REPO_URL, "pr_number": n} for n in range(1, 4)]}),
+        ("batch_pr_operations", {"operations": [
+            {"tool": "get_pull_request", "arguments": {"repo_url": REPO_URL, "pr_number": n}}
+            for n in range(1, 11)
+        ]}),
+        ("rate_limit_status", {"refresh": True}),
+        ("server_metrics", {}),
+    ]
+
+def scenario_name(tool: str, arguments: Dict[str, Any]) -> str:
+    if arguments.get("include_checks"):
+        return f"{tool}+checks"
+    if arguments.get("backend"):
+        return f"{tool}+{arguments['backend']}"
+    if tool == "list_pull_requests_multi" and arguments.get("author"):
+        return f"{tool}+search"
+    return tool
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Gecikme listesinden özet istatistik"""
+    ordered = sorted(latencies)
+
+    def pct(q: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "ops": len(latencies),
+        "errors": errors,
+        "ops_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(pct(0.50), 3),
+        "p95_ms": round(pct(0.95), 3),
+        "p99_ms": round(pct(0.99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+def is_error(text: str) -> bool:
+    return text.startswith("❌")
+
+# Doğrulama senaryoları
+# Ölçümden ayrı çalışan davranış kontrolleri; sahte API'ye yanıt sıralayıp sonucu doğrular
+CHECKS: List[Tuple[str, Callable[[Any, FakeGitHubState], Awaitable[None]]]] = []
+
+def check(name: str):
+    """Fonksiyonu doğrulama senaryosu olarak kaydet"""
+    def register(func):
+        CHECKS.append((name, func))
+        return func
+    return register
+
+def use_tokens(server, *tokens: str):
+    """Kontrol süresince sunucunun token havuzunu verilen PAT'lerle değiştir"""
+    server.token_pool = server.TokenPool([server.Credential(token, token) for token in tokens])
+    return server.token_pool
+
+@check("rate_limit_retry_after")
+async def check_retry_after(server, state: FakeGitHubState) -> None:
+    """429 + Retry-After: istek süre dolana kadar bekletilip aynı çağrıda tamamlanır"""
+    use_tokens(server, "check-token")
+    path = f"/repos/{REPO_URL}/pulls/7001"
+    state.script(path, 429, {"message": "You have exceeded a secondary rate limit"}, {"Retry-After": "1"})
+    started = time.monotonic()
+    pr = await server.github_request("GET", path)
+    elapsed = time.monotonic() - started
+    assert pr["number"] == 7001, pr
+    assert elapsed >= 1.0, f"Retry-After beklenmedi ({elapsed:.2f} sn)"
+    assert state.hits[path] == 2, state.hits[path]
+
+@check("rate_limit_max_wait")
+async def check_max_wait(server, state: FakeGitHubState) -> None:
+    """Retry-After GITHUB_RATE_LIMIT_MAX_WAIT'i aşarsa beklemeden RateLimitError verilir"""
+    use_tokens(server, "check-token")
+    path = f"/repos/{REPO_URL}/pulls/7002"
+    state.script(path, 403, {"message": "API rate limit exceeded"}, {"Retry-After": "60"})
+    started = time.monotonic()
+    try:
+        await server.github_request("GET", path)
+    except server.RateLimitError as e:
+        assert e.retry_after > server.RATE_LIMIT_MAX_WAIT, e.retry_after
+    else:
+        raise AssertionError("RateLimitError bekleniyordu")
+    assert time.monotonic() - started < 1.0, "Sınır aşılmasına rağmen beklendi"
+    assert state.hits[path] == 1, state.hits[path]
+
+@check("token_failover")
+async def check_token_failover(server, state: FakeGitHubState) -> None:
+    """Bütçesi biten token engellenir, istek aynı çağrıda havuzdaki diğer token'la tamamlanır"""
+    use_tokens(server, "failover-a", "failover-b")
+    state.budgets["failover-a"] = [0, time.time() + 3600]
+    before = dict(state.requests_by_token)
+    pr = await server.github_request("GET", f"/repos/{REPO_URL}/pulls/7007")
+    assert pr["number"] == 7007, pr
+    used = {t: state.requests_by_token.get(t, 0) - before.get(t, 0) for t in ("failover-a", "failover-b")}
+    assert used == {"failover-a": 1, "failover-b": 1}, used
+    # Engellenen token bütçesi sıfırlanana kadar seçilmez
+    await server.github_request("GET", f"/repos/{REPO_URL}/pulls/7008")
+    assert state.requests_by_token.get("failover-a", 0) - before.get("failover-a", 0) == 1
+
+@check("app_token_failover")
+async def check_app_failover(server, state: FakeGitHubState) -> None:
+    """Token'ı alınamayan App kurulumu devre dışı kalır, istekler kalan PAT ile sürer"""
+    missing_key = os.path.join(os.path.dirname(os.path.abspath(__file__)), "missing-app-key.pem")
+    scoped = server.Credential("scoped-app", None, [REPO_URL], "1", "101", missing_key)
+    unresolved = server.Credential("unresolved-app", None, None, "1", "102", missing_key)
+    pat = server.Credential("check-token", "check-token")
+    # Kapsamlı App önce seçilir (eşit bütçe); yenileme hatası isteği başka kimliğe yönlendirir
+    server.token_pool = server.TokenPool([scoped, unresolved, pat])
+    before = state.requests_by_token.get("check-token", 0)
+    pr = await server.github_request("GET", f"/repos/{REPO_URL}/pulls/7009")
+    assert pr["number"] == 7009, pr
+    assert state.requests_by_token.get("check-token", 0) == before + 1
+    assert not scoped.usable and not unresolved.usable, (scoped.error, unresolved.error)
+    status = await server.handle_call_tool("rate_limit_status", {"refresh": True})
+    assert status[0].text.count("⚠️ Kullanılamıyor") == 2, status[0].text
+
+@check("repo_identity")
+async def check_repo_identity(server, state: FakeGitHubState) -> None:
+    """Owner/repo yazımı farklı istekler tek uçuşu ve önbellek kaydını paylaşır; başka host reddedilir"""
+    owner, repo = REPO_URL.split("/")
+    lower, upper = f"/repos/{owner}/{repo}/pulls/7010", f"/repos/{owner.upper()}/{repo.upper()}/pulls/7010"
+    first, second = await asyncio.gather(server.github_request("GET", lower), server.github_request("GET", upper))
+    assert first == second and first["number"] == 7010, (first, second)
+    assert state.hits.get(lower, 0) + state.hits.get(upper, 0) == 1, "Aynı PR için iki istek gönderildi"
+    assert server.response_cache.get(server.ResponseCache.make_key(f"{server.GITHUB_API_BASE}{upper}")) is not None
+    
+    foreign = await server.handle_call_tool("get_pull_request", {"repo_url": "https://gitlab.com/o/r", "pr_number": 1})
+    assert is_error(foreign[0].text) and "Desteklenmeyen host" in foreign[0].text, foreign[0].text
+    glob = await server.handle_call_tool("get_pull_request", {"repo_url": f"{owner}/api-*", "pr_number": 1})
+    assert is_error(glob[0].text), glob[0].text
+    
+    assert server.parse_repo_url(f"{owner}/{repo}.git") == (owner, repo)
+    for bad in (f"orgs/{owner}/{repo}", f"{owner}/{repo}.git.git", f"users/{owner}"):
+        try:
+            server.parse_repo_url(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"Geçersiz adres kabul edildi: {bad}")
+
+@check("graphql_matches_rest")
+async def check_graphql_backend(server, state: FakeGitHubState) -> None:
+    """GraphQL backend'i yedek yola düşmeden REST ile aynı çıktıyı üretir"""
+    arguments = {
+        "repo_url": REPO_URL, "pr_number": 7003, "include_checks": True, "include_files": True,
+        "include_requested_reviewers": True, "include_comment_counts": True,
+    }
+    rest = await server.handle_call_tool("get_pull_request", dict(arguments, backend="rest"))
+    pr_path = f"/repos/{REPO_URL}/pulls/7003"
+    before_graphql, before_rest = state.hits.get("/graphql", 0), state.hits.get(pr_path, 0)
+    graphql = await server.handle_call_tool("get_pull_request", dict(arguments, backend="graphql"))
+    assert state.hits.get("/graphql", 0) == before_graphql + 1, "GraphQL uç noktası çağrılmadı"
+    assert state.hits.get(pr_path, 0) == before_rest, "GraphQL başarısız oldu, REST yedeği kullanıldı"
+    assert graphql[0].text == rest[0].text, f"Çıktılar farklı:\n{graphql[0].text}\n---\n{rest[0].text}"
+    
+    # REST yolu check run'ları PR'ın head SHA'sıyla ister
+    head_sha = fake_pull(*REPO_URL.split("/"), 7003)["head"]["sha"]
+    assert state.hits.get(f"/repos/{REPO_URL}/commits/{head_sha}/check-runs", 0) >= 1, "Check run'lar head SHA'sıyla istenmedi"
+    
+    # GraphQL hatası REST yedeğine düşer ve metriklerde sayılır
+    state.script("/graphql", 400, {"message": "Problems parsing JSON"})
+    fallbacks = server.metrics.fallbacks["graphql"]
+    server.response_cache.clear()
+    fallback = await server.handle_call_tool("get_pull_request", dict(arguments, backend="graphql"))
+    assert fallback[0].text == rest[0].text, fallback[0].text
+    assert server.metrics.fallbacks["graphql"] == fallbacks + 1, server.metrics.fallbacks
+
+@check("job_roundtrip")
+async def check_jobs(server, state: FakeGitHubState) -> None:
+    """async çağrı job döndürür; durum, sonuç ve iptal tool'ları job'u izler"""
+    arguments = {"repo_url": REPO_URL, "limit": 100}
+    direct = await server.handle_call_tool("list_pull_requests", dict(arguments))
+    started = await server.handle_call_tool("list_pull_requests", dict(arguments, **{"async": True}))
+    job_id = started[0].text.split("**Job ID:** ")[1].split()[0]
+    status = await server.handle_call_tool("get_job_status", {"job_id": job_id})
+    assert job_id in status[0].text, status[0].text
+    result = await server.handle_call_tool("get_job_result", {"job_id": job_id, "wait": 5})
+    assert [c.text for c in result] == [c.text for c in direct], result[0].text[:200]
+    
+    # mergeable hesaplanıyor görünen PR'ı yoklayan iş, iptal edilene kadar sürer
+    path = f"/repos/{REPO_URL}/pulls/7004"
+    for _ in range(100):
+        state.script(path, 200, fake_pull(*REPO_URL.split("/"), 7004, mergeable=None, mergeable_state="unknown"))
+    try:
+        slow = await server.handle_call_tool("merge_queue", {
+            "pulls": [{"repo_url": REPO_URL, "pr_number": 7004}], "async": True, "pr_timeout": 30,
+        })
+        slow_id = slow[0].text.split("**Job ID:** ")[1].split()[0]
+        await asyncio.sleep(0.1)
+        cancelled = await server.handle_call_tool("cancel_job", {"job_id": slow_id})
+        assert "iptal edildi" in cancelled[0].text, cancelled[0].text
+        status = await server.handle_call_tool("get_job_status", {"job_id": slow_id})
+        assert "cancelled" in status[0].text, status[0].text
+    finally:
+        state.scripted.pop(path, None)
+
+@check("merge_retry_backoff")
+async def check_merge_backoff(server, state: FakeGitHubState) -> None:
+    """405/409 yarışından sonra yeniden denemeden önce yoklama aralığı kadar beklenir"""
+    path = f"/repos/{REPO_URL}/pulls/7006/merge"
+    state.script(path, 409, {"message": "Head branch was modified. Review and try the merge again."})
+    started = time.monotonic()
+    result = await server.merge_queue({
+        "pulls": [{"repo_url": REPO_URL, "pr_number": 7006}], "merge_method": "merge", "pr_timeout": 30,
+        "max_attempts": 3, "update_branch": False, "stop_on_failure": False, "max_concurrency": 1,
+    })
+    elapsed = time.monotonic() - started
+    entry = result["entries"][0]
+    assert entry["status"] == "merged" and entry["attempts"] == 2, entry
+    assert elapsed >= server.MERGE_POLL_INTERVAL, f"409 sonrası beklemeden denendi ({elapsed:.2f} sn)"
+    assert state.hits[path] == 2, state.hits[path]
+
+@check("raw_cache_per_repo")
+async def check_raw_cache(server, state: FakeGitHubState) -> None:
+    """Aynı SHA başka repo'dan istenince disk önbelleğindeki kayıt sunulmaz, erişimi GitHub denetler"""
+    original = server.diff_cache
+    server.diff_cache = server.DiffCache(tempfile.mkdtemp(prefix="bench-raw-"))
+    other = "other/private"
+    sha, base, head = "b" * 40, "c" * 40, "d" * 40
+    blob_path = f"/repos/{other}/git/blobs/{sha}"
+    compare_path = f"/repos/{other}/compare/{base}...{head}"
+    state.script(blob_path, 404, {"message": "Not Found"})
+    state.script(compare_path, 404, {"message": "Not Found"})
+    try:
+        blob = await server.handle_call_tool("get_blob", {"repo_url": REPO_URL, "sha": sha})
+        assert not is_error(blob[0].text), blob[0].text
+        blob = await server.handle_call_tool("get_blob", {"repo_url": other, "sha": sha})
+        assert is_error(blob[0].text), "Blob başka repo'nun önbellek kaydından sunuldu"
+        assert state.hits.get(blob_path) == 1, state.hits.get(blob_path)
+        
+        arguments = {"pr_number": 7011, "base_sha": base, "head_sha": head}
+        diff = await server.handle_call_tool("get_pr_diff", dict(arguments, repo_url=REPO_URL))
+        assert not is_error(diff[0].text), diff[0].text
+        diff = await server.handle_call_tool("get_pr_diff", dict(arguments, repo_url=other))
+        assert is_error(diff[0].text), "Diff başka repo'nun önbellek kaydından sunuldu"
+        assert state.hits.get(compare_path) == 1, state.hits.get(compare_path)
+        assert server.diff_cache.hits == 0, server.diff_cache.stats()
+    finally:
+        shutil.rmtree(server.diff_cache.directory, ignore_errors=True)
+        server.diff_cache = original
+
+@check("diff_cursor_resume")
+async def check_diff_cursor(server, state: FakeGitHubState) -> None:
+    """Küçük bütçeyle dosya:satır imleciyle devam eden sayfalar diff'i atlamadan ve tekrarlamadan verir"""
+    files = 4
+    arguments = {
+        "repo_url": REPO_URL, "pr_number": 7012, "base_sha": "e" * 40, "head_sha": "f" * 40,
+        "paths": [f"src/module_[0-{files - 1}].py"], "max_bytes": 120, "max_files": 2,
+    }
+    expected = [
+        line for line in fake_diff(files).decode().rstrip("\n").split("\n")
+        if not line.startswith("diff --git ")
+    ]
+    received, cursors, cursor = [], [], None
+    for _ in range(500):
+        page = await server.get_pr_diff(dict(arguments, cursor=cursor))
+        assert page["files"] <= arguments["max_files"], page
+        received.extend(
+            line for line in page["lines"]
+            if not line.startswith("diff --git ") and not line.startswith("... (önceki ")
+        )
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        cursors.append(cursor)
+    else:
+        raise AssertionError("İmleç ilerlemiyor")
+    assert any(":" in c for c in cursors), cursors
+    assert len({int(c.partition(":")[0]) for c in cursors}) >= 3, cursors
+    assert received == expected, f"{len(received)} satır alındı, {len(expected)} bekleniyordu"
+    
+    # Dosya sınırının reddettiği dosyanın başlığı bayt bütçesinden düşülmez
+    budget = server.OutputBudget(1000, max_files=1)
+    assert budget.next_file("diff --git a/x b/x")
+    used = budget.used
+    assert not budget.next_file("diff --git a/y b/y") and budget.used == used, budget.used
+
+@check("store_incremental_sync")
+async def check_store_sync(server, state: FakeGitHubState) -> None:
+    """İkinci senkron yalnızca değişen PR'ı yazar ve updated_at filigranını ileri taşır"""
+    original = server.pr_store
+    directory = tempfile.mkdtemp(prefix="bench-store-")
+    store = server.pr_store = server.PullRequestStore(os.path.join(directory, "prs.db"))
+    owner, repo = REPO_URL.split("/")
+    path = f"/repos/{REPO_URL}/pulls"
+    
+    def watermark() -> str:
+        return store.conn.execute("SELECT watermark FROM sync_state WHERE owner = ? AND repo = ?", (owner, repo)).fetchone()[0]
+    
+    try:
+        await store.ensure_fresh(owner, repo, max_age=0)
+        total = state.config.total_pulls
+        assert store.synced_rows == total, store.stats()
+        first = watermark()
+        
+        # PR #5 yukarıda değişti; liste updated_at'e göre azalan sırada gelir
+        changed = fake_pull(owner, repo, 5, title="Değişti", updated_at="2030-01-01T00:00:00Z")
+        state.script(path, 200, [changed, fake_pull(owner, repo, total), fake_pull(owner, repo, total - 1)])
+        hits = state.hits.get(path, 0)
+        await store.ensure_fresh(owner, repo, max_age=0)
+        assert state.hits.get(path, 0) == hits + 1, "Filigrandan sonra sonraki sayfa istendi"
+        assert store.synced_rows == total + 1, f"{store.synced_rows - total} satır yazıldı, 1 bekleniyordu"
+        assert watermark() == changed["updated_at"] > first, (first, watermark())
+        pulls = await store.list_pulls(owner, repo, "all", total + 1, max_age=3600, sort="updated")
+        assert len(pulls) == total and pulls[0]["number"] == 5 and pulls[0]["title"] == "Değişti", pulls[0]
+    finally:
+        store.conn.close()
+        shutil.rmtree(directory, ignore_errors=True)
+        server.pr_store = original
+
+@check("paginate_start_and_stop")
+async def check_paginate(server, state: FakeGitHubState) -> None:
+    """100'den fazla sonuç, sayfa ortasından başlama ve erken bırakmada önden istenen sayfanın iptali"""
+    owner, repo = REPO_URL.split("/")
+    path = f"/repos/{REPO_URL}/pulls"
+    total = state.config.total_pulls
+    assert total > 2 * server.PAGE_SIZE, total
+    
+    numbers = [pr["number"] async for pr in server.paginate(path)]
+    assert numbers == [total - i for i in range(total)], numbers[:5]
+    
+    start = server.PAGE_SIZE + server.PAGE_SIZE // 2
+    hits = state.hits.get(path, 0)
+    numbers = [pr["number"] async for pr in server.paginate(path, start=start)]
+    assert numbers == [total - i for i in range(start, total)], numbers[:5]
+    # Başlangıçtan önceki sayfa istenmez
+    assert state.hits.get(path, 0) - hits == -(-total // server.PAGE_SIZE) - start // server.PAGE_SIZE
+    
+    server.response_cache.clear()
+    state.delays[path] = 0.5
+    try:
+        hits = state.hits.get(path, 0)
+        pages = server.paginate(path)
+        first = await pages.__anext__()
+        assert first["number"] == total, first
+        await asyncio.sleep(0.1)
+        assert state.hits.get(path, 0) == hits + 2, "Sonraki sayfa önden istenmedi"
+        abandoned = server.single_flight.stats()["abandoned"]
+        await pages.aclose()
+        # İptal edilen istek gecikmeli yanıt gelmeden uçuştan çıkmalı
+        for _ in range(20):
+            if not server.single_flight.stats()["in_flight"]:
+                break
+            await asyncio.sleep(0.01)
+        assert server.single_flight.stats()["in_flight"] == 0, "Önden istenen sayfa iptal edilmedi"
+        assert server.single_flight.stats()["abandoned"] == abandoned + 1, server.single_flight.stats()
+    finally:
+        state.delays.pop(path, None)
+        await asyncio.sleep(0.5)
+
+@check("single_flight_sharing")
+async def check_single_flight(server, state: FakeGitHubState) -> None:
+    """Paylaşılan istek başarısızsa tüm bekleyenler aynı hatayı alır; bir bekleyenin iptali diğerlerini etkilemez"""
+    failing, shared = f"/repos/{REPO_URL}/pulls/7013", f"/repos/{REPO_URL}/pulls/7014"
+    state.delays[failing] = state.delays[shared] = 0.3
+    state.script(failing, 404, {"message": "Not Found"})
+    try:
+        errors = await asyncio.gather(
+            *(server.github_request("GET", failing) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(e, server.GitHubAPIError) and e.status_code == 404 for e in errors), errors
+        assert errors[1] is errors[0] and errors[2] is errors[0], "Bekleyenler farklı hatalar aldı"
+        assert state.hits[failing] == 1, state.hits[failing]
+        
+        abandoned = server.single_flight.stats()["abandoned"]
+        waiters = [asyncio.ensure_future(server.github_request("GET", shared)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        waiters[0].cancel()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert isinstance(results[0], asyncio.CancelledError), results[0]
+        assert results[1]["number"] == results[2]["number"] == 7014, results[1:]
+        assert state.hits[shared] == 1, state.hits[shared]
+        assert server.single_flight.stats()["abandoned"] == abandoned, "Paylaşılan istek iptal edildi"
+    finally:
+        state.delays.pop(failing, None)
+        state.delays.pop(shared, None)
+
+@check("webhook_invalidation")
+async def check_webhook(server, state: FakeGitHubState) -> None:
+    """İmzasız teslimat reddedilir; güvenilen kayıt istek atmadan okunur, imzalı olaydan sonra yeniden çekilir"""
+    listener = server.WebhookListener("bench-secret")
+    await listener.start("127.0.0.1", 0)
+    port = listener.server.sockets[0].getsockname()[1]
+    owner, repo = REPO_URL.split("/")
+    path = f"/repos/{REPO_URL}/pulls/7005"
+    arguments = {"repo_url": REPO_URL, "pr_number": 7005}
+    payload = json.dumps({
+        "action": "edited",
+        "repository": {"name": repo, "owner": {"login": owner}},
+        "pull_request": {"number": 7005},
+    }).encode()
+    signature = "sha256=" + hmac.new(b"bench-secret", payload, hashlib.sha256).hexdigest()
+    
+    async def deliver(client, headers: Dict[str, str]) -> int:
+        response = await client.post(
+            f"http://127.0.0.1:{port}/", content=payload,
+            headers={"X-GitHub-Event": "pull_request", "Content-Type": "application/json", **headers}
+        )
+        return response.status_code
+    
+    try:
+        async with server.httpx.AsyncClient() as client:
+            await server.handle_call_tool("get_pull_request", dict(arguments))
+            fetched = state.hits[path]
+            await server.handle_call_tool("get_pull_request", dict(arguments))
+            assert state.hits[path] == fetched, "Güvenilen kayıt için istek atıldı"
+            
+            assert await deliver(client, {}) == 401
+            assert await deliver(client, {"X-Hub-Signature-256": "sha256=" + "0" * 64}) == 401
+            await server.handle_call_tool("get_pull_request", dict(arguments))
+            assert state.hits[path] == fetched, "Reddedilen teslimat önbelleği sildi"
+            
+            assert await deliver(client, {"X-Hub-Signature-256": signature}) == 200
+            await server.handle_call_tool("get_pull_request", dict(arguments))
+            assert state.hits[path] == fetched + 1, "Olaydan sonra PR yeniden çekilmedi"
+        assert listener.stats() == {"received": 1, "rejected": 2, "ignored": 0}, listener.stats()
+    finally:
+        listener.close()
+
+@check("multi_repo_filters")
+async def check_multi_repo(server, state: FakeGitHubState) -> None:
+    """Filtreli çoklu repo listesi aramayla sunucu tarafında süzülür, biten sorguların satırları ilerlemeyle gelir"""
+    owner = REPO_URL.split("/")[0]
+    before = state.hits.get("/search/issues", 0)
+    started = await server.handle_call_tool("list_pull_requests_multi", {
+        "org": owner, "author": "author3", "per_repo_limit": 5, "limit": 20, "async": True,
+    })
+    job_id = started[0].text.split("**Job ID:** ")[1].split()[0]
+    result = await server.handle_call_tool("get_job_result", {"job_id": job_id, "wait": 5})
+    text = result[0].text
+    assert state.hits.get("/search/issues", 0) > before, "Filtreler arama ile uygulanmadı"
+    # Sahte arama tüm PR'ları döndürür; per_repo_limit aramada sınır değildir
+    assert f"{state.config.total_pulls} pull request bulundu" in text, text[:300]
+    job = server.jobs.get(job_id)
+    assert any("#" in m and "URL:" in m for m in job.messages), job.messages
+    
+    # Aramayla ifade edilemeyen filtrede kesilen repo'lar çıktıda belirtilir
+    listed = await server.handle_call_tool("list_pull_requests_multi", {
+        "repos": [REPO_URL], "review_state": "review_requested", "per_repo_limit": 5,
+    })
+    assert "daha eski eşleşmeler sayılmadı" in listed[0].text, listed[0].text[-300:]
+
+async def run_checks(state: FakeGitHubState) -> Dict[str, str]:
+    """Kontrolleri sırayla çalıştır; sonuç "ok" ya da hata mesajıdır"""
+    import github_pr_server as server
+
+    original_pool = server.token_pool
+    results = {}
+    try:
+        for name, func in CHECKS:
+            # Her kontrol boş önbellek ve temiz havuzla başlar
+            server.response_cache.clear()
+            server.token_pool = original_pool
+            try:
+                await func(server, state)
+                results[name] = "ok"
+            except Exception as e:
+                results[name] = f"{type(e).__name__}: {e}"
+            print(f"  {name:<28} {'✅' if results[name] == 'ok' else '❌ ' + results[name]}", file=sys.stderr)
+    finally:
+        server.token_pool = original_pool
+        await server.cleanup()
+    return results
+
+# Doğrudan çağrı (handle_call_tool)
+
+async def bench_direct(iterations: int, concurrency: int, warmup: int, fresh_cache: bool) -> Dict[str, Any]:
+    """Tool'ları süreç içinde handle_call_tool ile çalıştır"""
+    import github_pr_server as server
+
+    server.get_http_client()
+    results = {}
+    try:
+        for tool, arguments in scenarios():
+            name = scenario_name(tool, arguments)
+
+            async def call() -> Tuple[float, bool]:
+                if fresh_cache:
+                    server.response_cache.clear()
+                started = time.perf_counter()
+                content = await server.handle_call_tool(tool, dict(arguments))
+                return time.perf_counter() - started, is_error(content[0].text)
+
+            for _ in range(warmup):
+                await call()
+
+            latencies, errors = [], 0
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def run_one():
+                nonlocal errors
+                async with semaphore:
+                    elapsed, failed = await call()
+                latencies.append(elapsed)
+                errors += failed
+
+            started = time.perf_counter()
+            await asyncio.gather(*(run_one() for _ in range(iterations)))
+            result = summarize(latencies, errors, time.perf_counter() - started)
+
+            # Bellek ölçümü zamanlamayı bozmaması için ayrı turda yapılır
+            alloc_rounds = max(1, min(iterations, 20))
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            for _ in range(alloc_rounds):
+                await call()
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            diff = after.compare_to(before, "filename")
+            result["alloc_peak_kb"] = round(peak / 1024, 1)
+            result["retained_bytes_per_op"] = round(sum(d.size_diff for d in diff) / alloc_rounds)
+            result["alloc_blocks_per_op"] = round(sum(d.count_diff for d in diff) / alloc_rounds)
+
+            results[name] = result
+            print(f"  {name:<28} {result['ops_per_sec']:>9.1f} ops/sn  p50 {result['p50_ms']:>8.2f} ms  "
+                  f"p99 {result['p99_ms']:>8.2f} ms  hata {errors}", file=sys.stderr)
+    finally:
+        await server.cleanup()
+    return results
+
+# stdio MCP taşıması
+
+async def bench_stdio(iterations: int, env: Dict[str, str]) -> Dict[str, Any]:
+    """Tool'ları alt süreçte çalışan sunucuya stdio MCP üzerinden çağır"""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(command=sys.executable, args=[SERVER_PATH], env=env)
+    results = {}
+
+    startup_started = time.perf_counter()
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await session.list_tools()
+            results["_startup"] = {"ms": round((time.perf_counter() - startup_started) * 1000, 2)}
+
+            for tool, arguments in scenarios():
+                name = scenario_name(tool, arguments)
+                latencies, errors = [], 0
+                started = time.perf_counter()
+                # Tek bir stdio oturumu istekleri sırayla işlediği için eşzamanlılık kullanılmaz
+                for _ in range(iterations):
+                    call_started = time.perf_counter()
+                    response = await session.call_tool(tool, dict(arguments))
+                    latencies.append(time.perf_counter() - call_started)
+                    errors += response.isError or is_error(response.content[0].text)
+                results[name] = summarize(latencies, errors, time.perf_counter() - started)
+                print(f"  {name:<28} {results[name]['ops_per_sec']:>9.1f} ops/sn  "
+                      f"p50 {results[name]['p50_ms']:>8.2f} ms  hata {errors}", file=sys.stderr)
+    return results
+
+# Karşılaştırma
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """p50 gecikme ve ops/sn değerlerinde tolerans üstü gerilemeleri bul"""
+    regressions = []
+    for mode in ("direct", "stdio"):
+        for name, now in current.get(mode, {}).items():
+            before = baseline.get(mode, {}).get(name)
+            if not before or name.startswith("_"):
+                continue
+            if before["p50_ms"] and now["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+                regressions.append(f"{mode}/{name}: p50 {before['p50_ms']} → {now['p50_ms']} ms")
+            if before["ops_per_sec"] and now["ops_per_sec"] < before["ops_per_sec"] * (1 - tolerance):
+                regressions.append(f"{mode}/{name}: {before['ops_per_sec']} → {now['ops_per_sec']} ops/sn")
+    return regressions
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="GitHub PR MCP Server benchmark")
+    parser.add_argument("--iterations", type=int, default=100, help="Tool başına çağrı sayısı")
+    parser.add_argument("--stdio-iterations", type=int, default=None, help="stdio modunda tool başına çağrı sayısı")
+    parser.add_argument("--concurrency", type=int, default=8, help="Doğrudan modda eşzamanlı çağrı")
+    parser.add_argument("--warmup", type=int, default=3, help="Ölçüm öncesi ısınma çağrısı")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Sahte API yanıt gecikmesi")
+    parser.add_argument("--pulls", type=int, default=250, help="Repository'deki PR sayısı")
+    parser.add_argument("--files", type=int, default=120, help="PR başına dosya sayısı")
+    parser.add_argument("--rate-limit", type=int, default=1_000_000, help="Token ve pencere başına istek bütçesi")
+    parser.add_argument("--tokens", type=int, default=1, help="Havuzdaki token sayısı (GITHUB_TOKENS)")
+    parser.add_argument("--rate-limit-window", type=float, default=3600.0, help="Hız sınırı penceresi (sn)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="502 döndürülecek istek oranı")
+    parser.add_argument("--no-etag", action="store_true", help="ETag/304 desteğini kapat")
+    parser.add_argument("--fresh-cache", action="store_true", help="Her çağrıdan önce yanıt önbelleğini boşalt")
+    parser.add_argument("--mode", choices=("direct", "stdio", "both"), default="both")
+    parser.add_argument("--skip-checks", action="store_true", help="Doğrulama senaryolarını çalıştırma")
+    parser.add_argument("--output", default="benchmark-results.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="İzin verilen gerileme oranı")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+    config = FakeGitHubConfig(
+        latency=args.latency_ms / 1000,
+        total_pulls=args.pulls,
+        total_files=args.files,
+        rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window,
+        error_rate=args.error_rate,
+        etags=not args.no_etag,
+    )
+    fake_server, state = start_fake_github(config)
+    api_url = f"http://127.0.0.1:{fake_server.server_address[1]}"
+
+    # Sunucu modülü yapılandırmayı import sırasında okuduğu için ortam önce ayarlanır
+    env = dict(os.environ)
+    env.update({
+        "GITHUB_TOKEN": env.get("GITHUB_BENCH_TOKEN", "bench-token") if args.tokens <= 1 else "",
+        "GITHUB_TOKENS": ",".join(f"bench-token-{i}" for i in range(args.tokens)) if args.tokens > 1 else "",
+        "GITHUB_API_URL": api_url,
+        "GITHUB_MUTATION_INTERVAL": "0",
+        "GITHUB_MAX_CONCURRENT_MUTATIONS": str(args.concurrency),
+        "GITHUB_RETRY_BASE_DELAY": "0.01",
+        "GITHUB_RETRY_MAX_DELAY": "0.1",
+        "GITHUB_RATE_LIMIT_RESERVE": "0",
+        "GITHUB_RATE_LIMIT_MAX_WAIT": "5",
+        "GITHUB_METRICS_FILE": "",
+        "GITHUB_METRICS_PORT": "0",
+    })
+    os.environ.update(env)
+    sys.path.insert(0, os.path.dirname(SERVER_PATH))
+
+    results: Dict[str, Any] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "config": vars(args),
+    }
+    try:
+        if args.mode in ("direct", "both"):
+            print("▶ Doğrudan (handle_call_tool):", file=sys.stderr)
+            results["direct"] = asyncio.run(
+                bench_direct(args.iterations, args.concurrency, args.warmup, args.fresh_cache)
+            )
+            if not args.skip_checks:
+                print("▶ Doğrulama senaryoları:", file=sys.stderr)
+                results["checks"] = asyncio.run(run_checks(state))
+        if args.mode in ("stdio", "both"):
+            print("▶ stdio MCP:", file=sys.stderr)
+            results["stdio"] = asyncio.run(bench_stdio(args.stdio_iterations or args.iterations, env))
+    finally:
+        fake_server.shutdown()
+
+    results["fake_api"] = {
+        "requests": state.requests,
+        "not_modified": state.not_modified,
+        "errors_injected": state.errors_injected,
+        "rate_limited": state.rate_limited,
+        "requests_by_token": state.requests_by_token,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"✅ Sonuçlar yazıldı: {args.output}", file=sys.stderr)
+
+    failed = [name for name, outcome in results.get("checks", {}).items() if outcome != "ok"]
+    if failed:
+        print(f"❌ Başarısız doğrulama: {', '.join(failed)}", file=sys.stderr)
+        return 1
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("⚠️ Gerileme bulundu:\n" + "\n".join(f"- {r}" for r in regressions), file=sys.stderr)
+            return 1
+        print("✅ Gerileme yok", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
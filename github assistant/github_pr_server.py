@@ -4,658 +4,5083 @@ GitHub Pull Request MCP Server
 Otomatik PR yönetimi için Model Context Protocol sunucusu
 """
 
+from __future__ import annotations
+
 import asyncio
+import fnmatch
+import hashlib
+import heapq
+import hmac
+import importlib.util
 import json
+import mmap
 import os
+import random
+import re
+import sqlite3
 import sys
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlencode, urlparse
+
+class LazyModule:
+    """İlk öznitelik erişiminde içe aktarılan modül vekili
+    
+    httpx ve mcp'nin içe aktarılması yüzlerce ms sürer; sunucu her oturumda yeniden
+    başlatıldığından bu maliyet ilk kullanıma ertelenir.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
 
-import httpx
-import mcp.server.stdio
-import mcp.types as types
-from mcp.server import NotificationOptions, Server
-from mcp.server.models import InitializationOptions
-from pydantic import AnyUrl
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+httpx = LazyModule("httpx")
+types = LazyModule("mcp.types")
 
 # GitHub API yapılandırması
-GITHUB_API_BASE = "https://api.github.com"
+GITHUB_API_BASE = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+# Token havuzu: virgülle ayrılmış ek PAT'ler ve/veya JSON dosyası (repo kapsamları, GitHub App kurulumları)
+GITHUB_TOKENS = os.getenv("GITHUB_TOKENS", "")
+TOKEN_POOL_FILE = os.getenv("GITHUB_TOKEN_POOL_FILE")
+# Kurulum token'ları süresi dolmadan bu kadar saniye önce yenilenir
+APP_TOKEN_REFRESH_MARGIN = float(os.getenv("GITHUB_APP_TOKEN_REFRESH_MARGIN", "300"))
+# Token'ı alınamayan App kurulumu bu kadar saniye havuz seçiminden çıkarılır
+APP_TOKEN_RETRY_INTERVAL = float(os.getenv("GITHUB_APP_TOKEN_RETRY_INTERVAL", "300"))
+
+# Repository çözümleme yapılandırması
+# owner/repo verilen URL'lerin varsayılan host'u (api.github.com -> github.com, GHE'de API host'u)
+GITHUB_HOST = os.getenv("GITHUB_HOST") or (
+    "github.com" if urlparse(GITHUB_API_BASE).hostname == "api.github.com" else urlparse(GITHUB_API_BASE).hostname
+)
+# Çözülen repo URL'lerinin LRU önbellek boyutu
+REPO_CACHE_SIZE = int(os.getenv("GITHUB_REPO_CACHE_SIZE", "1024"))
+# Yeniden adlandırılan/taşınan repository'ler API yönlendirmesi izlenerek bir kez çözülür
+RESOLVE_RENAMES = os.getenv("GITHUB_RESOLVE_RENAMES", "1").lower() not in ("0", "false", "no")
 
-if not GITHUB_TOKEN:
-    print("Hata: GITHUB_TOKEN çevre değişkeni tanımlanmamış", file=sys.stderr)
-    sys.exit(1)
+# Sunucu kimliği ve başlangıç yapılandırması
+SERVER_NAME = "github-pr-server"
+SERVER_VERSION = "0.1.0"
+# GITHUB_FAST_INITIALIZE=1: initialize isteği mcp sunucusu yüklenmeden yanıtlanır; oturum stateless
+# çalışır ve istemcinin initialize parametreleri mcp'ye ulaşmaz. Varsayılan normal (stateful) oturumdur.
+FAST_INITIALIZE = os.getenv("GITHUB_FAST_INITIALIZE", "0").lower() in ("1", "true", "yes")
 
-# Global HTTP client
-http_client = httpx.AsyncClient(
-    headers={
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    },
-    timeout=30.0
+# HTTP bağlantı havuzu yapılandırması
+HTTP_MAX_CONNECTIONS = int(os.getenv("GITHUB_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("GITHUB_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("GITHUB_HTTP_KEEPALIVE_EXPIRY", "30"))
+# HTTP/2 isteğe bağlıdır ve h2 paketini gerektirir (pip install "httpx[http2]")
+HTTP2_ENABLED = os.getenv("GITHUB_HTTP2", "").lower() in ("1", "true", "yes")
+
+# Global HTTP client; ilk istekte oluşturulur, main() sonunda kapatılır
+http_client: Optional[httpx.AsyncClient] = None
+
+def create_http_client() -> httpx.AsyncClient:
+    """Havuz ayarlarıyla HTTP client oluştur; Authorization her istekte token havuzundan eklenir"""
+    http2 = HTTP2_ENABLED
+    if http2 and importlib.util.find_spec("h2") is None:
+        print("Uyarı: GITHUB_HTTP2 için h2 paketi yüklü değil, HTTP/1.1 kullanılıyor", file=sys.stderr)
+        http2 = False
+    
+    return httpx.AsyncClient(
+        headers={
+            "Accept": "application/vnd.github.v3+json",
+            "X-GitHub-Api-Version": "2022-11-28"
+        },
+        timeout=30.0,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+def get_http_client() -> httpx.AsyncClient:
+    """Aktif HTTP client'ı döndür, yoksa oluştur"""
+    global http_client
+    if http_client is None:
+        http_client = create_http_client()
+    return http_client
+
+# Önbellek yapılandırması
+CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "256"))
+
+# Aynı anda uçuşta olabilecek en fazla istek sayısı
+MAX_CONCURRENT_REQUESTS = int(os.getenv("GITHUB_MAX_CONCURRENT_REQUESTS", "8"))
+request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Hız sınırı yapılandırması
+# Kalan bütçe bu değerin altına düştüğünde istekler sıfırlanma anına kadar yayılır
+RATE_LIMIT_RESERVE = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "100"))
+# Bundan uzun bekleme gerektiren istekler kuyrukta tutulmaz, hata döner
+RATE_LIMIT_MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))
+# GitHub, yazma isteklerinin ardışık ve en az 1 sn arayla gönderilmesini önerir
+MAX_CONCURRENT_MUTATIONS = int(os.getenv("GITHUB_MAX_CONCURRENT_MUTATIONS", "1"))
+MUTATION_INTERVAL = float(os.getenv("GITHUB_MUTATION_INTERVAL", "1.0"))
+# Hız sınırı yanıtı alınan istek en fazla kaç kez yeniden kuyruğa alınır
+RATE_LIMIT_RETRIES = 1
+
+# Yeniden deneme yapılandırması
+RETRY_MAX_ATTEMPTS = int(os.getenv("GITHUB_RETRY_MAX_ATTEMPTS", "4"))
+RETRY_BASE_DELAY = float(os.getenv("GITHUB_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("GITHUB_RETRY_MAX_DELAY", "8"))
+# İlk denemeden itibaren yeniden denemelere ayrılan toplam süre (sn)
+RETRY_DEADLINE = float(os.getenv("GITHUB_RETRY_DEADLINE", "30"))
+
+# Metrik yapılandırması
+METRICS_ENABLED = os.getenv("GITHUB_METRICS", "1").lower() not in ("0", "false", "no")
+# Prometheus metin çıktısı için dosya yolu ve/veya yerel port (boşsa kapalı)
+METRICS_FILE = os.getenv("GITHUB_METRICS_FILE", "")
+METRICS_PORT = int(os.getenv("GITHUB_METRICS_PORT", "0"))
+METRICS_FILE_INTERVAL = float(os.getenv("GITHUB_METRICS_FILE_INTERVAL", "15"))
+
+# Yanıt gövdeleri için JSON çözücü; orjson kuruluysa o kullanılır (pip install orjson)
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+    json_loads = orjson.loads
+else:
+    json_loads = json.loads
+
+# Webhook dinleyicisi yapılandırması (port 0 ise kapalı; secret zorunludur)
+WEBHOOK_PORT = int(os.getenv("GITHUB_WEBHOOK_PORT", "0"))
+WEBHOOK_HOST = os.getenv("GITHUB_WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+# GitHub webhook gövdeleri en fazla 25 MB olabilir
+WEBHOOK_MAX_BODY = 25 * 1024 * 1024
+
+# merge_queue'nun mergeable yoklama aralığı (sn); durum değişmedikçe üst sınıra kadar katlanır
+MERGE_POLL_INTERVAL = float(os.getenv("GITHUB_MERGE_POLL_INTERVAL", "1"))
+MERGE_POLL_MAX_INTERVAL = float(os.getenv("GITHUB_MERGE_POLL_MAX_INTERVAL", "15"))
+
+# Arka plan işleri (job): bitenler bu süre (sn) sonra silinir, aynı anda en fazla bu kadarı çalışır
+JOB_TTL = float(os.getenv("GITHUB_JOB_TTL", "3600"))
+JOB_MAX_RUNNING = int(os.getenv("GITHUB_JOB_MAX_RUNNING", "20"))
+# get_job_result'ın bir çağrıda en fazla bekleme süresi (sn)
+JOB_MAX_WAIT = float(os.getenv("GITHUB_JOB_MAX_WAIT", "30"))
+
+# Çoklu repo sorgularında aynı anda işlenen en fazla repository sayısı
+MULTI_REPO_CONCURRENCY = int(os.getenv("GITHUB_MULTI_REPO_CONCURRENCY", "8"))
+
+# search_pull_requests sonuçlarının yeniden kullanılacağı süre (sn, 0 ise kapalı)
+SEARCH_CACHE_TTL = float(os.getenv("GITHUB_SEARCH_CACHE_TTL", "60"))
+SEARCH_CACHE_MAX_ENTRIES = 64
+# GitHub arama sorgusunun en fazla uzunluğu; daha uzun repo listeleri birden çok sorguya bölünür
+SEARCH_QUERY_MAX_LENGTH = 256
+
+# Sayfalı uç noktalarda sayfa başına istenen öğe sayısı (GitHub üst sınırı 100)
+PAGE_SIZE = 100
+
+# GraphQL yapılandırması
+# GHE'de REST adresi .../api/v3, GraphQL adresi .../api/graphql biçimindedir
+GITHUB_GRAPHQL_URL = os.getenv(
+    "GITHUB_GRAPHQL_URL",
+    GITHUB_API_BASE[:-2] + "graphql" if GITHUB_API_BASE.endswith("/v3") else f"{GITHUB_API_BASE}/graphql"
 )
+# Varsayılan olarak GraphQL ile çalışacak tool'lar (virgülle ayrılmış ya da "all")
+GRAPHQL_TOOLS = {t.strip() for t in os.getenv("GITHUB_GRAPHQL_TOOLS", "").split(",") if t.strip()}
+
+# Yerel PR deposu yapılandırması (GITHUB_PR_STORE boşsa depo kapalıdır)
+PR_STORE_PATH = os.getenv("GITHUB_PR_STORE", "")
+# Depodan yanıt verilirken kabul edilen en fazla senkron yaşı (sn)
+PR_STORE_MAX_AGE = float(os.getenv("GITHUB_PR_STORE_MAX_AGE", "60"))
+# İlk senkronda çekilen en fazla PR sayısı; daha eskileri depoda yer almaz
+PR_STORE_SYNC_LIMIT = int(os.getenv("GITHUB_PR_STORE_SYNC_LIMIT", "1000"))
+
+# Diff/blob disk önbelleği yapılandırması (GITHUB_DIFF_CACHE_DIR boşsa kapalıdır)
+DIFF_CACHE_DIR = os.getenv("GITHUB_DIFF_CACHE_DIR", "")
+DIFF_CACHE_MAX_BYTES = int(float(os.getenv("GITHUB_DIFF_CACHE_MAX_MB", "512")) * 1024 * 1024)
+# Bu boyuttan büyük kayıtlar belleğe kopyalanmadan mmap ile okunur
+DIFF_CACHE_MMAP_THRESHOLD = 1024 * 1024
+# Ham içerik medya türleri
+DIFF_MEDIA_TYPE = "application/vnd.github.diff"
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
 
-# MCP sunucusu oluştur
-app = Server("github-pr-server")
+# Dosya durumlarının gösterimi
+FILE_STATUS_EMOJI = {
+    "added": "➕",
+    "modified": "📝",
+    "removed": "➖",
+    "renamed": "📋"
+}
+
+# get_pull_request özetinde listelenen en fazla dosya sayısı
+SUMMARY_FILE_LIMIT = 100
+
+# Büyük dosya listeleri ve diff'ler için çıktı bütçesi
+# Bir çağrıda döndürülen en fazla metin; aşılırsa devam imleci (cursor) verilir
+OUTPUT_MAX_BYTES = int(os.getenv("GITHUB_OUTPUT_MAX_BYTES", "100000"))
+# Çıktı bu boyutu aşmayan TextContent parçalarına bölünür
+OUTPUT_CHUNK_BYTES = int(os.getenv("GITHUB_OUTPUT_CHUNK_BYTES", "16000"))
+
+# MCP sunucusu; main() içinde create_app() ile oluşturulur
+app = None
 
 # Yardımcı fonksiyonlar
-async def parse_repo_url(repo_url: str) -> tuple[str, str]:
-    """GitHub repo URL'sinden owner ve repo adını çıkar"""
-    repo_url = repo_url.rstrip("/")
-    
-    if "github.com" in repo_url:
-        parts = repo_url.split("/")
-        owner = parts[-2]
-        repo = parts[-1].replace(".git", "")
+@dataclass(frozen=True, eq=False)
+class RepoRef:
+    """Repository'nin kanonik kimliği; GitHub adları büyük/küçük harf duyarsız olduğundan karşılaştırma key ile yapılır"""
+    host: str
+    owner: str
+    repo: str
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.host.lower(), self.owner.lower(), self.repo.lower()
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.repo}"
+
+    @property
+    def slug(self) -> str:
+        """Önbellek anahtarlarında kullanılan küçük harfli owner/repo"""
+        return self.full_name.lower()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RepoRef) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+# git@github.com:owner/repo.git biçimindeki SSH adresleri
+SCP_URL_PATTERN = re.compile(r"^(?:[\w.-]+@)?(?P<host>[\w.-]+):(?!//)(?P<path>.+)$")
+OWNER_PATTERN = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]*)$")
+REPO_NAME_PATTERN = re.compile(r"^[\w.-]+$")
+# github.com'da kullanıcı/org adı olamayan ilk yol parçaları (örn. /orgs/o/r, /settings/...)
+RESERVED_OWNERS = frozenset({
+    "about", "apps", "codespaces", "collections", "enterprises", "explore", "features", "issues",
+    "login", "marketplace", "new", "notifications", "organizations", "orgs", "pricing", "pulls",
+    "search", "settings", "site", "sponsors", "topics", "users",
+})
+# list_pull_requests_multi'de repo adı yerine glob deseni verilebilir (owner/api-*)
+REPO_GLOB_PATTERN = re.compile(r"^[\w.*?\[\]!-]+$")
+# API isteklerindeki /repos/{owner}/{repo} öneki; önbellek anahtarlarında küçük harfe çevrilir
+REPO_URL_SEGMENT = re.compile(r"/repos/[^/?#]+/[^/?#]+")
+
+def split_repo_url(repo_url: str) -> Tuple[str, str, str]:
+    """URL'yi (host, owner, repo) parçalarına ayır; repo adı doğrulanmaz
+
+    owner/repo, https://host/owner/repo[.git][/pull/12...], host/owner/repo,
+    git@host:owner/repo.git, git@host:port/owner/repo, ssh://git@host/owner/repo ve API URL'leri
+    (api.github.com/repos/owner/repo, GHE'de /api/v3/repos/...) desteklenir.
+    Yalnızca sunucunun bağlı olduğu host'taki (GITHUB_HOST) repository'ler kabul edilir.
+    """
+    text = repo_url.strip()
+    host = GITHUB_HOST
+    scp = SCP_URL_PATTERN.match(text)
+    if scp:
+        host, path = scp["host"], scp["path"]
+        # git@host:443/owner/repo biçiminde ilk parça port numarasıdır
+        port, _, rest = path.partition("/")
+        if port.isdigit() and rest.strip("/").count("/") >= 1:
+            path = rest
+    elif "://" in text:
+        parsed = urlparse(text)
+        host, path = parsed.hostname or host, parsed.path
     else:
-        # owner/repo formatında olabilir
-        parts = repo_url.split("/")
-        owner = parts[0]
-        repo = parts[1]
+        path = text.split("?", 1)[0].split("#", 1)[0]
+        first, _, rest = path.partition("/")
+        # Kullanıcı adları nokta içeremez; github.com/owner/repo gibi şemasız URL
+        if "." in first and rest.count("/") >= 1:
+            host, path = first, rest
+    
+    parts = [part for part in path.split("/") if part]
+    # API adresleri: api.github.com/repos/owner/repo, GHE'de host/api/v3/repos/owner/repo
+    api = host.startswith("api.")
+    if parts[:2] == ["api", "v3"]:
+        parts, api = parts[2:], True
+    if api and parts[:1] == ["repos"]:
+        parts = parts[1:]
+    host = host.lower()
+    if host in ("api.github.com", "www.github.com"):
+        host = "github.com"
+    if host not in (GITHUB_HOST.lower(), (urlparse(GITHUB_API_BASE).hostname or "").lower()):
+        raise ValueError(
+            f"Desteklenmeyen host: {repo_url} ({host}); sunucu {GITHUB_HOST} için yapılandırılmış "
+            f"(GITHUB_API_URL / GITHUB_HOST)"
+        )
+    
+    if len(parts) < 2:
+        raise ValueError(f"Geçersiz repository adresi: {repo_url} (owner/repo bekleniyor)")
+    owner, repo = parts[0], parts[1]
+    if owner.lower() in RESERVED_OWNERS:
+        raise ValueError(f"Geçersiz repository adresi: {repo_url} ({owner}/ bir repository yolu değil)")
+    # Yalnızca tek .git soneki atılır; GitHub repository adları .git ile bitemez
+    if repo.endswith(".git"):
+        repo = repo[:-4]
+    if not OWNER_PATTERN.match(owner) or repo.endswith(".git"):
+        raise ValueError(f"Geçersiz repository adresi: {repo_url}")
+    return host, owner, repo
+
+@lru_cache(maxsize=REPO_CACHE_SIZE)
+def resolve_repo_ref(repo_url: str) -> RepoRef:
+    """Her URL biçimini kanonik (host, owner, repo) kimliğine çevir (bkz. split_repo_url)"""
+    host, owner, repo = split_repo_url(repo_url)
+    if not REPO_NAME_PATTERN.match(repo) or repo in (".", ".."):
+        raise ValueError(f"Geçersiz repository adresi: {repo_url}")
+    return RepoRef(host, owner, repo)
+
+def parse_repo_url(repo_url: str) -> Tuple[str, str]:
+    """GitHub repo URL'sinden owner ve repo adını çıkar; yeniden adlandırma çözüldüyse güncel adı döndür"""
+    ref = repo_identities.canonical(resolve_repo_ref(repo_url))
+    return ref.owner, ref.repo
+
+def api_path(url: str) -> str:
+    """Tam URL'den API tabanı (GHE'de /api/v3) atılmış yolu döndür"""
+    path = urlparse(url).path
+    base_path = urlparse(GITHUB_API_BASE).path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    return path
+
+@dataclass
+class CacheEntry:
+    """Önbellekteki tek bir GET yanıtı"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: Any
+    next_url: Optional[str] = None
+
+    def validators(self) -> Dict[str, str]:
+        """Koşullu istek başlıklarını döndür"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """ETag/Last-Modified tabanlı, LRU tahliyeli GET yanıt önbelleği"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        # Webhook dinleyicisi açıkken güncel tutulan yolların deseni
+        self.trusted: Optional["re.Pattern[str]"] = None
+        self.trusted_hits = 0
+        self.invalidations = 0
+        # Her silmede artar; silmeden önce başlamış isteklerin yanıtı saklanmaz
+        self.generation = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """URL ve parametrelerden önbellek anahtarı üret; owner/repo yazımı anahtarı değiştirmez"""
+        url = REPO_URL_SEGMENT.sub(lambda match: match[0].lower(), url, count=1)
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Kaydı bul ve en son kullanılan olarak işaretle"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def is_trusted(self, key: str) -> bool:
+        """Kayıt doğrulama isteği olmadan sunulabilir mi"""
+        return self.trusted is not None and self.trusted.match(api_path(key)) is not None
+
+    def invalidate(self, match: Callable[[str], bool]) -> int:
+        """Küçük harfe çevrilmiş API yolu match'e uyan kayıtları sil"""
+        self.generation += 1
+        stale = [key for key in self._entries if match(api_path(key).lower())]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def store(self, key: str, response: httpx.Response, body: Any, generation: Optional[int] = None) -> None:
+        """Doğrulayıcı başlığı olan yanıtı kaydet, gerekirse en eskiyi at"""
+        if generation is not None and generation != self.generation:
+            return
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            self._entries.pop(key, None)
+            return
+        next_url = response.links.get("next", {}).get("url")
+        self._entries[key] = CacheEntry(etag, last_modified, body, next_url)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Tüm kayıtları sil"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Önbellek sayaçlarını döndür"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "trusted_hits": self.trusted_hits,
+            "invalidations": self.invalidations,
+        }
+
+response_cache = ResponseCache()
+
+class Record(Mapping):
+    """Projeksiyonla üretilen, yalnızca seçili alanları tutan hafif kayıt
+    
+    Formatlayıcıların dict erişimiyle (pr["user"]["login"]) çalışmaya devam
+    etmesi için Mapping arayüzünü sağlar. Yanıtta olmayan alanlar atanmaz.
+    "items" gibi alanlar aynı adlı Mapping metotlarını gölgeler; bunlara
+    record["items"] ile erişilmelidir.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return (name for name in self.__slots__ if hasattr(self, name))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON'a yazmak için düz dict'e çevir (iç kayıtlar json.dumps default'u ile çözülür)"""
+        return dict(self)
+
+class Projection:
+    """Yanıttan yalnızca belirtilen alanları slotlu kayıtlara kopyalar
+    
+    Alanlar noktalı yollarla verilir ("user.login"). Liste değerlerinde
+    (örn. "labels.name") projeksiyon her öğeye uygulanır.
+    """
+
+    def __init__(self, name: str, fields: Tuple[str, ...]):
+        self.name = name
+        self.fields = fields
+        tree: Dict[str, Any] = {}
+        for field in fields:
+            node = tree
+            for part in field.split("."):
+                node = node.setdefault(part, {})
+        self._children = {
+            key: Projection(f"{name}_{key}", tuple(self._subfields(fields, key))) if subtree else None
+            for key, subtree in tree.items()
+        }
+        self._record = type(name, (Record,), {"__slots__": tuple(tree)})
+
+    @staticmethod
+    def _subfields(fields: Tuple[str, ...], key: str) -> List[str]:
+        prefix = f"{key}."
+        return [f[len(prefix):] for f in fields if f.startswith(prefix)]
+
+    def apply(self, data: Any) -> Any:
+        """Çözülmüş JSON'u kayıtlara dönüştür; listeler öğe öğe işlenir"""
+        if isinstance(data, list):
+            return [self.apply(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+        record = self._record()
+        for key, child in self._children.items():
+            if key in data:
+                value = data[key]
+                setattr(record, key, child.apply(value) if child is not None else value)
+        return record
+
+def dump_json(data: Any) -> str:
+    """Kayıt içerebilen veriyi kompakt JSON'a çevir"""
+    return json.dumps(data, separators=(",", ":"), default=Record.to_dict)
+
+# Tool'ların formatlayıcılarında okunan alanlar
+# list_pull_requests, list_pull_requests_multi ve PR deposunun liste kayıtları
+PULL_SUMMARY = Projection("PullSummary", (
+    "number", "title", "state", "draft", "user.login", "html_url",
+    "created_at", "updated_at", "head.ref", "base.ref", "labels.name",
+    "requested_reviewers.login", "requested_teams.slug"
+))
+# search_pull_requests sonuç sayfaları
+SEARCH_RESULT = Projection("SearchResult", (
+    "total_count", "incomplete_results",
+    "items.number", "items.title", "items.state", "items.draft", "items.user.login",
+    "items.html_url", "items.updated_at", "items.repository_url", "items.labels.name",
+    "items.pull_request.merged_at"
+))
+# list_pull_requests_multi için org/kullanıcı repository listesi
+REPO_SUMMARY = Projection("RepoSummary", ("name", "archived", "owner.login"))
+# Repository kimliği (yeniden adlandırma çözümü)
+REPO_IDENTITY = Projection("RepoIdentity", ("id", "full_name"))
+# get_pull_request
+PULL_DETAIL = Projection("PullDetail", (
+    "number", "title", "body", "state", "draft", "user.login", "html_url",
+    "created_at", "updated_at", "head.ref", "head.sha", "base.ref", "base.sha",
+    "additions", "deletions", "changed_files", "comments", "review_comments",
+    "requested_reviewers.login", "requested_teams.slug"
+))
+REVIEW_SUMMARY = Projection("ReviewSummary", ("user.login", "state"))
+# merge_queue yoklaması
+MERGE_STATE = Projection("MergeState", (
+    "number", "title", "state", "draft", "merged", "mergeable", "mergeable_state", "head.sha"
+))
+# get_pr_files ve get_pull_request dosya özeti
+FILE_SUMMARY = Projection("FileSummary", ("filename", "status", "additions", "deletions"))
+# get_pr_diff
+FILE_PATCH = Projection("FilePatch", (
+    "filename", "previous_filename", "status", "additions", "deletions", "patch", "sha"
+))
+
+class GitHubAPIError(RuntimeError):
+    """GitHub API'nin başarısız HTTP yanıtı"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+class RateLimitError(RuntimeError):
+    """Hız sınırı nedeniyle istek gönderilemedi"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+@dataclass
+class RateLimitBucket:
+    """Tek bir hız sınırı kaynağının (core, search, graphql) durumu"""
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset: float = 0.0
+    blocked_until: float = 0.0
+    next_slot: float = 0.0
+
+class RateLimitScheduler:
+    """Yanıt başlıklarından kalan bütçeyi izleyip istekleri sıraya koyan zamanlayıcı"""
+
+    def __init__(
+        self,
+        reserve: int = RATE_LIMIT_RESERVE,
+        max_wait: float = RATE_LIMIT_MAX_WAIT,
+        max_mutations: int = MAX_CONCURRENT_MUTATIONS,
+        mutation_interval: float = MUTATION_INTERVAL
+    ):
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.mutation_interval = mutation_interval
+        self.buckets: Dict[str, RateLimitBucket] = {}
+        self._mutation_semaphore = asyncio.Semaphore(max_mutations)
+        self._next_mutation = 0.0
+        self.queued = 0
+        self.in_flight = 0
+        self.throttled = 0
+        self.rate_limited = 0
+
+    @staticmethod
+    def resource_for(url: str) -> str:
+        """İsteğin tabi olduğu hız sınırı kaynağını bul"""
+        path = urlparse(url).path
+        if "/search/" in path:
+            return "search"
+        if path.endswith("/graphql"):
+            return "graphql"
+        if path.endswith("/rate_limit"):
+            # Bütçeden düşmez, engelli olunsa bile sorgulanabilir
+            return "rate_limit"
+        return "core"
+
+    def bucket(self, resource: str) -> RateLimitBucket:
+        """Kaynağın durum kaydını döndür"""
+        return self.buckets.setdefault(resource, RateLimitBucket())
+
+    def _blocked_for(self, bucket: RateLimitBucket) -> float:
+        """Bütçe tükendiyse veya Retry-After varsa beklenecek süre"""
+        now = time.time()
+        wait = bucket.blocked_until - now
+        if bucket.remaining is not None and bucket.remaining <= 0:
+            wait = max(wait, bucket.reset - now)
+        return wait
+
+    def _pace(self, bucket: RateLimitBucket) -> float:
+        """Bütçe azaldığında kalan istekleri sıfırlanmaya kadar eşit aralıklarla dağıt"""
+        now = time.time()
+        if bucket.remaining is None or bucket.remaining > self.reserve or bucket.reset <= now:
+            return 0.0
+        interval = (bucket.reset - now) / max(bucket.remaining, 1)
+        slot = max(now, bucket.next_slot)
+        bucket.next_slot = slot + interval
+        return slot - now
+
+    @asynccontextmanager
+    async def slot(self, resource: str, mutating: bool = False):
+        """İstek için sıra bekle; çıkışta yazma kilidini bırak"""
+        bucket = self.bucket(resource)
+        acquired = False
+        self.queued += 1
+        try:
+            while (wait := self._blocked_for(bucket)) > 0:
+                if wait > self.max_wait:
+                    raise RateLimitError(
+                        f"GitHub hız sınırı aşıldı, {wait:.0f} sn sonra tekrar deneyin",
+                        wait
+                    )
+                self.throttled += 1
+                await asyncio.sleep(wait)
+            
+            pace = self._pace(bucket)
+            if pace > 0:
+                self.throttled += 1
+                await asyncio.sleep(pace)
+            
+            if mutating:
+                await self._mutation_semaphore.acquire()
+                acquired = True
+                now = time.monotonic()
+                start = max(now, self._next_mutation)
+                self._next_mutation = start + self.mutation_interval
+                if start > now:
+                    await asyncio.sleep(start - now)
+        except BaseException:
+            if acquired:
+                self._mutation_semaphore.release()
+            raise
+        finally:
+            self.queued -= 1
+        
+        # Eşzamanlı isteklerin aynı bütçeyi görmemesi için iyimser düşüş
+        if bucket.remaining:
+            bucket.remaining -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if acquired:
+                self._mutation_semaphore.release()
+
+    @staticmethod
+    def is_rate_limited(response: httpx.Response) -> bool:
+        """Yanıt birincil veya ikincil hız sınırından mı geldi"""
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        return (
+            "Retry-After" in response.headers
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in response.text.lower()
+        )
+
+    def update(self, resource: str, response: httpx.Response) -> None:
+        """Yanıt başlıklarıyla bütçeyi güncelle"""
+        headers = response.headers
+        bucket = self.bucket(headers.get("X-RateLimit-Resource", resource))
+        if "X-RateLimit-Remaining" in headers:
+            bucket.remaining = int(headers["X-RateLimit-Remaining"])
+            bucket.limit = int(headers.get("X-RateLimit-Limit", bucket.limit or 0))
+            bucket.reset = float(headers.get("X-RateLimit-Reset", bucket.reset))
+        
+        if self.is_rate_limited(response):
+            self.rate_limited += 1
+            now = time.time()
+            if "Retry-After" in headers:
+                until = now + float(headers["Retry-After"])
+            elif bucket.remaining == 0:
+                until = bucket.reset
+            else:
+                # İkincil sınırda başlık yoksa GitHub en az bir dakika beklenmesini önerir
+                until = now + 60
+            bucket.blocked_until = max(bucket.blocked_until, until)
+
+    def update_from_rate_limit(self, resources: Dict[str, Dict[str, int]]) -> None:
+        """/rate_limit yanıtındaki tüm kaynakları kaydet"""
+        for name, info in resources.items():
+            bucket = self.bucket(name)
+            bucket.limit = info.get("limit")
+            bucket.remaining = info.get("remaining")
+            bucket.reset = float(info.get("reset", 0))
+
+class Credential:
+    """Havuzdaki tek kimlik bilgisi (PAT ya da GitHub App kurulum token'ı)
+
+    Her kimliğin kendi hız sınırı zamanlayıcısı vardır; GitHub bütçeyi token başına tutar.
+    scopes boşsa token tüm repository'ler için kullanılabilir.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        token: Optional[str] = None,
+        scopes: Optional[List[str]] = None,
+        app_id: Optional[str] = None,
+        installation_id: Optional[str] = None,
+        private_key_path: Optional[str] = None
+    ):
+        self.name = name
+        self.token = token
+        self.scopes = [scope.lower() for scope in scopes or []]
+        self.app_id = app_id
+        self.installation_id = installation_id
+        self.private_key_path = private_key_path
+        self.expires_at = 0.0
+        self.refreshes = 0
+        self.requests = 0
+        self.login: Optional[str] = None
+        self.error: Optional[str] = None
+        self.disabled_until = 0.0
+        self.scheduler = RateLimitScheduler()
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def is_app(self) -> bool:
+        return self.installation_id is not None
+    
+    @property
+    def usable(self) -> bool:
+        """Son token yenilemesi başarısız olduysa bekleme süresi dolana kadar kullanılmaz"""
+        return self.error is None or time.time() >= self.disabled_until
+
+    def covers(self, owner: Optional[str], repo: Optional[str]) -> bool:
+        """Token bu owner/repo'ya erişebiliyor mu (owner/* ve glob desenleri desteklenir)"""
+        if not self.scopes or owner is None:
+            return True
+        owner = owner.lower()
+        if repo is None:
+            return any(fnmatch.fnmatchcase(owner, scope.split("/", 1)[0]) for scope in self.scopes)
+        full_name = f"{owner}/{repo.lower()}"
+        return any(fnmatch.fnmatchcase(full_name, scope) for scope in self.scopes)
+
+    def headroom(self, resource: str) -> Tuple[float, float]:
+        """Seçim önceliği: önce engelsiz olanlar (en kısa bekleme), sonra en çok kalan bütçe"""
+        bucket = self.scheduler.bucket(resource)
+        wait = self.scheduler._blocked_for(bucket)
+        remaining = bucket.remaining if bucket.remaining is not None else float("inf")
+        return -max(wait, 0.0), remaining
+
+    async def authorization(self) -> str:
+        """Authorization başlığı; kurulum token'ı süresi dolmadan yenilenir"""
+        if self.is_app and time.time() >= self.expires_at - APP_TOKEN_REFRESH_MARGIN:
+            async with self._refresh_lock:
+                # Kilit beklenirken başka bir istek yenilemiş ya da yenilemeyi denemiş olabilir
+                if not self.usable:
+                    raise RuntimeError(f"GitHub App token'ı alınamadı ({self.name}): {self.error}")
+                if time.time() >= self.expires_at - APP_TOKEN_REFRESH_MARGIN:
+                    try:
+                        await self._refresh_installation_token()
+                    except Exception as e:
+                        self.error = str(e) or type(e).__name__
+                        self.disabled_until = time.time() + APP_TOKEN_RETRY_INTERVAL
+                        raise
+                    self.error = None
+        return f"Bearer {self.token}"
+
+    def _app_jwt(self) -> str:
+        """App kimliğiyle 10 dakikalık RS256 JWT üret"""
+        if importlib.util.find_spec("jwt") is None:
+            raise RuntimeError("GitHub App token'ları için PyJWT gerekli (pip install \"pyjwt[crypto]\")")
+        import jwt
+
+        with open(self.private_key_path, encoding="utf-8") as f:
+            private_key = f.read()
+        now = int(time.time())
+        # Saat kaymasına karşı iat 60 sn geriye alınır
+        return jwt.encode({"iat": now - 60, "exp": now + 540, "iss": str(self.app_id)}, private_key, algorithm="RS256")
+
+    async def _app_request(self, method: str, endpoint: str, authorization: str) -> Dict[str, Any]:
+        """Havuzu ve önbelleği atlayarak App uç noktalarına istek gönder"""
+        response = await get_http_client().request(
+            method, f"{GITHUB_API_BASE}{endpoint}", headers={"Authorization": authorization}
+        )
+        if response.status_code >= 400:
+            raise GitHubAPIError(
+                f"GitHub App token hatası ({self.name}): {response.status_code} - {response.text[:200]}",
+                response.status_code
+            )
+        return json_loads(response.content)
+
+    async def _refresh_installation_token(self) -> None:
+        """Yeni kurulum token'ı al; kapsam verilmemişse kurulumun repository'lerinden çıkar"""
+        app_auth = f"Bearer {self._app_jwt()}"
+        data = await self._app_request(
+            "POST", f"/app/installations/{self.installation_id}/access_tokens", app_auth
+        )
+        self.token = data["token"]
+        self.expires_at = datetime.fromisoformat(data["expires_at"].replace("Z", "+00:00")).timestamp()
+        self.refreshes += 1
+        if self.scopes:
+            return
+        installation = await self._app_request("GET", f"/app/installations/{self.installation_id}", app_auth)
+        if installation.get("repository_selection") == "all":
+            self.scopes = [f"{installation['account']['login'].lower()}/*"]
+            return
+        scopes, page = [], 1
+        while True:
+            listing = await self._app_request(
+                "GET", f"/installation/repositories?per_page=100&page={page}", f"Bearer {self.token}"
+            )
+            scopes.extend(r["full_name"].lower() for r in listing["repositories"])
+            if len(scopes) >= listing["total_count"] or not listing["repositories"]:
+                break
+            page += 1
+        self.scopes = scopes
+
+    async def user_login(self) -> str:
+        """Token'ın yazdığı yorumlarda görünen login; bir kez sorgulanır"""
+        if self.login is None:
+            if self.is_app:
+                # Kurulum token'ları /user'a erişemez, App adına yazılanlar slug[bot] olarak görünür
+                app = await self._app_request("GET", "/app", f"Bearer {self._app_jwt()}")
+                self.login = f"{app['slug']}[bot]"
+            else:
+                response = await send_request("GET", f"{GITHUB_API_BASE}/user", credential=self)
+                if response.status_code >= 400:
+                    raise GitHubAPIError(
+                        f"GitHub API hatası ({self.name}): {response.status_code} - {response.text[:200]}",
+                        response.status_code
+                    )
+                self.login = json_loads(response.content)["login"]
+        return self.login
+
+    def stats(self) -> Dict[str, Any]:
+        """Kimliğin sayaçlarını döndür"""
+        core = self.scheduler.bucket("core")
+        return {
+            "requests": self.requests,
+            "remaining": core.remaining,
+            "limit": core.limit,
+            "refreshes": self.refreshes,
+            "error": None if self.usable else self.error,
+        }
+
+class TokenPool:
+    """Kimlik havuzu; her istek kapsamı uyan ve en çok bütçesi kalan token'la gönderilir"""
+
+    def __init__(self, credentials: List[Credential]):
+        self.credentials = credentials
+
+    @classmethod
+    def from_env(cls) -> "TokenPool":
+        """GITHUB_TOKEN, GITHUB_TOKENS ve GITHUB_TOKEN_POOL_FILE'dan havuzu kur"""
+        credentials = []
+        if GITHUB_TOKEN:
+            credentials.append(Credential("GITHUB_TOKEN", GITHUB_TOKEN))
+        for index, token in enumerate(t.strip() for t in GITHUB_TOKENS.split(",")):
+            if token:
+                credentials.append(Credential(f"GITHUB_TOKENS[{index}]", token))
+        if TOKEN_POOL_FILE:
+            with open(TOKEN_POOL_FILE, encoding="utf-8") as f:
+                entries = json.load(f)
+            if isinstance(entries, dict):
+                entries = entries.get("tokens", [])
+            for index, entry in enumerate(entries):
+                name = entry.get("name") or f"{os.path.basename(TOKEN_POOL_FILE)}[{index}]"
+                token = entry.get("token") or (os.getenv(entry["token_env"]) if "token_env" in entry else None)
+                if token is None and "installation_id" not in entry:
+                    raise ValueError(f"Token havuzu kaydında token ya da installation_id yok: {name}")
+                credentials.append(Credential(
+                    name,
+                    token,
+                    entry.get("repos"),
+                    entry.get("app_id"),
+                    entry.get("installation_id"),
+                    entry.get("private_key_path"),
+                ))
+        return cls(credentials)
+
+    @staticmethod
+    def scope_of(url: str) -> Tuple[Optional[str], Optional[str]]:
+        """İsteğin hedeflediği owner ve repo (repo'ya bağlı değilse None)"""
+        parts = api_path(url).strip("/").split("/")
+        if len(parts) >= 3 and parts[0] == "repos":
+            return parts[1], parts[2]
+        if len(parts) >= 2 and parts[0] in ("orgs", "users"):
+            return parts[1], None
+        return None, None
+
+    async def select(self, url: str, resource: str) -> Credential:
+        """Kapsamı uyan kimliklerden engellenmemiş ve en çok bütçesi kalanı seç"""
+        if len(self.credentials) == 1:
+            return self.credentials[0]
+        # Kapsamı verilmemiş kurulumların repository'leri ilk token alınırken öğrenilir;
+        # token'ı alınamayanlar işaretlenip kalan kimliklerle devam edilir
+        unresolved = [c for c in self.credentials if c.is_app and not c.scopes and not c.refreshes and c.usable]
+        if unresolved:
+            await asyncio.gather(*(c.authorization() for c in unresolved), return_exceptions=True)
+        candidates = [c for c in self.credentials if c.usable]
+        owner, repo = self.scope_of(url)
+        if owner is None:
+            # Arama gibi repository'ye bağlı olmayan istekler için kapsamsız token'lar tercih edilir
+            eligible = [c for c in candidates if not c.scopes] or candidates
+        else:
+            eligible = [c for c in candidates if c.covers(owner, repo)]
+        if not eligible:
+            target = f"{owner}/{repo}" if repo else owner or "istek"
+            disabled = [f"{c.name}: {c.error}" for c in self.credentials if not c.usable]
+            raise ValueError(
+                f"{target} için yetkili token yok (token havuzu kapsamlarını kontrol edin)" +
+                (f"; kullanılamayan kimlikler: {'; '.join(disabled)}" if disabled else "")
+            )
+        return max(eligible, key=lambda c: c.headroom(resource))
+
+    async def logins(self) -> List[str]:
+        """Havuzdaki token'ların login'leri; sorgulanamayanlar atlanır"""
+        results = await asyncio.gather(*(c.user_login() for c in self.credentials), return_exceptions=True)
+        return [login for login in results if isinstance(login, str)]
+
+    def stats(self) -> Dict[str, int]:
+        """Tüm kimliklerin zamanlayıcı sayaçlarının toplamı"""
+        schedulers = [c.scheduler for c in self.credentials]
+        return {
+            "tokens": len(self.credentials),
+            "queued": sum(s.queued for s in schedulers),
+            "in_flight": sum(s.in_flight for s in schedulers),
+            "throttled": sum(s.throttled for s in schedulers),
+            "rate_limited": sum(s.rate_limited for s in schedulers),
+        }
+
+token_pool = TokenPool.from_env()
+
+class RetryPolicy:
+    """Geçici hatalar için jitter'lı üstel geri çekilmeli yeniden deneme politikası"""
     
-    return owner, repo
+    RETRYABLE_STATUS = {502, 503, 504}
+    # Bu metotlar aynı içerikle tekrarlandığında sonuç değişmez
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"}
+    # Bu hatalarda istek sunucuya hiç ulaşmamıştır
+    # httpx ilk kullanıma kadar içe aktarılmadığından sınıflar adlarıyla tutulur
+    NOT_SENT_ERRORS = ("ConnectError", "ConnectTimeout", "PoolTimeout")
+    TRANSIENT_ERRORS = ("TimeoutException", "NetworkError", "RemoteProtocolError")
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        deadline: float = RETRY_DEADLINE
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retries = 0
+        self.recovered = 0
+        self.exhausted = 0
+        self.duplicates_avoided = 0
+
+    def should_retry(
+        self,
+        idempotent: bool,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None
+    ) -> bool:
+        """Yanıt veya hata yeniden denemeye uygun mu"""
+        if error is not None:
+            if isinstance(error, tuple(getattr(httpx, name) for name in self.NOT_SENT_ERRORS)):
+                return True
+            return idempotent and isinstance(error, tuple(getattr(httpx, name) for name in self.TRANSIENT_ERRORS))
+        return idempotent and response.status_code in self.RETRYABLE_STATUS
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Tam jitter'lı bekleme süresi; Retry-After varsa ondan kısa olmaz"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if response is not None and "Retry-After" in response.headers:
+            delay = max(delay, float(response.headers["Retry-After"]))
+        return delay
+
+    def stats(self) -> Dict[str, int]:
+        """Yeniden deneme sayaçlarını döndür"""
+        return {
+            "retries": self.retries,
+            "recovered": self.recovered,
+            "exhausted": self.exhausted,
+            "duplicates_avoided": self.duplicates_avoided,
+        }
+
+retry_policy = RetryPolicy()
 
 async def github_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
     """GitHub API'ye istek gönder"""
-    url = f"{GITHUB_API_BASE}{endpoint}"
+    data, _ = await github_request_page(method, endpoint, **kwargs)
+    return data
+
+async def send_request(
+    method: str,
+    url: str,
+    credential: Optional[Credential] = None,
+    mutating: Optional[bool] = None,
+    **kwargs
+) -> httpx.Response:
+    """İsteği seçilen token'ın hız sınırı zamanlayıcısından geçirerek gönder
+
+    credential verilmezse her denemede havuzdan en çok bütçesi kalan token seçilir;
+    hız sınırına takılan token engellendiğinden yeniden deneme başka token'a gider.
+    Yeniden adlandırılan repository'lerin yönlendirmesi bir kez çözülüp istek yeni adla tekrarlanır.
+    mutating verilmezse GET/HEAD dışındaki istekler yazma kuyruğundan geçer.
+    """
+    url = repo_identities.rewrite(url)
+    resource = RateLimitScheduler.resource_for(url)
+    if mutating is None:
+        mutating = method not in ("GET", "HEAD")
+    headers = dict(kwargs.pop("headers", None) or {})
+    
+    for _ in range(RATE_LIMIT_RETRIES + 1):
+        chosen = credential or await token_pool.select(url, resource)
+        while True:
+            try:
+                headers["Authorization"] = await chosen.authorization()
+                break
+            except Exception:
+                # Token'ı yenilenemeyen App kimliği devre dışı kalır; istek havuzdaki başka kimlikle gönderilir
+                if credential is not None or len(token_pool.credentials) == 1:
+                    raise
+                chosen = await token_pool.select(url, resource)
+        kwargs["headers"] = headers
+        chosen.requests += 1
+        async with chosen.scheduler.slot(resource, mutating):
+            async with request_semaphore:
+                if not metrics.enabled:
+                    response = await get_http_client().request(method, url, **kwargs)
+                else:
+                    started = time.perf_counter()
+                    sent = len(kwargs["content"]) if "content" in kwargs else 0
+                    try:
+                        response = await get_http_client().request(method, url, **kwargs)
+                    except httpx.TransportError:
+                        metrics.observe_request(method, url, time.perf_counter() - started, sent=sent)
+                        raise
+                    sent = sent or len(response.request.content)
+                    metrics.observe_request(method, url, time.perf_counter() - started, response, sent)
+        chosen.scheduler.update(resource, response)
+        if not RateLimitScheduler.is_rate_limited(response):
+            if RESOLVE_RENAMES and response.status_code in RepoIdentityCache.REDIRECT_STATUS:
+                moved = await repo_identities.follow(url, response)
+                if moved is not None:
+                    return await send_request(method, moved, credential, mutating, **kwargs)
+            return response
+    
+    wait = max(chosen.scheduler.bucket(resource).blocked_until - time.time(), 0)
+    raise RateLimitError(
+        f"GitHub hız sınırı aşıldı, {wait:.0f} sn sonra tekrar deneyin",
+        wait
+    )
+
+class RepoIdentityCache:
+    """Repository id'leri ve yeniden adlandırma/taşıma eşlemeleri
+
+    GitHub eski adla gelen isteklere /repositories/{id} adresine 301/307 yönlendirmesi döner.
+    Yönlendirme bir kez izlenip yeni ad kaydedilir; sonraki istekler doğrudan yeni adla gönderilir.
+    """
+
+    REDIRECT_STATUS = {301, 302, 307, 308}
+    REPO_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)")
+    ID_PATH = re.compile(r"^/repositories/(\d+)")
+
+    def __init__(self):
+        self.ids: Dict[Tuple[str, str, str], int] = {}
+        self.names: Dict[int, RepoRef] = {}
+        self.aliases: Dict[Tuple[str, str, str], RepoRef] = {}
+        self.renames = 0
+
+    def canonical(self, ref: RepoRef) -> RepoRef:
+        """Yeniden adlandırıldıysa güncel kimliği döndür"""
+        return self.aliases.get(ref.key, ref)
+
+    def remember(self, ref: RepoRef, repo_id: int, full_name: str) -> RepoRef:
+        """API'nin döndürdüğü id ve güncel adı kaydet"""
+        owner, repo = full_name.split("/", 1)
+        current = RepoRef(ref.host, owner, repo)
+        self.ids[current.key] = repo_id
+        self.names[repo_id] = current
+        if current != ref:
+            self.aliases[ref.key] = current
+            self.renames += 1
+        return current
+
+    def rewrite(self, url: str) -> str:
+        """URL eski bir repository adını içeriyorsa güncel adla değiştir"""
+        if not self.aliases:
+            return url
+        match = self.REPO_PATH.match(api_path(url))
+        if match is None:
+            return url
+        current = self.aliases.get(RepoRef(GITHUB_HOST, match[1], match[2]).key)
+        if current is None:
+            return url
+        return url.replace(f"/repos/{match[1]}/{match[2]}", f"/repos/{current.full_name}", 1)
+
+    async def follow(self, url: str, response: httpx.Response) -> Optional[str]:
+        """Repository yönlendirmesini çöz; isteğin yeni adla gönderileceği URL'yi döndür"""
+        match = self.REPO_PATH.match(api_path(url))
+        moved = self.ID_PATH.match(api_path(response.headers.get("Location", "")))
+        if match is None or moved is None:
+            return None
+        repo_id = int(moved[1])
+        old = RepoRef(GITHUB_HOST, match[1], match[2])
+        if repo_id in self.names:
+            self.aliases[old.key] = self.names[repo_id]
+        else:
+            data = await github_request("GET", f"/repositories/{repo_id}", projection=REPO_IDENTITY)
+            self.remember(old, repo_id, data["full_name"])
+        rewritten = self.rewrite(url)
+        return rewritten if rewritten != url else None
+
+    async def repo_id(self, repo_url: str) -> int:
+        """Repository id'sini bir kez sorgulayıp önbellekten döndür"""
+        ref = self.canonical(resolve_repo_ref(repo_url))
+        if ref.key not in self.ids:
+            data = await github_request("GET", f"/repos/{ref.full_name}", projection=REPO_IDENTITY)
+            ref = self.remember(ref, data["id"], data["full_name"])
+        return self.ids[ref.key]
+
+    def stats(self) -> Dict[str, int]:
+        """Çözümleme sayaçlarını döndür"""
+        info = resolve_repo_ref.cache_info()
+        return {
+            "parsed": info.currsize,
+            "parse_hits": info.hits,
+            "parse_misses": info.misses,
+            "ids": len(self.ids),
+            "renames": self.renames,
+        }
+
+repo_identities = RepoIdentityCache()
+
+class SingleFlight:
+    """Aynı anda yapılan özdeş isteklerin tek bir uçuşu paylaşmasını sağlar"""
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[str, int] = {}
+        self.leaders = 0
+        self.shared = 0
+        self.abandoned = 0
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]]) -> str:
+        """Metot, URL, parametre ve başlıklardan anahtar üret"""
+        key = f"{method} {ResponseCache.make_key(url, params)}"
+        if headers:
+            key += " " + urlencode(sorted(headers.items()))
+        return key
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Anahtar için uçuşta istek varsa sonucunu bekle, yoksa başlat"""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+            self.leaders += 1
+        else:
+            self.shared += 1
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # Bekleyenlerden birinin iptali paylaşılan isteği iptal etmez
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Son bekleyen de vazgeçtiyse (örn. önden istenen sayfa) istek boşuna sürmez
+            if self._waiters[key] == 1 and not task.done():
+                task.cancel()
+                self.abandoned += 1
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        """Tamamlanan isteği kayıttan çıkar"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Tüm bekleyenler iptal edildiyse hata sahipsiz kalmasın
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Birleştirme sayaçlarını döndür"""
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "shared": self.shared,
+            "abandoned": self.abandoned,
+        }
+
+single_flight = SingleFlight()
+
+class LatencyHistogram:
+    """Logaritmik kovalı gecikme histogramı (1 ms - ~2 dk)"""
+    
+    BOUNDS = tuple(0.001 * 1.5 ** i for i in range(30))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Bir ölçüm ekle"""
+        index = 0
+        while index < len(self.BOUNDS) and seconds > self.BOUNDS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Kova üst sınırlarından yüzdelik tahmini"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                bound = self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+@dataclass
+class OperationStats:
+    """Tool veya uç nokta başına sayaçlar"""
+    count: int = 0
+    errors: int = 0
+    bytes_received: int = 0
+    bytes_sent: int = 0
+    latency: LatencyHistogram = None
+
+    def __post_init__(self):
+        self.latency = self.latency or LatencyHistogram()
+
+class Metrics:
+    """Tool, uç nokta ve aşama bazında sayaç ve gecikme ölçümleri"""
+    
+    # /repos/{owner}/{repo}/pulls/{n} gibi şablonlara indirgemek için
+    _REPO_PATH = re.compile(r"^/repos/[^/]+/[^/]+")
+    _NUMBER_SEGMENT = re.compile(r"/\d+(?=/|$)")
+    _SHA_SEGMENT = re.compile(r"/[0-9a-f]{40}(?=/|$)")
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self) -> None:
+        """Tüm ölçümleri sıfırla"""
+        self.tools: Dict[str, OperationStats] = {}
+        self.endpoints: Dict[str, OperationStats] = {}
+        self.phases: Dict[str, LatencyHistogram] = {}
+        # Birincil yol başarısız olup yedeğe düşülen çağrılar (örn. GraphQL -> REST)
+        self.fallbacks: Dict[str, int] = {"graphql": 0}
+        self.started_at = time.time()
+
+    @classmethod
+    def endpoint_key(cls, method: str, url: str) -> str:
+        """URL'yi düşük kardinaliteli uç nokta şablonuna çevir"""
+        path = cls._REPO_PATH.sub("/repos/{owner}/{repo}", api_path(url))
+        path = cls._SHA_SEGMENT.sub("/{sha}", path)
+        path = cls._NUMBER_SEGMENT.sub("/{n}", path)
+        return f"{method} {path}"
+
+    def observe_tool(self, name: str, seconds: float, error: bool) -> None:
+        """Tool çağrısını kaydet"""
+        stats = self.tools.get(name) or self.tools.setdefault(name, OperationStats())
+        stats.count += 1
+        stats.errors += error
+        stats.latency.observe(seconds)
+
+    def observe_request(
+        self, method: str, url: str, seconds: float,
+        response: Optional[httpx.Response] = None, sent: int = 0
+    ) -> None:
+        """HTTP gidiş-dönüşünü kaydet; response yoksa ağ hatasıdır"""
+        key = self.endpoint_key(method, url)
+        stats = self.endpoints.get(key) or self.endpoints.setdefault(key, OperationStats())
+        stats.count += 1
+        stats.bytes_sent += sent
+        stats.latency.observe(seconds)
+        if response is None or response.status_code >= 400:
+            stats.errors += 1
+        if response is not None:
+            stats.bytes_received += len(response.content)
+
+    def observe_fallback(self, name: str) -> None:
+        """Yedek yola düşülen çağrıyı say"""
+        self.fallbacks[name] = self.fallbacks.get(name, 0) + 1
+
+    def observe_phase(self, phase: str, seconds: float) -> None:
+        """İstek yolundaki bir aşamanın (decode, format) süresini kaydet"""
+        histogram = self.phases.get(phase) or self.phases.setdefault(phase, LatencyHistogram())
+        histogram.observe(seconds)
+
+    def counters(self) -> Dict[str, Dict[str, int]]:
+        """Diğer katmanların sayaçlarını topla"""
+        counters = {
+            "cache": response_cache.stats(),
+            "retry": retry_policy.stats(),
+            "single_flight": single_flight.stats(),
+            "rate_limit": token_pool.stats(),
+        }
+        if pr_store is not None:
+            counters["store"] = pr_store.stats()
+        if webhook_listener is not None:
+            counters["webhook"] = webhook_listener.stats()
+        if diff_cache is not None:
+            counters["diff_cache"] = diff_cache.stats()
+        counters["jobs"] = jobs.stats()
+        counters["repos"] = repo_identities.stats()
+        counters["fallbacks"] = dict(self.fallbacks)
+        return counters
+
+    def to_prometheus(self) -> str:
+        """Ölçümleri Prometheus metin biçiminde döndür"""
+        lines = []
+        
+        def histogram(metric: str, label: str, value: str, hist: LatencyHistogram) -> None:
+            cumulative = 0
+            for index, bound in enumerate(hist.BOUNDS):
+                cumulative += hist.counts[index]
+                # Çıktıyı küçük tutmak için her üç kovadan biri yazılır
+                if index % 3 == 2:
+                    lines.append(f'{metric}_bucket{{{label}="{value}",le="{bound:.4g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{label}="{value}",le="+Inf"}} {hist.count}')
+            lines.append(f'{metric}_sum{{{label}="{value}"}} {hist.total:.6f}')
+            lines.append(f'{metric}_count{{{label}="{value}"}} {hist.count}')
+        
+        for metric, label, table in (
+            ("github_mcp_tool", "tool", self.tools),
+            ("github_mcp_request", "endpoint", self.endpoints),
+        ):
+            lines.append(f"# TYPE {metric}_calls_total counter")
+            lines.extend(f'{metric}_calls_total{{{label}="{k}"}} {v.count}' for k, v in table.items())
+            lines.append(f"# TYPE {metric}_errors_total counter")
+            lines.extend(f'{metric}_errors_total{{{label}="{k}"}} {v.errors}' for k, v in table.items())
+            lines.append(f"# TYPE {metric}_latency_seconds histogram")
+            for key, stats in table.items():
+                histogram(f"{metric}_latency_seconds", label, key, stats.latency)
+        
+        lines.append("# TYPE github_mcp_bytes_received_total counter")
+        lines.extend(
+            f'github_mcp_bytes_received_total{{endpoint="{k}"}} {v.bytes_received}'
+            for k, v in self.endpoints.items()
+        )
+        lines.append("# TYPE github_mcp_bytes_sent_total counter")
+        lines.extend(
+            f'github_mcp_bytes_sent_total{{endpoint="{k}"}} {v.bytes_sent}'
+            for k, v in self.endpoints.items()
+        )
+        lines.append("# TYPE github_mcp_phase_seconds histogram")
+        for phase, hist in self.phases.items():
+            histogram("github_mcp_phase_seconds", "phase", phase, hist)
+        
+        for group, values in self.counters().items():
+            for name, value in values.items():
+                lines.append(f"github_mcp_{group}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+async def write_metrics_file(path: str, interval: float) -> None:
+    """Prometheus çıktısını düzenli aralıklarla dosyaya yaz"""
+    while True:
+        # Yarım dosya okunmaması için önce geçici dosyaya yazılır
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(metrics.to_prometheus())
+        os.replace(temp_path, path)
+        await asyncio.sleep(interval)
+
+async def start_metrics_server(port: int) -> asyncio.AbstractServer:
+    """Prometheus çıktısını 127.0.0.1 üzerinde HTTP ile sun"""
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # İstek satırı ve başlıklar okunup yok sayılır; her yol metrikleri döndürür
+            await reader.readuntil(b"\r\n\r\n")
+            body = metrics.to_prometheus().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4\r\n"
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    return await asyncio.start_server(handle, "127.0.0.1", port)
+
+async def github_request_page(
+    method: str,
+    endpoint: str,
+    idempotent: Optional[bool] = None,
+    dedupe: Optional[Callable[[], Awaitable[Any]]] = None,
+    projection: Optional[Projection] = None,
+    raw: bool = False,
+    revalidate: bool = False,
+    **kwargs
+) -> Tuple[Any, Optional[str]]:
+    """GitHub API'ye istek gönder, yanıtla birlikte sonraki sayfanın URL'sini döndür
+    
+    Aynı anda yapılan özdeş GET istekleri tek bir istekte birleştirilir.
+    Geçici hatalar retry_policy'ye göre yeniden denenir. İdempotent olmayan istekler
+    yalnızca sunucuya hiç ulaşmadıkları kesinse tekrarlanır; dedupe verilmişse her
+    tekrardan önce çağrılır ve bulduğu mevcut kayıt sonuç olarak döndürülür.
+    projection verilmişse yanıt yalnızca istenen alanları tutan kayıtlara dönüştürülür.
+    raw ise gövde çözülmeden bayt olarak döner (diff/raw medya türleri için).
+    revalidate ise webhook'la güncel tutulan kayıtlar da koşullu istekle doğrulanır.
+    """
+    # Link başlığından gelen sonraki sayfa adresleri tam URL'dir
+    url = endpoint if endpoint.startswith("http") else f"{GITHUB_API_BASE}{endpoint}"
+    
+    if method == "GET":
+        key = single_flight.make_key(method, url, kwargs.get("params"), kwargs.get("headers"))
+        if projection is not None:
+            key += f"#{projection.name}"
+        if revalidate:
+            key += "#revalidate"
+        return await single_flight.do(
+            key, lambda: _fetch_page(method, url, idempotent, dedupe, projection, raw, revalidate, **kwargs)
+        )
+    return await _fetch_page(method, url, idempotent, dedupe, projection, raw, revalidate, **kwargs)
+
+async def _fetch_page(
+    method: str,
+    url: str,
+    idempotent: Optional[bool],
+    dedupe: Optional[Callable[[], Awaitable[Any]]],
+    projection: Optional[Projection] = None,
+    raw: bool = False,
+    revalidate: bool = False,
+    **kwargs
+) -> Tuple[Any, Optional[str]]:
+    """Önbellek, yeniden deneme ve hata dönüşümüyle tek isteği gönder"""
+    # GET isteklerinde önbellekteki doğrulayıcılarla koşullu istek gönder
+    cache_key = None
+    cached = None
+    # Ham gövdeler büyük olabileceğinden bellek önbelleğine alınmaz (bkz. DiffCache)
+    if method == "GET" and response_cache.max_entries > 0 and not raw:
+        cache_key = response_cache.make_key(url, kwargs.get("params"))
+        # Aynı URL farklı medya türleriyle farklı gövde döndürür
+        accept = (kwargs.get("headers") or {}).get("Accept")
+        if accept:
+            cache_key += f"#{accept}"
+        # Önbellekte projeksiyonlu kayıtlar tutulduğundan her projeksiyonun ayrı kaydı olur
+        if projection is not None:
+            cache_key += f"#{projection.name}"
+        cached = response_cache.get(cache_key)
+        if cached is not None and not revalidate and response_cache.is_trusted(cache_key):
+            # Webhook olayı gelene kadar kayıt güncel kabul edilir
+            response_cache.trusted_hits += 1
+            return cached.body, cached.next_url
+        if cached is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **cached.validators()}
+    
+    # Açıkça idempotent işaretlenen POST'lar (GraphQL sorguları) okuma amaçlıdır, yazma kuyruğuna girmez
+    mutating = method not in ("GET", "HEAD") and not (method == "POST" and idempotent)
+    if idempotent is None:
+        idempotent = method in retry_policy.IDEMPOTENT_METHODS
+    generation = response_cache.generation
     
     try:
-        response = await http_client.request(method, url, **kwargs)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = await send_request(method, url, mutating=mutating, **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            
+            if not retry_policy.should_retry(idempotent, response, error):
+                break
+            attempt += 1
+            delay = retry_policy.backoff(attempt - 1, response)
+            if attempt >= retry_policy.max_attempts or time.monotonic() - started + delay > retry_policy.deadline:
+                retry_policy.exhausted += 1
+                break
+            
+            retry_policy.retries += 1
+            await asyncio.sleep(delay)
+            if dedupe is not None and not idempotent:
+                existing = await dedupe()
+                if existing is not None:
+                    retry_policy.duplicates_avoided += 1
+                    return existing, None
+        
+        if error is not None:
+            raise error
+        if attempt and response.status_code < 400:
+            retry_policy.recovered += 1
+        
+        if response.status_code == 304 and cached is not None:
+            response_cache.not_modified += 1
+            return cached.body, cached.next_url
         response.raise_for_status()
-        return response.json()
+        if method != "GET" and response_cache.trusted is not None:
+            # Kendi yazma isteklerimiz webhook'u beklemeden önbelleği geçersiz kılar
+            invalidate_for_mutation(url)
+        if raw:
+            return response.content, None
+        decode_started = time.perf_counter() if metrics.enabled else 0.0
+        data = json_loads(response.content)
+        if projection is not None:
+            # Ham dict'ler burada bırakılır, yalnızca kayıtlar yaşamaya devam eder
+            data = projection.apply(data)
+        if metrics.enabled:
+            metrics.observe_phase("decode", time.perf_counter() - decode_started)
+        if cache_key is not None:
+            response_cache.store(cache_key, response, data, generation)
+        return data, response.links.get("next", {}).get("url")
     except httpx.HTTPStatusError as e:
-        error_data = e.response.json() if e.response.content else {}
-        raise RuntimeError(f"GitHub API hatası: {e.response.status_code} - {error_data.get('message', 'Bilinmeyen hata')}")
+        try:
+            error_data = e.response.json() if e.response.content else {}
+        except ValueError:
+            # 502/504 gibi ağ geçidi hataları HTML gövdeyle gelebilir
+            error_data = {}
+        raise GitHubAPIError(
+            f"GitHub API hatası: {e.response.status_code} - {error_data.get('message', 'Bilinmeyen hata')}",
+            e.response.status_code
+        )
+    except RateLimitError:
+        raise
     except Exception as e:
         raise RuntimeError(f"İstek hatası: {str(e)}")
 
-# Tool tanımlamaları
-@app.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """Mevcut tool'ları listele"""
-    return [
-        types.Tool(
-            name="create_pull_request",
-            description="Yeni bir pull request oluştur",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si (örn: https://github.com/owner/repo)"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "Pull request başlığı"
-                    },
-                    "body": {
-                        "type": "string",
-                        "description": "Pull request açıklaması"
-                    },
-                    "head": {
-                        "type": "string",
-                        "description": "Değişikliklerin bulunduğu branch"
-                    },
-                    "base": {
-                        "type": "string",
-                        "description": "Hedef branch (varsayılan: main)",
-                        "default": "main"
-                    },
-                    "draft": {
-                        "type": "boolean",
-                        "description": "Draft PR olarak oluştur",
-                        "default": False
-                    }
-                },
-                "required": ["repo_url", "title", "body", "head"]
-            }
-        ),
-        types.Tool(
-            name="list_pull_requests",
-            description="Repository'deki pull request'leri listele",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si"
-                    },
-                    "state": {
-                        "type": "string",
-                        "description": "PR durumu: open, closed, all",
-                        "default": "open",
-                        "enum": ["open", "closed", "all"]
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maksimum sonuç sayısı",
-                        "default": 10
-                    }
-                },
-                "required": ["repo_url"]
-            }
-        ),
-        types.Tool(
-            name="get_pull_request",
-            description="Belirli bir pull request'in detaylarını getir",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si"
-                    },
-                    "pr_number": {
-                        "type": "integer",
-                        "description": "Pull request numarası"
-                    }
-                },
-                "required": ["repo_url", "pr_number"]
+async def paginate(
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    prefetch: bool = True,
+    items_key: Optional[str] = None,
+    projection: Optional[Projection] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    start: int = 0
+) -> AsyncIterator[Any]:
+    """Link başlığındaki rel="next" bağlantılarını izleyerek öğeleri sayfa sayfa üret
+    
+    limit'e ulaşıldığında yeni sayfa istenmez. prefetch açıkken bir sonraki sayfa,
+    mevcut sayfanın öğeleri tüketilirken arka planda getirilir. items_key ile
+    birlikte meta verilmişse ilk sayfanın diğer alanları (örn. total_count) ona yazılır.
+    start verilirse o sıradaki öğeden başlanır; önceki sayfalar istenmez.
+    """
+    # Başlangıç sayfasını hesaplayabilmek için start ile sayfa boyutu sabit tutulur
+    per_page = min(limit, PAGE_SIZE) if limit and not start else PAGE_SIZE
+    url: Optional[str] = endpoint
+    page_params: Optional[Dict[str, Any]] = {**(params or {}), "per_page": per_page}
+    skip = start % per_page
+    if start:
+        page_params["page"] = start // per_page + 1
+    pending: Optional[asyncio.Future] = None
+    remaining = limit
+    
+    try:
+        while url is not None:
+            if pending is not None:
+                data, next_url = await pending
+                pending = None
+            else:
+                data, next_url = await github_request_page(
+                    "GET", url, params=page_params, projection=projection
+                )
+            
+            items = data[items_key] if items_key else data
+            if skip:
+                items, skip = items[skip:], 0
+            if meta is not None and items_key and not meta:
+                # Kayıtlarda "items" alanı Mapping.items'ı gölgelediğinden anahtarlar üzerinden okunur
+                meta.update((key, data[key]) for key in data if key != items_key)
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+                if remaining <= 0:
+                    next_url = None
+            
+            # Sonraki sayfanın URL'si sorgu parametrelerini zaten içerir
+            url, page_params = next_url, None
+            if url is not None and prefetch:
+                pending = asyncio.ensure_future(github_request_page("GET", url, projection=projection))
+            
+            for item in items:
+                yield item
+    finally:
+        if pending is not None:
+            if pending.done() and not pending.cancelled():
+                pending.exception()
+            else:
+                pending.cancel()
+
+async def github_graphql(query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """GraphQL sorgusu çalıştır, data alanını döndür"""
+    # Sorgular okuma amaçlı olduğundan POST olsa da yeniden denenebilir
+    result = await github_request(
+        "POST",
+        GITHUB_GRAPHQL_URL,
+        json={"query": query, "variables": variables},
+        idempotent=True
+    )
+    if result.get("errors"):
+        raise RuntimeError(f"GraphQL hatası: {result['errors'][0].get('message', 'Bilinmeyen hata')}")
+    return result["data"]
+
+def use_graphql(tool: str, arguments: dict) -> bool:
+    """Tool bu çağrıda GraphQL ile mi çalışmalı"""
+    backend = arguments.get("backend")
+    if backend:
+        return backend == "graphql"
+    return "all" in GRAPHQL_TOOLS or tool in GRAPHQL_TOOLS
+
+async def fetch_pull_request_rest(owner: str, repo: str, pr_number: int, arguments: dict) -> Dict[str, Any]:
+    """PR detaylarını REST uç noktalarından eşzamanlı olarak topla"""
+    async def collect_files():
+        return [f async for f in paginate(
+            f"/repos/{owner}/{repo}/pulls/{pr_number}/files",
+            limit=SUMMARY_FILE_LIMIT,
+            projection=FILE_SUMMARY
+        )]
+    
+    async def collect_check_runs(pr: Awaitable[Dict[str, Any]]):
+        # Check run'lar head SHA'sıyla sorgulanır; diğer istekler PR yanıtını beklemez
+        head_sha = (await pr)["head"]["sha"]
+        return await github_request("GET", f"/repos/{owner}/{repo}/commits/{head_sha}/check-runs")
+    
+    # Birbirinden bağımsız istekleri aynı anda gönder
+    pr = asyncio.ensure_future(
+        github_request("GET", f"/repos/{owner}/{repo}/pulls/{pr_number}", projection=PULL_DETAIL)
+    )
+    fetches = {
+        "pr": pr,
+        "reviews": github_request(
+            "GET", f"/repos/{owner}/{repo}/pulls/{pr_number}/reviews", projection=REVIEW_SUMMARY
+        )
+    }
+    if arguments.get("include_checks", False):
+        fetches["check_runs"] = collect_check_runs(pr)
+    if arguments.get("include_files", False):
+        fetches["files"] = collect_files()
+    
+    results = await asyncio.gather(*fetches.values())
+    return dict(zip(fetches.keys(), results))
+
+def build_pull_request_query(arguments: dict) -> str:
+    """Yalnızca formatlayıcının yazdırdığı alanları isteyen PR sorgusunu oluştur"""
+    fields = [
+        "title", "body", "state", "url", "createdAt", "updatedAt", "additions", "deletions",
+        "headRefName", "baseRefName", "author { login }",
+        "reviews(last: 100) { nodes { state author { login } } }"
+    ]
+    if arguments.get("include_requested_reviewers", False):
+        fields.append(
+            "reviewRequests(first: 100) { nodes { requestedReviewer "
+            "{ ... on User { login } ... on Team { slug } } } }"
+        )
+    if arguments.get("include_comment_counts", False):
+        fields.append("comments { totalCount }")
+        fields.append("reviewThreads(first: 100) { nodes { comments { totalCount } } }")
+    if arguments.get("include_checks", False):
+        fields.append(
+            "commits(last: 1) { nodes { commit { statusCheckRollup { contexts(first: 100) "
+            "{ nodes { __typename ... on CheckRun { name status conclusion } "
+            "... on StatusContext { context state } } } } } } }"
+        )
+    if arguments.get("include_files", False):
+        fields.append("changedFiles")
+        fields.append(f"files(first: {SUMMARY_FILE_LIMIT}) {{ nodes {{ path additions deletions changeType }} }}")
+    
+    return (
+        "query($owner: String!, $repo: String!, $number: Int!) { "
+        "repository(owner: $owner, name: $repo) { pullRequest(number: $number) { "
+        + " ".join(fields) +
+        " } } }"
+    )
+
+def _graphql_check_run(node: Dict[str, Any]) -> Dict[str, Any]:
+    """statusCheckRollup bağlamını REST check run biçimine çevir"""
+    if node["__typename"] == "CheckRun":
+        return {
+            "name": node["name"],
+            "status": node["status"].lower(),
+            "conclusion": (node["conclusion"] or "").lower() or None
+        }
+    state = node["state"]
+    if state in ("PENDING", "EXPECTED"):
+        return {"name": node["context"], "status": "in_progress", "conclusion": None}
+    return {
+        "name": node["context"],
+        "status": "completed",
+        "conclusion": "success" if state == "SUCCESS" else "failure"
+    }
+
+async def fetch_pull_request_graphql(owner: str, repo: str, pr_number: int, arguments: dict) -> Dict[str, Any]:
+    """PR detaylarını tek GraphQL sorgusuyla al ve REST yanıt biçimine çevir"""
+    data = await github_graphql(
+        build_pull_request_query(arguments),
+        {"owner": owner, "repo": repo, "number": pr_number}
+    )
+    node = (data.get("repository") or {}).get("pullRequest")
+    if node is None:
+        raise GitHubAPIError("GitHub API hatası: 404 - Not Found", 404)
+    
+    def login(actor: Optional[Dict[str, Any]]) -> str:
+        return actor["login"] if actor else "ghost"
+    
+    pr = {
+        "title": node["title"],
+        "body": node["body"],
+        "state": "open" if node["state"] == "OPEN" else "closed",
+        "user": {"login": login(node["author"])},
+        "head": {"ref": node["headRefName"]},
+        "base": {"ref": node["baseRefName"]},
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "additions": node["additions"],
+        "deletions": node["deletions"],
+        "html_url": node["url"]
+    }
+    if "reviewRequests" in node:
+        requested = [r["requestedReviewer"] or {} for r in node["reviewRequests"]["nodes"]]
+        pr["requested_reviewers"] = [r for r in requested if "login" in r]
+        pr["requested_teams"] = [r for r in requested if "slug" in r]
+    if "comments" in node:
+        pr["comments"] = node["comments"]["totalCount"]
+        pr["review_comments"] = sum(t["comments"]["totalCount"] for t in node["reviewThreads"]["nodes"])
+    if "changedFiles" in node:
+        pr["changed_files"] = node["changedFiles"]
+    
+    details = {
+        "pr": pr,
+        "reviews": [
+            {"user": {"login": login(r["author"])}, "state": r["state"]}
+            for r in node["reviews"]["nodes"]
+        ]
+    }
+    if "commits" in node:
+        commits = node["commits"]["nodes"]
+        rollup = commits[0]["commit"]["statusCheckRollup"] if commits else None
+        contexts = rollup["contexts"]["nodes"] if rollup else []
+        details["check_runs"] = {"check_runs": [_graphql_check_run(c) for c in contexts]}
+    if "files" in node:
+        change_types = {"ADDED": "added", "DELETED": "removed", "RENAMED": "renamed"}
+        details["files"] = [
+            {
+                "filename": f["path"],
+                "status": change_types.get(f["changeType"], "modified"),
+                "additions": f["additions"],
+                "deletions": f["deletions"]
             }
-        ),
-        types.Tool(
-            name="add_pr_comment",
-            description="Pull request'e yorum ekle",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si"
-                    },
-                    "pr_number": {
-                        "type": "integer",
-                        "description": "Pull request numarası"
-                    },
-                    "comment": {
-                        "type": "string",
-                        "description": "Eklenecek yorum"
-                    }
-                },
-                "required": ["repo_url", "pr_number", "comment"]
-            }
-        ),
-        types.Tool(
-            name="add_pr_review",
-            description="Pull request'e review ekle",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si"
-                    },
-                    "pr_number": {
-                        "type": "integer",
-                        "description": "Pull request numarası"
-                    },
-                    "body": {
-                        "type": "string",
-                        "description": "Review yorumu"
-                    },
-                    "event": {
-                        "type": "string",
-                        "description": "Review türü: APPROVE, REQUEST_CHANGES, COMMENT",
-                        "enum": ["APPROVE", "REQUEST_CHANGES", "COMMENT"],
-                        "default": "COMMENT"
-                    }
-                },
-                "required": ["repo_url", "pr_number", "body"]
-            }
-        ),
-        types.Tool(
-            name="merge_pull_request",
-            description="Pull request'i merge et",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si"
-                    },
-                    "pr_number": {
-                        "type": "integer",
-                        "description": "Pull request numarası"
-                    },
-                    "merge_method": {
-                        "type": "string",
-                        "description": "Merge yöntemi: merge, squash, rebase",
-                        "enum": ["merge", "squash", "rebase"],
-                        "default": "merge"
-                    },
-                    "commit_title": {
-                        "type": "string",
-                        "description": "Merge commit başlığı (opsiyonel)"
-                    }
-                },
-                "required": ["repo_url", "pr_number"]
-            }
-        ),
-        types.Tool(
-            name="close_pull_request",
-            description="Pull request'i kapat",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si"
-                    },
-                    "pr_number": {
-                        "type": "integer",
-                        "description": "Pull request numarası"
-                    }
-                },
-                "required": ["repo_url", "pr_number"]
-            }
-        ),
-        types.Tool(
-            name="update_pull_request",
-            description="Pull request bilgilerini güncelle",
-            inputSchema={
+            for f in node["files"]["nodes"]
+        ]
+    return details
+
+class PullRequestStore:
+    """PR, review ve dosya verisini SQLite'ta tutan, updated_at ile artımlı senkronlanan depo"""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS pulls (
+                    owner TEXT, repo TEXT, number INTEGER,
+                    state TEXT, created_at TEXT, updated_at TEXT, data TEXT,
+                    PRIMARY KEY (owner, repo, number)
+                );
+                CREATE INDEX IF NOT EXISTS pulls_created
+                    ON pulls (owner, repo, created_at DESC);
+                CREATE TABLE IF NOT EXISTS pull_details (
+                    owner TEXT, repo TEXT, number INTEGER,
+                    updated_at TEXT, data TEXT,
+                    PRIMARY KEY (owner, repo, number)
+                );
+                CREATE TABLE IF NOT EXISTS pull_files (
+                    owner TEXT, repo TEXT, number INTEGER,
+                    updated_at TEXT, data TEXT,
+                    PRIMARY KEY (owner, repo, number)
+                );
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    owner TEXT, repo TEXT,
+                    watermark TEXT, synced_at REAL, complete INTEGER,
+                    PRIMARY KEY (owner, repo)
+                );
+            """)
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self.hits = 0
+        self.syncs = 0
+        self.synced_rows = 0
+
+    @staticmethod
+    def _key(owner: str, repo: str) -> Tuple[str, str]:
+        """Satırlar RepoRef anahtarıyla (küçük harf) tutulur; O/R ve o/r aynı kayıttır"""
+        _, owner, repo = RepoRef(GITHUB_HOST, owner, repo).key
+        return owner, repo
+
+    async def ensure_fresh(self, owner: str, repo: str, max_age: float = PR_STORE_MAX_AGE) -> None:
+        """Son senkron max_age'den eskiyse değişen PR'ları çek"""
+        owner, repo = self._key(owner, repo)
+        lock = self._locks.setdefault((owner, repo), asyncio.Lock())
+        async with lock:
+            row = self.conn.execute(
+                "SELECT watermark, synced_at, complete FROM sync_state WHERE owner = ? AND repo = ?",
+                (owner, repo)
+            ).fetchone()
+            if row and time.time() - row[1] <= max_age:
+                return
+            await self._sync(owner, repo, row[0] if row else None, bool(row and row[2]))
+
+    async def _sync(self, owner: str, repo: str, watermark: Optional[str], complete: bool) -> None:
+        """updated_at'e göre azalan sırada, filigrana ulaşana kadar PR'ları çek"""
+        params = {"state": "all", "sort": "updated", "direction": "desc"}
+        limit = None if watermark else PR_STORE_SYNC_LIMIT
+        started = time.time()
+        new_watermark = watermark
+        fetched = 0
+        rows = []
+        
+        # Liste uç noktasında since yok; sıralı okuma filigranın altına inince durdurulur
+        pages = paginate(
+            f"/repos/{owner}/{repo}/pulls", params, limit=limit, prefetch=False, projection=PULL_SUMMARY
+        )
+        try:
+            async for pr in pages:
+                if watermark and pr["updated_at"] < watermark:
+                    break
+                # Filigrandaki satırlar zaten saklı; aynı saniyede güncellenenler için okumaya devam edilir
+                if watermark and pr["updated_at"] == self._current_updated_at(owner, repo, pr["number"]):
+                    continue
+                fetched += 1
+                new_watermark = max(new_watermark or "", pr["updated_at"])
+                rows.append((
+                    owner, repo, pr["number"], pr["state"], pr["created_at"],
+                    pr["updated_at"], dump_json(pr)
+                ))
+        finally:
+            await pages.aclose()
+        
+        if not watermark:
+            complete = limit is None or fetched < limit
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pulls VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                (owner, repo, new_watermark, started, int(complete))
+            )
+        self.syncs += 1
+        self.synced_rows += len(rows)
+
+    async def list_pulls(
+        self, owner: str, repo: str, state: str, limit: int,
+        max_age: float = PR_STORE_MAX_AGE, sort: str = "created"
+    ) -> Optional[List[Dict[str, Any]]]:
+        """PR listesini depodan, sort alanına göre azalan sırada döndür; depo eksikse None"""
+        owner, repo = self._key(owner, repo)
+        await self.ensure_fresh(owner, repo, max_age)
+        query = "SELECT data FROM pulls WHERE owner = ? AND repo = ?"
+        args: List[Any] = [owner, repo]
+        if state != "all":
+            query += " AND state = ?"
+            args.append(state)
+        order = "updated_at" if sort == "updated" else "created_at"
+        rows = self.conn.execute(query + f" ORDER BY {order} DESC LIMIT ?", (*args, limit)).fetchall()
+        
+        complete = self.conn.execute(
+            "SELECT complete FROM sync_state WHERE owner = ? AND repo = ?", (owner, repo)
+        ).fetchone()[0]
+        # İlk senkron sınırlıysa daha eski PR'lar eksik olabilir
+        if len(rows) < limit and not complete:
+            return None
+        self.hits += 1
+        return [json.loads(row[0]) for row in rows]
+
+    def _current_updated_at(self, owner: str, repo: str, number: int) -> Optional[str]:
+        """PR'ın son senkrondaki updated_at değeri"""
+        owner, repo = self._key(owner, repo)
+        row = self.conn.execute(
+            "SELECT updated_at FROM pulls WHERE owner = ? AND repo = ? AND number = ?",
+            (owner, repo, number)
+        ).fetchone()
+        return row[0] if row else None
+
+    async def _get_versioned(self, table: str, owner: str, repo: str, number: int, max_age: float) -> Optional[Any]:
+        """Kayıt, PR'ın güncel updated_at değeriyle alınmışsa döndür"""
+        owner, repo = self._key(owner, repo)
+        await self.ensure_fresh(owner, repo, max_age)
+        current = self._current_updated_at(owner, repo, number)
+        row = self.conn.execute(
+            f"SELECT updated_at, data FROM {table} WHERE owner = ? AND repo = ? AND number = ?",
+            (owner, repo, number)
+        ).fetchone()
+        if current is None or row is None or row[0] != current:
+            return None
+        self.hits += 1
+        return json.loads(row[1])
+
+    def _save_versioned(self, table: str, owner: str, repo: str, number: int, updated_at: Optional[str], data: Any) -> None:
+        """Kaydı verinin alındığı updated_at ile sakla"""
+        if updated_at is None:
+            return
+        owner, repo = self._key(owner, repo)
+        with self.conn:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?)",
+                (owner, repo, number, updated_at, dump_json(data))
+            )
+
+    async def get_details(self, owner: str, repo: str, number: int, max_age: float = PR_STORE_MAX_AGE) -> Optional[Dict[str, Any]]:
+        """get_pull_request verisini depodan döndür"""
+        return await self._get_versioned("pull_details", owner, repo, number, max_age)
+
+    def save_details(self, owner: str, repo: str, number: int, details: Dict[str, Any]) -> None:
+        """get_pull_request verisini sakla"""
+        updated_at = details["pr"].get("updated_at") or self._current_updated_at(owner, repo, number)
+        self._save_versioned("pull_details", owner, repo, number, updated_at, details)
+
+    async def get_files(self, owner: str, repo: str, number: int, max_age: float = PR_STORE_MAX_AGE) -> Optional[List[Dict[str, Any]]]:
+        """PR'ın tam dosya listesini depodan döndür"""
+        return await self._get_versioned("pull_files", owner, repo, number, max_age)
+
+    def save_files(self, owner: str, repo: str, number: int, files: List[Dict[str, Any]]) -> None:
+        """PR'ın tam dosya listesini sakla"""
+        updated_at = self._current_updated_at(owner, repo, number)
+        self._save_versioned("pull_files", owner, repo, number, updated_at, files)
+
+    def stats(self) -> Dict[str, int]:
+        """Depo sayaçlarını döndür"""
+        return {
+            "pulls": self.conn.execute("SELECT COUNT(*) FROM pulls").fetchone()[0],
+            "repos": self.conn.execute("SELECT COUNT(*) FROM sync_state").fetchone()[0],
+            "hits": self.hits,
+            "syncs": self.syncs,
+            "synced_rows": self.synced_rows,
+        }
+
+    def invalidate(self, owner: str, repo: str, number: int) -> None:
+        """PR'ın saklanan ayrıntılarını sil ve sonraki okumada senkronu zorla"""
+        # Webhook'taki owner/repo yazımı kullanıcının girdiğinden farklı olabilir
+        owner, repo = self._key(owner, repo)
+        where = "WHERE owner = ? AND repo = ?"
+        with self.conn:
+            for table in ("pull_details", "pull_files"):
+                self.conn.execute(f"DELETE FROM {table} {where} AND number = ?", (owner, repo, number))
+            self.conn.execute(f"UPDATE sync_state SET synced_at = 0 {where}", (owner, repo))
+
+pr_store = PullRequestStore(PR_STORE_PATH) if PR_STORE_PATH else None
+
+class DiffCache:
+    """Değişmez SHA'larla anahtarlanan, boyut sınırlı disk önbelleği (diff ve blob içerikleri)
+    
+    Kayıtlar hiçbir zaman yeniden doğrulanmaz. Toplam boyut sınırı aşılınca en uzun
+    süredir okunmayan dosyalar silinir; büyük kayıtlar mmap ile okunur.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DIFF_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.total = sum(size for _, size, _ in self._entries())
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(son kullanım, boyut, yol) listesi"""
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def get(self, key: str) -> Optional[Union[bytes, mmap.mmap]]:
+        """Kaydı döndür; büyük kayıtlar salt okunur mmap olarak verilir"""
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            # Tahliye sırası için son kullanım zamanı güncellenir
+            os.utime(path)
+            self.hits += 1
+            if size >= DIFF_CACHE_MMAP_THRESHOLD:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return f.read()
+
+    def put(self, key: str, data: bytes) -> None:
+        """Kaydı atomik olarak yaz, gerekirse eski kayıtları sil"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        try:
+            self.total -= os.stat(path).st_size
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+        self.total += len(data)
+        if self.total > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Toplam boyut sınırın %90'ına inene kadar en eski kayıtları sil"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+        self.total = total
+
+    def stats(self) -> Dict[str, int]:
+        """Disk önbelleği sayaçlarını döndür"""
+        return {
+            "bytes": self.total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+diff_cache = DiffCache(DIFF_CACHE_DIR) if DIFF_CACHE_DIR else None
+
+async def fetch_raw(endpoint: str, media_type: str, cache_key: str) -> Union[bytes, mmap.mmap]:
+    """İçeriği ham medya türüyle getir; repo ve SHA'ya bağlı cache_key ile disk önbelleğinden sun"""
+    if diff_cache is not None:
+        cached = diff_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    data, _ = await github_request_page("GET", endpoint, headers={"Accept": media_type}, raw=True)
+    if diff_cache is not None:
+        await asyncio.to_thread(diff_cache.put, cache_key, data)
+    return data
+
+def split_diff(diff: Union[bytes, mmap.mmap]) -> Iterator[Tuple[str, int, int]]:
+    """Ham diff'teki dosya bölümlerinin (yol, başlangıç, bitiş) konumlarını üret
+    
+    Bölümler kopyalanmadan konumlarla bulunur; mmap üzerinde de çalışır.
+    """
+    marker = b"\ndiff --git "
+    size = len(diff)
+    if diff[:len(marker) - 1] == marker[1:]:
+        start = 0
+    else:
+        start = diff.find(marker)
+        if start == -1:
+            return
+        start += 1
+    while start < size:
+        end = diff.find(marker, start)
+        end = size if end == -1 else end + 1
+        line_end = diff.find(b"\n", start, end)
+        header = diff[start:line_end if line_end != -1 else end].decode("utf-8", "replace")
+        # "diff --git a/eski b/yeni" başlığından yeni yol alınır
+        path = header.split(" b/", 1)[1] if " b/" in header else header[len("diff --git "):]
+        yield path, start, end
+        start = end
+
+# Webhook ile önbellek geçersiz kılma
+# Dinleyici açıkken bu yollardaki önbellek kayıtları olay gelene kadar doğrulanmadan sunulur
+WEBHOOK_TRUSTED_PATHS = re.compile(
+    r"^/repos/[^/]+/[^/]+/(pulls(/\d+(/(reviews|files|requested_reviewers))?)?|issues/\d+/comments)$",
+    re.IGNORECASE
+)
+_MUTATION_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/(?:pulls|issues)(?:/(\d+))?", re.IGNORECASE)
+
+def invalidate_pull(owner: str, repo: str, number: Optional[int]) -> int:
+    """Repo'nun PR listelerini ve verilen PR'a ait önbellek kayıtlarını sil"""
+    prefix = f"/repos/{owner}/{repo}/".lower()
+    pr_segment = str(number)
+    
+    def match(path: str) -> bool:
+        if not path.startswith(prefix):
+            return False
+        parts = path[len(prefix):].split("/")
+        if parts == ["pulls"]:
+            return True
+        if number is None:
+            return False
+        return (
+            (parts[0] in ("pulls", "issues") and parts[1:2] == [pr_segment]) or
+            parts[:3] == ["commits", "pull", pr_segment]
+        )
+    
+    return response_cache.invalidate(match)
+
+def invalidate_for_mutation(url: str) -> None:
+    """Yazma isteğinin değiştirdiği PR'ın önbellek kayıtlarını sil"""
+    match = _MUTATION_PATH.match(api_path(url))
+    if match:
+        invalidate_pull(match[1], match[2], int(match[3]) if match[3] else None)
+
+class WebhookListener:
+    """GitHub webhook'larını alıp önbelleği ve PR deposunu güncel tutan yerel HTTP dinleyicisi"""
+    
+    EVENTS = ("pull_request", "pull_request_review", "issue_comment")
+
+    def __init__(self, secret: str):
+        self.secret = secret.encode()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.received = 0
+        self.rejected = 0
+        self.ignored = 0
+
+    def verify(self, body: bytes, signature: Optional[str]) -> bool:
+        """X-Hub-Signature-256 başlığını HMAC-SHA256 ile doğrula"""
+        if not signature or not signature.startswith("sha256="):
+            return False
+        expected = hmac.new(self.secret, body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature[len("sha256="):])
+
+    def apply(self, event: str, payload: Dict[str, Any]) -> int:
+        """Olayı önbelleğe ve depoya uygula, silinen önbellek kaydı sayısını döndür"""
+        repository = payload.get("repository") or {}
+        owner = (repository.get("owner") or {}).get("login")
+        repo = repository.get("name")
+        if event == "issue_comment":
+            issue = payload.get("issue") or {}
+            # Düz issue yorumları PR verisini etkilemez
+            number = issue.get("number") if "pull_request" in issue else None
+        else:
+            number = (payload.get("pull_request") or {}).get("number")
+        if not owner or not repo or number is None:
+            self.ignored += 1
+            return 0
+        
+        self.received += 1
+        if pr_store is not None:
+            pr_store.invalidate(owner, repo, number)
+        return invalidate_pull(owner, repo, number)
+
+    def process(self, headers: Dict[str, str], body: bytes) -> str:
+        """Doğrulanmış isteği işle, HTTP durum satırını döndür"""
+        if not self.verify(body, headers.get("x-hub-signature-256")):
+            self.rejected += 1
+            return "401 Unauthorized"
+        event = headers.get("x-github-event", "")
+        if event == "ping":
+            return "200 OK"
+        if event not in self.EVENTS:
+            self.ignored += 1
+            return "202 Accepted"
+        try:
+            # Webhook içerik türü form olarak ayarlanmışsa JSON payload alanındadır
+            if headers.get("content-type", "").startswith("application/x-www-form-urlencoded"):
+                body = parse_qs(body.decode())["payload"][0].encode()
+            payload = json_loads(body)
+        except (ValueError, KeyError):
+            return "400 Bad Request"
+        self.apply(event, payload)
+        return "200 OK"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Tek bir webhook isteğini oku ve yanıtla"""
+        status = "400 Bad Request"
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+            request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", "0"))
+            
+            if not request_line.startswith("POST "):
+                status = "405 Method Not Allowed"
+            elif length > WEBHOOK_MAX_BODY:
+                status = "413 Payload Too Large"
+            else:
+                body = await asyncio.wait_for(reader.readexactly(length), 10)
+                status = self.process(headers, body)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError, ConnectionError):
+            pass
+        finally:
+            try:
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Dinleyiciyi başlat ve önbelleği olay güdümlü moda geçir"""
+        self.server = await asyncio.start_server(self.handle, host, port)
+        response_cache.trusted = WEBHOOK_TRUSTED_PATHS
+        return self.server
+
+    def close(self) -> None:
+        """Dinleyiciyi kapat; önbellek yeniden doğrulamalı moda döner"""
+        response_cache.trusted = None
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+
+    def stats(self) -> Dict[str, int]:
+        """Webhook sayaçlarını döndür"""
+        return {
+            "received": self.received,
+            "rejected": self.rejected,
+            "ignored": self.ignored,
+        }
+
+webhook_listener = WebhookListener(WEBHOOK_SECRET) if WEBHOOK_PORT and WEBHOOK_SECRET else None
+
+def format_check_runs(check_runs: Dict[str, Any]) -> str:
+    """Check run listesini tek satırlık özete çevir"""
+    runs = check_runs.get("check_runs", [])
+    if not runs:
+        return "Check yok"
+    
+    passed, failed, pending = [], [], []
+    for run in runs:
+        if run["status"] != "completed":
+            pending.append(run["name"])
+        elif run["conclusion"] in ("success", "neutral", "skipped"):
+            passed.append(run["name"])
+        else:
+            failed.append(run["name"])
+    
+    summary = f"✅ {len(passed)} başarılı, ❌ {len(failed)} başarısız, ⏳ {len(pending)} devam ediyor"
+    if failed:
+        summary += f" (başarısız: {', '.join(failed)})"
+    return summary
+
+# Arka planda çalışan tool'un job kaydı; report_progress ilerlemeyi buraya yazar
+current_job: ContextVar[Optional["Job"]] = ContextVar("current_job", default=None)
+
+async def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+    """İlerlemeyi arka plan işine yaz ya da istemci progressToken verdiyse bildirim gönder"""
+    job = current_job.get()
+    if job is not None:
+        # İsteğin yanıtı çoktan döndüğünden MCP bildirimi gönderilmez
+        job.report(progress, total, message)
+        return
+    if app is None:
+        return
+    try:
+        context = app.request_context
+    except LookupError:
+        # MCP isteği dışında (örn. doğrudan çağrı) bildirim gönderilmez
+        return
+    token = context.meta.progressToken if context.meta else None
+    if token is not None:
+        await context.session.send_progress_notification(token, progress, total, message)
+
+class OutputBudget:
+    """Tool çıktısını bayt ve dosya sayısıyla sınırlar"""
+
+    def __init__(self, max_bytes: int, max_files: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.used = 0
+        self.files = 0
+
+    def accepts(self, line: str, force: bool = False) -> bool:
+        """Satır bütçeye sığar mı; bütçe değişmez"""
+        return force or not self.used or self.used + len(line.encode()) + 1 <= self.max_bytes
+
+    def fits(self, line: str, force: bool = False) -> bool:
+        """Satır bütçeye sığıyorsa düş; ilk satır ve force ile verilenler her zaman kabul edilir"""
+        if not self.accepts(line, force):
+            return False
+        self.used += len(line.encode()) + 1
+        return True
+
+    def next_file(self, header: Optional[str] = None) -> bool:
+        """Dosya sınırına ulaşılmadıysa ve başlığı sığıyorsa dosyayı başlığıyla birlikte düş
+        
+        İki sınırdan biri dosyayı reddederse bütçe değişmez.
+        """
+        if self.max_files is not None and self.files >= self.max_files:
+            return False
+        if header is not None and not self.fits(header):
+            return False
+        self.files += 1
+        return True
+
+def parse_cursor(cursor: Optional[str]) -> Tuple[int, int]:
+    """"dosya[:satır]" biçimindeki devam imlecini çöz"""
+    if not cursor:
+        return 0, 0
+    file_part, _, line_part = cursor.partition(":")
+    try:
+        file_offset, line_offset = int(file_part), int(line_part or 0)
+    except ValueError:
+        raise ValueError(f"Geçersiz cursor: {cursor}")
+    if file_offset < 0 or line_offset < 0:
+        raise ValueError(f"Geçersiz cursor: {cursor}")
+    return file_offset, line_offset
+
+def chunk_lines(lines: List[str], chunk_bytes: int = OUTPUT_CHUNK_BYTES) -> List[str]:
+    """Satırları, satır sınırlarından bölünmüş ve chunk_bytes'ı aşmayan parçalara ayır"""
+    chunks, current, size = [], [], 0
+    for line in lines:
+        line_size = len(line.encode()) + 1
+        if current and size + line_size > chunk_bytes:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += line_size
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+# Tool kaydı
+# JSON şema tiplerinin Python karşılıkları
+JSON_SCHEMA_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,)
+}
+
+def compile_validator(schema: Dict[str, Any]) -> Callable[[Any, str], Any]:
+    """JSON şemasından bir kez derlenen doğrulayıcı üret; nesnelere varsayılanları uygular"""
+    type_name = schema.get("type")
+    expected = JSON_SCHEMA_TYPES.get(type_name)
+    enum = schema.get("enum")
+    properties = {
+        name: compile_validator(sub) for name, sub in schema.get("properties", {}).items()
+    }
+    defaults = {
+        name: sub["default"] for name, sub in schema.get("properties", {}).items() if "default" in sub
+    }
+    required = tuple(schema.get("required", ()))
+    items = compile_validator(schema["items"]) if "items" in schema else None
+    
+    def validate(value: Any, path: str) -> Any:
+        # bool, int'in alt sınıfı olduğundan yalnızca boolean tipinde kabul edilir
+        if expected is not None and (
+            not isinstance(value, expected) or (isinstance(value, bool) and type_name != "boolean")
+        ):
+            raise ValueError(f"Geçersiz argüman: {path or 'arguments'} {type_name} tipinde olmalı")
+        if enum is not None and value not in enum:
+            raise ValueError(f"Geçersiz argüman: {path} şunlardan biri olmalı: {', '.join(map(str, enum))}")
+        
+        if isinstance(value, dict):
+            missing = [name for name in required if name not in value]
+            if missing:
+                prefix = f"{path}." if path else ""
+                raise ValueError(f"Eksik argüman: {', '.join(prefix + name for name in missing)}")
+            value = {**defaults, **value}
+            for name, check in properties.items():
+                if name in value:
+                    value[name] = check(value[name], f"{path}.{name}" if path else name)
+        elif isinstance(value, list) and items is not None:
+            value = [items(item, f"{path}[{index}]") for index, item in enumerate(value)]
+        return value
+    
+    return validate
+
+@dataclass
+class ToolSpec:
+    """Kayıtlı bir tool'un şeması, handler'ı ve formatlayıcısı"""
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    handler: Callable[[dict], Awaitable[Any]]
+    # Formatlayıcı tek metin ya da ayrı TextContent'lere konacak parçalar döndürür
+    formatter: Callable[[Any, dict], Union[str, List[str]]]
+    validate: Callable[[Any, str], Any]
+    # "async" argümanıyla arka plan işi olarak çalıştırılabilir
+    background: bool = False
+
+TOOLS: Dict[str, ToolSpec] = {}
+
+def tool(
+    name: str,
+    description: str,
+    properties: Dict[str, Any],
+    formatter: Callable[[Any, dict], Union[str, List[str]]],
+    required: Tuple[str, ...] = (),
+    background: bool = False
+):
+    """Handler'ı şeması ve formatlayıcısıyla tool kaydına ekleyen dekoratör"""
+    def decorator(handler: Callable[[dict], Awaitable[Any]]):
+        if background:
+            properties["async"] = ASYNC_PROPERTY
+        schema = {"type": "object", "properties": properties}
+        if required:
+            schema["required"] = list(required)
+        TOOLS[name] = ToolSpec(
+            name=name,
+            description=description,
+            input_schema=schema,
+            handler=handler,
+            formatter=formatter,
+            validate=compile_validator(schema),
+            background=background
+        )
+        return handler
+    return decorator
+
+# Tool şemalarında ortak alanlar
+REPO_URL_PROPERTY = {
+    "type": "string",
+    "description": "GitHub repository URL'si"
+}
+PR_NUMBER_PROPERTY = {
+    "type": "integer",
+    "description": "Pull request numarası"
+}
+MAX_AGE_PROPERTY = {
+    "type": "number",
+    "description": "Yerel depo açıksa kabul edilen en fazla veri yaşı (sn)"
+}
+ASYNC_PROPERTY = {
+    "type": "boolean",
+    "description": "true ise tool arka planda çalışır ve hemen job id döner; sonuç get_job_result ile alınır",
+    "default": False
+}
+JOB_ID_PROPERTY = {
+    "type": "string",
+    "description": "Arka plan işinin (job) kimliği"
+}
+
+# Tool tanımlamaları
+def format_create_pull_request(result: Dict[str, Any], arguments: dict) -> str:
+    """Oluşturulan PR'ı formatla"""
+    return (
+        f"✅ Pull Request #{result['number']} oluşturuldu!\n\n"
+        f"**Başlık:** {result['title']}\n"
+        f"**URL:** {result['html_url']}\n"
+        f"**Durum:** {result['state']}\n"
+        f"**Draft:** {'Evet' if result['draft'] else 'Hayır'}"
+    )
+
+@tool(
+    name="create_pull_request",
+    description="Yeni bir pull request oluştur",
+    properties={
+        "repo_url": {
+            "type": "string",
+            "description": "GitHub repository URL'si (örn: https://github.com/owner/repo)"
+        },
+        "title": {
+            "type": "string",
+            "description": "Pull request başlığı"
+        },
+        "body": {
+            "type": "string",
+            "description": "Pull request açıklaması"
+        },
+        "head": {
+            "type": "string",
+            "description": "Değişikliklerin bulunduğu branch"
+        },
+        "base": {
+            "type": "string",
+            "description": "Hedef branch (varsayılan: main)",
+            "default": "main"
+        },
+        "draft": {
+            "type": "boolean",
+            "description": "Draft PR olarak oluştur",
+            "default": False
+        }
+    },
+    required=("repo_url", "title", "body", "head"),
+    formatter=format_create_pull_request
+)
+async def create_pull_request(arguments: dict) -> Dict[str, Any]:
+    """Yeni PR oluştur"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    
+    data = {
+        "title": arguments["title"],
+        "body": arguments["body"],
+        "head": arguments["head"],
+        "base": arguments["base"],
+        "draft": arguments["draft"]
+    }
+    
+    async def find_existing_pr():
+        # Aynı head/base için açık bir PR varsa önceki deneme ulaşmış demektir
+        head = data["head"] if ":" in data["head"] else f"{owner}:{data['head']}"
+        existing = await github_request(
+            "GET",
+            f"/repos/{owner}/{repo}/pulls",
+            params={"head": head, "base": data["base"], "state": "open"}
+        )
+        return existing[0] if existing else None
+    
+    return await github_request(
+        "POST",
+        f"/repos/{owner}/{repo}/pulls",
+        json=data,
+        dedupe=find_existing_pr
+    )
+
+def format_list_pull_requests(result: Dict[str, Any], arguments: dict) -> str:
+    """PR listesini formatla"""
+    state = arguments["state"]
+    if not result["pulls"]:
+        return f"Repository'de {state} durumunda pull request bulunamadı."
+    
+    pr_list = []
+    for pr in result["pulls"]:
+        pr_list.append(
+            f"#{pr['number']} - {pr['title']}\n"
+            f"   Durum: {pr['state']} | Oluşturan: {pr['user']['login']}\n"
+            f"   URL: {pr['html_url']}"
+        )
+    
+    return (
+        f"📋 {result['owner']}/{result['repo']} repository'sindeki {state} pull request'ler:\n\n" +
+        "\n\n".join(pr_list)
+    )
+
+@tool(
+    name="list_pull_requests",
+    description="Repository'deki pull request'leri listele",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "state": {
+            "type": "string",
+            "description": "PR durumu: open, closed, all",
+            "default": "open",
+            "enum": ["open", "closed", "all"]
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Maksimum sonuç sayısı",
+            "default": 10
+        },
+        "max_age": MAX_AGE_PROPERTY
+    },
+    required=("repo_url",),
+    formatter=format_list_pull_requests,
+    background=True
+)
+async def list_pull_requests(arguments: dict) -> Dict[str, Any]:
+    """Repository'deki PR'ları getir"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    pulls = await fetch_repo_pulls(
+        owner, repo, arguments["state"], arguments["limit"], arguments.get("max_age")
+    )
+    return {"owner": owner, "repo": repo, "pulls": pulls}
+
+async def fetch_repo_pulls(
+    owner: str, repo: str, state: str, limit: int,
+    max_age: Optional[float] = None, sort: str = "created"
+) -> List[Dict[str, Any]]:
+    """Repository'nin PR'larını depodan ya da API'den, sort alanına göre azalan sırada getir"""
+    if pr_store is not None:
+        pulls = await pr_store.list_pulls(
+            owner, repo, state, limit, PR_STORE_MAX_AGE if max_age is None else max_age, sort
+        )
+        if pulls is not None:
+            return pulls
+    
+    params = {
+        "state": state,
+        "sort": sort,
+        "direction": "desc"
+    }
+    return [pr async for pr in paginate(
+        f"/repos/{owner}/{repo}/pulls", params, limit=limit, projection=PULL_SUMMARY
+    )]
+
+def format_multi_pull(full_name: str, pr: Dict[str, Any]) -> str:
+    """Çoklu repo listesindeki tek PR satırı"""
+    labels = ", ".join(label["name"] for label in pr.get("labels") or [])
+    return (
+        f"[{full_name}] #{pr['number']} - {pr['title']}{' (draft)' if pr.get('draft') else ''}\n"
+        f"   Durum: {pr['state']} | Oluşturan: {pr['user']['login']} | "
+        f"Güncelleme: {pr['updated_at']}" + (f" | Etiketler: {labels}" if labels else "") + "\n"
+        f"   URL: {pr['html_url']}"
+    )
+
+def format_list_pull_requests_multi(result: Dict[str, Any], arguments: dict) -> str:
+    """Çoklu repo PR listesini formatla"""
+    lines = [format_multi_pull(full_name, pr) for full_name, pr in result["pulls"]]
+    
+    header = (
+        f"📋 {len(result['repos'])} repository'de {arguments['state']} durumunda "
+        f"{result['total']} pull request bulundu"
+    )
+    if result["total"] > len(result["pulls"]):
+        header += f" (en son güncellenen {len(result['pulls'])} tanesi gösteriliyor)"
+    text = header + ":\n\n" + ("\n\n".join(lines) if lines else "Eşleşen pull request yok.")
+    if result["truncated"]:
+        text += (
+            f"\n\n⚠️ {len(result['truncated'])} repository'de yalnızca en son güncellenen "
+            f"{arguments['per_repo_limit']} PR'a bakıldı; daha eski eşleşmeler sayılmadı "
+            f"(per_repo_limit'i artırın): " + ", ".join(result["truncated"])
+        )
+    if result["incomplete"]:
+        text += "\n\n⚠️ GitHub aramayı zaman aşımı nedeniyle tamamlayamadı, sonuçlar eksik olabilir"
+    if result["failed"]:
+        text += "\n\n⚠️ Alınamayan repository'ler:\n" + "\n".join(
+            f"- {full_name}: {error}" for full_name, error in result["failed"]
+        )
+    return text
+
+def format_search_pull_requests(result: Dict[str, Any], arguments: dict) -> str:
+    """PR arama sonuçlarını formatla"""
+    if not result["items"]:
+        return f"🔎 `{result['query']}` için pull request bulunamadı."
+    
+    lines = []
+    for item in result["items"]:
+        # repository_url: .../repos/{owner}/{repo}
+        full_name = "/".join(item["repository_url"].rsplit("/", 2)[-2:])
+        merged = (item.get("pull_request") or {}).get("merged_at")
+        state = "merged" if merged else item["state"]
+        lines.append(
+            f"[{full_name}] #{item['number']} - {item['title']}{' (draft)' if item.get('draft') else ''}\n"
+            f"   Durum: {state} | Oluşturan: {item['user']['login']} | Güncelleme: {item['updated_at']}\n"
+            f"   URL: {item['html_url']}"
+        )
+    
+    header = f"🔎 `{result['query']}`: {result['total_count']} sonuç"
+    if result["total_count"] > len(result["items"]):
+        header += f" (ilk {len(result['items'])} tanesi gösteriliyor)"
+    if result["incomplete_results"]:
+        header += "\n⚠️ GitHub aramayı zaman aşımı nedeniyle tamamlayamadı, sonuçlar eksik olabilir"
+    return header + ":\n\n" + "\n\n".join(lines)
+
+def search_qualifier(name: str, value: str) -> str:
+    """Boşluk içeren değerleri tırnaklayarak arama niteleyicisi üret"""
+    if any(char.isspace() for char in value):
+        value = f'"{value}"'
+    return f"{name}:{value}"
+
+def build_search_query(arguments: dict) -> str:
+    """Yapılandırılmış argümanlardan /search/issues sorgusu oluştur"""
+    terms = ["is:pr"]
+    if arguments.get("query"):
+        terms.append(arguments["query"])
+    state = arguments["state"]
+    if state != "all":
+        terms.append(f"is:{state}")
+    if "draft" in arguments:
+        terms.append(f"draft:{str(arguments['draft']).lower()}")
+    
+    for argument, qualifier in (
+        ("author", "author"),
+        ("reviewer", "reviewed-by"),
+        ("review_requested", "review-requested"),
+        ("assignee", "assignee"),
+        ("base", "base"),
+    ):
+        if arguments.get(argument):
+            terms.append(search_qualifier(qualifier, arguments[argument]))
+    if arguments.get("review"):
+        terms.append(f"review:{arguments['review']}")
+    for label in arguments.get("labels", []):
+        terms.append(search_qualifier("label", label))
+    
+    after, before = arguments.get("updated_after"), arguments.get("updated_before")
+    if after and before:
+        terms.append(f"updated:{after}..{before}")
+    elif after:
+        terms.append(f"updated:>={after}")
+    elif before:
+        terms.append(f"updated:<={before}")
+    
+    for repo_url in arguments.get("repos", []):
+        owner, repo = parse_repo_url(repo_url)
+        terms.append(f"repo:{owner}/{repo}")
+    if arguments.get("org"):
+        terms.append(search_qualifier("org", arguments["org"]))
+    return " ".join(terms)
+
+# Sorgu anahtarıyla (zaman, sonuç) çiftleri; en eski kayıt önce atılır
+search_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+@tool(
+    name="search_pull_requests",
+    description="GitHub arama API'siyle repository, org ya da tüm GitHub genelinde PR ara (yazar, reviewer, etiket, durum, tarih)",
+    properties={
+        "query": {
+            "type": "string",
+            "description": "Ek serbest metin ya da arama niteleyicileri"
+        },
+        "state": {
+            "type": "string",
+            "description": "PR durumu: open, closed, merged, all",
+            "default": "open",
+            "enum": ["open", "closed", "merged", "all"]
+        },
+        "author": {
+            "type": "string",
+            "description": "PR'ı açan kullanıcı (@me desteklenir)"
+        },
+        "reviewer": {
+            "type": "string",
+            "description": "PR'ı review etmiş kullanıcı"
+        },
+        "review_requested": {
+            "type": "string",
+            "description": "Review'ı beklenen kullanıcı ya da takım (örn: @me, org/takim)"
+        },
+        "assignee": {
+            "type": "string",
+            "description": "Atanan kullanıcı"
+        },
+        "review": {
+            "type": "string",
+            "description": "Review durumu",
+            "enum": ["none", "required", "approved", "changes_requested"]
+        },
+        "labels": {
+            "type": "array",
+            "description": "PR'da bulunması gereken etiketler",
+            "items": {"type": "string"}
+        },
+        "draft": {
+            "type": "boolean",
+            "description": "true: yalnızca draft PR'lar, false: draft olmayanlar"
+        },
+        "base": {
+            "type": "string",
+            "description": "Hedef branch"
+        },
+        "updated_after": {
+            "type": "string",
+            "description": "Bu tarihte ya da sonra güncellenenler (YYYY-MM-DD)"
+        },
+        "updated_before": {
+            "type": "string",
+            "description": "Bu tarihte ya da önce güncellenenler (YYYY-MM-DD)"
+        },
+        "repos": {
+            "type": "array",
+            "description": "Aramanın sınırlanacağı repository'ler",
+            "items": {"type": "string"}
+        },
+        "org": {
+            "type": "string",
+            "description": "Aramanın sınırlanacağı org ya da kullanıcı"
+        },
+        "sort": {
+            "type": "string",
+            "description": "Sıralama alanı",
+            "default": "updated",
+            "enum": ["updated", "created", "comments"]
+        },
+        "order": {
+            "type": "string",
+            "description": "Sıralama yönü",
+            "default": "desc",
+            "enum": ["desc", "asc"]
+        },
+        "limit": {
+            "type": "integer",
+            "description": "En fazla sonuç sayısı (GitHub üst sınırı 1000)",
+            "default": 30
+        },
+        "max_age": {
+            "type": "number",
+            "description": "Önbellekteki sonucun kabul edilen en fazla yaşı (sn)"
+        }
+    },
+    formatter=format_search_pull_requests,
+    background=True
+)
+async def search_pull_requests(arguments: dict) -> Dict[str, Any]:
+    """PR'ları /search/issues üzerinden ara, sonucu kısa süre önbellekte tut"""
+    query = build_search_query(arguments)
+    limit = max(1, min(arguments["limit"], 1000))
+    params = {"q": query, "sort": arguments["sort"], "order": arguments["order"]}
+    
+    cache_key = f"{ResponseCache.make_key('/search/issues', params)}&limit={limit}"
+    max_age = arguments.get("max_age", SEARCH_CACHE_TTL)
+    cached = search_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] <= max_age:
+        return cached[1]
+    
+    meta: Dict[str, Any] = {}
+    items = [item async for item in paginate(
+        "/search/issues", params, limit=limit, items_key="items", projection=SEARCH_RESULT, meta=meta
+    )]
+    result = {
+        "query": query,
+        "items": items,
+        "total_count": meta.get("total_count", len(items)),
+        "incomplete_results": meta.get("incomplete_results", False)
+    }
+    
+    if SEARCH_CACHE_TTL > 0:
+        search_cache[cache_key] = (time.monotonic(), result)
+        search_cache.move_to_end(cache_key)
+        while len(search_cache) > SEARCH_CACHE_MAX_ENTRIES:
+            search_cache.popitem(last=False)
+    return result
+
+def has_glob(pattern: str) -> bool:
+    """Desende glob karakteri (*, ?, [) var mı"""
+    return any(char in pattern for char in "*?[")
+
+async def list_owner_repositories(owner: str, include_archived: bool) -> List[str]:
+    """Org'un (yoksa kullanıcının) repository adlarını getir"""
+    try:
+        repos = [r async for r in paginate(f"/orgs/{owner}/repos", {"type": "all"}, projection=REPO_SUMMARY)]
+    except GitHubAPIError as e:
+        if e.status_code != 404:
+            raise
+        repos = [r async for r in paginate(f"/users/{owner}/repos", {"type": "owner"}, projection=REPO_SUMMARY)]
+    return [r["name"] for r in repos if include_archived or not r.get("archived")]
+
+async def resolve_repositories(arguments: dict) -> List[Tuple[str, str]]:
+    """repos, org ve pattern argümanlarını (owner, repo) listesine genişlet"""
+    include_archived = arguments["include_archived"]
+    targets: List[Tuple[str, str]] = []
+    owner_patterns: Dict[str, List[str]] = {}
+    
+    for entry in arguments.get("repos", []):
+        _, owner, repo = split_repo_url(entry)
+        if not has_glob(repo):
+            targets.append(parse_repo_url(entry))
+        elif REPO_GLOB_PATTERN.match(repo):
+            owner_patterns.setdefault(owner.lower(), []).append(repo)
+        else:
+            raise ValueError(f"Geçersiz repository deseni: {entry}")
+    if arguments.get("org"):
+        owner_patterns.setdefault(arguments["org"].lower(), []).append(arguments.get("pattern") or "*")
+    
+    # Her owner'ın repo listesi bir kez çekilir
+    owners = list(owner_patterns)
+    listings = await asyncio.gather(*(list_owner_repositories(o, include_archived) for o in owners))
+    for owner, names in zip(owners, listings):
+        patterns = [p.lower() for p in owner_patterns[owner]]
+        targets.extend(
+            (owner, name) for name in names
+            if any(fnmatch.fnmatchcase(name.lower(), p) for p in patterns)
+        )
+    
+    # Sırayı koruyarak tekrarları at (GitHub adları büyük/küçük harf duyarsızdır)
+    unique = {}
+    for owner, repo in targets:
+        unique.setdefault((owner.lower(), repo.lower()), (owner, repo))
+    return list(unique.values())
+
+def review_state_matches(reviews: List[Dict[str, Any]], review_state: str) -> bool:
+    """Reviewer'ların son kararlarına göre PR approved ya da changes_requested mı"""
+    latest = {}
+    for review in reviews:
+        # Yorum review'ları önceki kararı değiştirmez
+        if review["state"] in ("APPROVED", "CHANGES_REQUESTED", "DISMISSED"):
+            latest[(review.get("user") or {}).get("login")] = review["state"]
+    states = set(latest.values())
+    if review_state == "changes_requested":
+        return "CHANGES_REQUESTED" in states
+    return "APPROVED" in states and "CHANGES_REQUESTED" not in states
+
+def multi_search_queries(arguments: dict, repositories: List[Tuple[str, str]]) -> Optional[List[str]]:
+    """Filtreler arama niteleyicisiyle ifade edilebiliyorsa repo listesini bölen arama sorguları
+
+    author, labels, draft ve approved/changes_requested sunucu tarafında süzülür; böylece repo
+    başına en son per_repo_limit PR'ın dışında kalan eşleşmeler de bulunur. Bekleyen reviewer
+    filtreleri (review_requested/no_reviewers) aramada yoktur, None döner.
+    """
+    review_state = arguments.get("review_state")
+    if review_state in ("review_requested", "no_reviewers"):
+        return None
+    filters = {key: arguments[key] for key in ("author", "labels", "draft") if key in arguments}
+    if not filters and not review_state:
+        return None
+    filters["state"] = arguments["state"]
+    if review_state:
+        filters["review"] = review_state
+    
+    queries, chunk = [], []
+    for owner, repo in repositories:
+        candidate = chunk + [f"{owner}/{repo}"]
+        if chunk and len(build_search_query(dict(filters, repos=candidate))) > SEARCH_QUERY_MAX_LENGTH:
+            queries.append(build_search_query(dict(filters, repos=chunk)))
+            candidate = [f"{owner}/{repo}"]
+        chunk = candidate
+    queries.append(build_search_query(dict(filters, repos=chunk)))
+    return queries
+
+def pull_matches(pr: Dict[str, Any], arguments: dict) -> bool:
+    """PR listesinden ek istek gerektirmeyen filtreleri uygula"""
+    author = arguments.get("author")
+    if author and (pr.get("user") or {}).get("login", "").lower() != author.lower():
+        return False
+    wanted_labels = {label.lower() for label in arguments.get("labels", [])}
+    if wanted_labels - {label["name"].lower() for label in pr.get("labels") or []}:
+        return False
+    if "draft" in arguments and bool(pr.get("draft")) != arguments["draft"]:
+        return False
+    review_state = arguments.get("review_state")
+    has_requests = bool(pr.get("requested_reviewers") or pr.get("requested_teams"))
+    if review_state == "review_requested" and not has_requests:
+        return False
+    if review_state == "no_reviewers" and has_requests:
+        return False
+    return True
+
+@tool(
+    name="list_pull_requests_multi",
+    description="Birden fazla repository'nin (liste, org ya da glob) PR'larını eşzamanlı getirip güncellenme zamanına göre sırala",
+    properties={
+        "repos": {
+            "type": "array",
+            "description": "Repository'ler; owner/repo, URL ya da glob (örn: myorg/api-*)",
+            "items": {"type": "string"}
+        },
+        "org": {
+            "type": "string",
+            "description": "Tüm repository'leri taranacak org ya da kullanıcı"
+        },
+        "pattern": {
+            "type": "string",
+            "description": "org repository adları için glob filtresi (örn: service-*)"
+        },
+        "state": {
+            "type": "string",
+            "description": "PR durumu: open, closed, all",
+            "default": "open",
+            "enum": ["open", "closed", "all"]
+        },
+        "author": {
+            "type": "string",
+            "description": "Yalnızca bu kullanıcının açtığı PR'lar"
+        },
+        "labels": {
+            "type": "array",
+            "description": "PR'da bulunması gereken etiketler",
+            "items": {"type": "string"}
+        },
+        "draft": {
+            "type": "boolean",
+            "description": "true: yalnızca draft PR'lar, false: draft olmayanlar"
+        },
+        "review_state": {
+            "type": "string",
+            "description": "Review durumu filtresi (approved/changes_requested repo başına ek istek gerektirir)",
+            "enum": ["review_requested", "no_reviewers", "approved", "changes_requested"]
+        },
+        "per_repo_limit": {
+            "type": "integer",
+            "description": "Repository başına en son güncellenen kaç PR'a bakılacağı (arama ile süzülebilen filtrelerde kullanılmaz)",
+            "default": 30
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Toplam en fazla sonuç sayısı",
+            "default": 50
+        },
+        "max_concurrency": {
+            "type": "integer",
+            "description": "Aynı anda sorgulanacak en fazla repository sayısı",
+            "default": MULTI_REPO_CONCURRENCY
+        },
+        "repo_timeout": {
+            "type": "number",
+            "description": "Repository başına zaman aşımı (sn); aşan repo atlanır",
+            "default": 20
+        },
+        "include_archived": {
+            "type": "boolean",
+            "description": "org/glob genişletmesinde arşivlenmiş repository'leri de al",
+            "default": False
+        },
+        "max_age": MAX_AGE_PROPERTY
+    },
+    formatter=format_list_pull_requests_multi,
+    background=True
+)
+async def list_pull_requests_multi(arguments: dict) -> Dict[str, Any]:
+    """Repository'leri sınırlı eşzamanlılıkla sorgula, her biten repo'nun satırlarını ilerleme olarak gönder
+
+    Filtreler aramayla ifade edilebiliyorsa repo'lar /search/issues sorgularıyla taranır.
+    """
+    if not arguments.get("repos") and not arguments.get("org"):
+        raise ValueError("repos ya da org argümanlarından biri gerekli")
+    repositories = await resolve_repositories(arguments)
+    if not repositories:
+        raise ValueError("Eşleşen repository bulunamadı")
+    
+    semaphore = asyncio.Semaphore(max(1, arguments["max_concurrency"]))
+    queries = multi_search_queries(arguments, repositories)
+    review_state = arguments.get("review_state")
+    needs_reviews = review_state in ("approved", "changes_requested")
+    truncated: List[str] = []
+    incomplete = False
+    
+    async def search(query: str) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+        nonlocal incomplete
+        async with semaphore:
+            meta: Dict[str, Any] = {}
+            params = {"q": query, "sort": "updated", "order": "desc"}
+            items = [item async for item in paginate(
+                "/search/issues", params, limit=arguments["limit"], items_key="items",
+                projection=SEARCH_RESULT, meta=meta
+            )]
+        incomplete = incomplete or meta.get("incomplete_results", False)
+        # total_count sayfalanmayan eşleşmeleri de içerir
+        extra = max(meta.get("total_count", len(items)) - len(items), 0)
+        return [("/".join(item["repository_url"].rsplit("/", 2)[-2:]), item) for item in items], extra
+    
+    async def fetch(owner: str, repo: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            pulls = await fetch_repo_pulls(
+                owner, repo, arguments["state"], arguments["per_repo_limit"],
+                arguments.get("max_age"), sort="updated"
+            )
+            if len(pulls) >= arguments["per_repo_limit"]:
+                truncated.append(f"{owner}/{repo}")
+            pulls = [pr for pr in pulls if pull_matches(pr, arguments)]
+            if not needs_reviews:
+                return pulls
+            # Review durumu yalnızca diğer filtrelerden geçen PR'lar için sorgulanır
+            reviews = await asyncio.gather(*(
+                github_request(
+                    "GET", f"/repos/{owner}/{repo}/pulls/{pr['number']}/reviews", projection=REVIEW_SUMMARY
+                )
+                for pr in pulls
+            ))
+            return [pr for pr, pr_reviews in zip(pulls, reviews) if review_state_matches(pr_reviews, review_state)]
+    
+    async def with_timeout(label: str, work: Awaitable[Any]):
+        try:
+            return label, await asyncio.wait_for(work, arguments["repo_timeout"]), None
+        except asyncio.TimeoutError:
+            return label, None, f"{arguments['repo_timeout']} sn içinde yanıt alınamadı"
+        except Exception as e:
+            return label, None, str(e)
+    
+    if queries is not None:
+        tasks = [asyncio.ensure_future(with_timeout(query, search(query))) for query in queries]
+    else:
+        tasks = [
+            asyncio.ensure_future(with_timeout(f"{owner}/{repo}", fetch(owner, repo)))
+            for owner, repo in repositories
+        ]
+    
+    collected: List[Tuple[str, Dict[str, Any]]] = []
+    failed: List[Tuple[str, str]] = []
+    unlisted = 0
+    try:
+        for done, future in enumerate(asyncio.as_completed(tasks), start=1):
+            label, found, error = await future
+            if error is not None:
+                failed.append((label, error))
+                await report_progress(done, len(tasks), f"{label}: ❌ {error}")
+                continue
+            if queries is not None:
+                found, extra = found
+                unlisted += extra
+            else:
+                found = [(label, pr) for pr in found]
+            collected.extend(found)
+            # Yavaş repository'ler beklenirken tamamlananların satırları istemciye gönderilir
+            rows = [format_multi_pull(full_name, pr) for full_name, pr in found[:arguments["limit"]]]
+            await report_progress(done, len(tasks), "\n".join([f"{label}: {len(found)} PR"] + rows))
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    collected.sort(key=lambda item: item[1]["updated_at"], reverse=True)
+    return {
+        "repos": repositories,
+        "pulls": collected[:arguments["limit"]],
+        "total": len(collected) + unlisted,
+        "truncated": sorted(truncated) if queries is None else [],
+        "incomplete": incomplete,
+        "failed": sorted(failed)
+    }
+
+def format_get_pull_request(details_data: Dict[str, Any], arguments: dict) -> str:
+    """PR detaylarını formatla"""
+    result = details_data["pr"]
+    
+    review_summary = []
+    for review in details_data["reviews"]:
+        review_summary.append(f"- {review['user']['login']}: {review['state']}")
+    
+    details = []
+    # İstenen reviewer'lar ve yorum sayıları PR yanıtında zaten mevcut
+    if arguments["include_requested_reviewers"]:
+        requested = [u['login'] for u in result.get('requested_reviewers', [])]
+        requested += [f"@{t['slug']}" for t in result.get('requested_teams', [])]
+        details.append(f"**Bekleyen Reviewer'lar:** {', '.join(requested) if requested else 'Yok'}\n")
+    if arguments["include_comment_counts"]:
+        details.append(
+            f"**Yorumlar:** {result.get('comments', 0)} genel / "
+            f"{result.get('review_comments', 0)} kod yorumu\n"
+        )
+    if "check_runs" in details_data:
+        details.append(f"**Check'ler:** {format_check_runs(details_data['check_runs'])}\n")
+    if "files" in details_data:
+        files = details_data["files"]
+        total_files = result.get("changed_files", len(files))
+        file_lines = [
+            f"{FILE_STATUS_EMOJI.get(f['status'], '❓')} {f['filename']} (+{f['additions']}/-{f['deletions']})"
+            for f in files
+        ]
+        if total_files > len(files):
+            file_lines.append(f"... ve {total_files - len(files)} dosya daha")
+        details.append(f"**Dosyalar ({total_files}):**\n" + "\n".join(file_lines) + "\n")
+    
+    return (
+        f"🔍 Pull Request #{arguments['pr_number']} Detayları:\n\n"
+        f"**Başlık:** {result['title']}\n"
+        f"**Açıklama:** {result['body'] or 'Açıklama yok'}\n"
+        f"**Durum:** {result['state']}\n"
+        f"**Oluşturan:** {result['user']['login']}\n"
+        f"**Branch:** {result['head']['ref']} → {result['base']['ref']}\n"
+        f"**Oluşturulma:** {result['created_at']}\n"
+        f"**Değişiklik:** +{result['additions']} / -{result['deletions']}\n"
+        f"**Review'lar:**\n" + ("\n".join(review_summary) if review_summary else "Henüz review yok") + "\n" +
+        "".join(details) +
+        f"**URL:** {result['html_url']}"
+    )
+
+@tool(
+    name="get_pull_request",
+    description="Belirli bir pull request'in detaylarını getir",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY,
+        "include_checks": {
+            "type": "boolean",
+            "description": "Check run sonuçlarını da getir",
+            "default": False
+        },
+        "include_requested_reviewers": {
+            "type": "boolean",
+            "description": "Bekleyen reviewer isteklerini göster",
+            "default": False
+        },
+        "include_comment_counts": {
+            "type": "boolean",
+            "description": "Yorum sayılarını göster",
+            "default": False
+        },
+        "include_files": {
+            "type": "boolean",
+            "description": "Değişen dosyaları da listele",
+            "default": False
+        },
+        "backend": {
+            "type": "string",
+            "description": "Veri kaynağı: rest veya graphql (varsayılan: sunucu ayarı)",
+            "enum": ["rest", "graphql"]
+        },
+        "max_age": MAX_AGE_PROPERTY
+    },
+    required=("repo_url", "pr_number"),
+    formatter=format_get_pull_request
+)
+async def get_pull_request(arguments: dict) -> Dict[str, Any]:
+    """PR detaylarını depo, GraphQL veya REST üzerinden getir"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    pr_number = arguments["pr_number"]
+    
+    details_data = None
+    # Check sonuçları PR'ın updated_at değerini değiştirmediğinden depodan verilmez
+    use_store = pr_store is not None and not arguments["include_checks"]
+    if use_store:
+        stored = await pr_store.get_details(
+            owner, repo, pr_number, arguments.get("max_age", PR_STORE_MAX_AGE)
+        )
+        # Depodaki kayıt istenen tüm bölümleri içermeli
+        wanted = {"files"} if arguments["include_files"] else set()
+        if stored is not None and wanted <= stored.keys():
+            details_data = stored
+    if details_data is None and use_graphql("get_pull_request", arguments):
+        try:
+            details_data = await fetch_pull_request_graphql(owner, repo, pr_number, arguments)
+        except Exception:
+            # GraphQL başarısızsa REST yolu yedek olarak kullanılır
+            metrics.observe_fallback("graphql")
+    if details_data is None:
+        details_data = await fetch_pull_request_rest(owner, repo, pr_number, arguments)
+    if use_store:
+        pr_store.save_details(owner, repo, pr_number, details_data)
+    return details_data
+
+def format_add_pr_comment(result: Dict[str, Any], arguments: dict) -> str:
+    """Eklenen yorumu formatla"""
+    return (
+        f"💬 Yorum eklendi!\n\n"
+        f"**PR #:** {arguments['pr_number']}\n"
+        f"**Yorum:** {result['body']}\n"
+        f"**URL:** {result['html_url']}"
+    )
+
+@tool(
+    name="add_pr_comment",
+    description="Pull request'e yorum ekle",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY,
+        "comment": {
+            "type": "string",
+            "description": "Eklenecek yorum"
+        }
+    },
+    required=("repo_url", "pr_number", "comment"),
+    formatter=format_add_pr_comment
+)
+async def add_pr_comment(arguments: dict) -> Dict[str, Any]:
+    """PR'a yorum ekle"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    pr_number = arguments["pr_number"]
+    
+    data = {
+        "body": arguments["comment"]
+    }
+    
+    # Saat farkı payıyla, bu çağrıdan sonra eklenen yorumlar aranır
+    since = (datetime.now(timezone.utc) - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    
+    async def find_existing_comment():
+        comments, logins = await asyncio.gather(
+            github_request(
+                "GET",
+                f"/repos/{owner}/{repo}/issues/{pr_number}/comments",
+                params={"since": since}
+            ),
+            token_pool.logins()
+        )
+        # Yalnızca bizim token'larımızdan birinin yazdığı aynı gövdeli yorum bizimkidir
+        return next(
+            (c for c in comments if c["body"] == data["body"] and (c.get("user") or {}).get("login") in logins),
+            None
+        )
+    
+    return await github_request(
+        "POST",
+        f"/repos/{owner}/{repo}/issues/{pr_number}/comments",
+        json=data,
+        dedupe=find_existing_comment
+    )
+
+def format_add_pr_review(result: Dict[str, Any], arguments: dict) -> str:
+    """Eklenen review'ı formatla"""
+    event_map = {
+        "APPROVE": "✅ Onaylandı",
+        "REQUEST_CHANGES": "❌ Değişiklik İstendi",
+        "COMMENT": "💭 Yorum"
+    }
+    
+    return (
+        f"📝 Review eklendi!\n\n"
+        f"**PR #:** {arguments['pr_number']}\n"
+        f"**Durum:** {event_map.get(arguments['event'], arguments['event'])}\n"
+        f"**Yorum:** {result['body']}\n"
+        f"**URL:** {result['html_url']}"
+    )
+
+@tool(
+    name="add_pr_review",
+    description="Pull request'e review ekle",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY,
+        "body": {
+            "type": "string",
+            "description": "Review yorumu"
+        },
+        "event": {
+            "type": "string",
+            "description": "Review türü: APPROVE, REQUEST_CHANGES, COMMENT",
+            "enum": ["APPROVE", "REQUEST_CHANGES", "COMMENT"],
+            "default": "COMMENT"
+        }
+    },
+    required=("repo_url", "pr_number", "body"),
+    formatter=format_add_pr_review
+)
+async def add_pr_review(arguments: dict) -> Dict[str, Any]:
+    """PR'a review ekle"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    
+    data = {
+        "body": arguments["body"],
+        "event": arguments["event"]
+    }
+    
+    return await github_request(
+        "POST",
+        f"/repos/{owner}/{repo}/pulls/{arguments['pr_number']}/reviews",
+        json=data
+    )
+
+def format_merge_pull_request(result: Dict[str, Any], arguments: dict) -> str:
+    """Merge sonucunu formatla"""
+    return (
+        f"🎉 Pull Request #{arguments['pr_number']} başarıyla merge edildi!\n\n"
+        f"**SHA:** {result['sha']}\n"
+        f"**Mesaj:** {result['message']}"
+    )
+
+@tool(
+    name="merge_pull_request",
+    description="Pull request'i merge et",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY,
+        "merge_method": {
+            "type": "string",
+            "description": "Merge yöntemi: merge, squash, rebase",
+            "enum": ["merge", "squash", "rebase"],
+            "default": "merge"
+        },
+        "commit_title": {
+            "type": "string",
+            "description": "Merge commit başlığı (opsiyonel)"
+        }
+    },
+    required=("repo_url", "pr_number"),
+    formatter=format_merge_pull_request
+)
+async def merge_pull_request(arguments: dict) -> Dict[str, Any]:
+    """PR'ı merge et"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    
+    data = {
+        "merge_method": arguments["merge_method"]
+    }
+    
+    if "commit_title" in arguments:
+        data["commit_title"] = arguments["commit_title"]
+    
+    return await github_request(
+        "PUT",
+        f"/repos/{owner}/{repo}/pulls/{arguments['pr_number']}/merge",
+        json=data
+    )
+
+@dataclass
+class MergeQueueEntry:
+    """merge_queue'daki tek PR'ın durumu"""
+    owner: str
+    repo: str
+    pr_number: int
+    status: str = "pending"
+    note: Optional[str] = None
+    sha: Optional[str] = None
+    polls: int = 0
+    attempts: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Formatlayıcı için sözlüğe çevir"""
+        return {
+            "repo": f"{self.owner}/{self.repo}",
+            "pr_number": self.pr_number,
+            "status": self.status,
+            "note": self.note,
+            "sha": self.sha,
+            "polls": self.polls,
+            "attempts": self.attempts,
+        }
+
+async def wait_until_mergeable(entry: MergeQueueEntry, deadline: float, update_branch: bool) -> Optional[Dict[str, Any]]:
+    """mergeable hesaplanıp PR merge edilebilir olana kadar yokla; olamayacaksa entry'yi işaretleyip None döndür
+    
+    Yoklamalar ETag'li koşullu isteklerdir; değişmeyen yanıt (304) hız sınırından düşmez.
+    Durum değişmedikçe bekleme süresi katlanır, değişince başa döner.
+    """
+    endpoint = f"/repos/{entry.owner}/{entry.repo}/pulls/{entry.pr_number}"
+    delay = MERGE_POLL_INTERVAL
+    last_seen = None
+    branch_updated = False
+    while True:
+        # Webhook'la güncel tutulan kayıtlar mergeable hesaplamasını yansıtmaz, yine de doğrulanır
+        pr = await github_request("GET", endpoint, projection=MERGE_STATE, revalidate=True)
+        entry.polls += 1
+        if pr.get("merged"):
+            entry.status, entry.note = "merged", "zaten merge edilmiş"
+            return None
+        if pr["state"] != "open":
+            entry.status, entry.note = "skipped", "PR kapalı"
+            return None
+        if pr.get("draft"):
+            entry.status, entry.note = "skipped", "draft PR"
+            return None
+    
+        mergeable, state = pr.get("mergeable"), pr.get("mergeable_state")
+        if mergeable is False or state == "dirty":
+            entry.status, entry.note = "failed", "çakışma var (dirty)"
+            return None
+        if mergeable and state in ("clean", "unstable", "has_hooks"):
+            return pr
+        if mergeable and state == "behind" and update_branch and not branch_updated:
+            # Base'e göre geride kalan branch bir kez güncellenir, sonra yoklamaya devam edilir
+            await github_request(
+                "PUT", f"{endpoint}/update-branch", json={"expected_head_sha": pr["head"]["sha"]}
+            )
+            branch_updated = True
+            last_seen = None
+            delay = MERGE_POLL_INTERVAL
+            continue
+    
+        # mergeable henüz hesaplanmadı (None/unknown) ya da check'ler/review bekleniyor (blocked/behind)
+        seen = (mergeable, state, pr["head"]["sha"])
+        delay = MERGE_POLL_INTERVAL if seen != last_seen else min(delay * 2, MERGE_POLL_MAX_INTERVAL)
+        last_seen = seen
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            entry.status, entry.note = "failed", f"zaman aşımı (mergeable_state: {state or 'hesaplanıyor'})"
+            return None
+        await asyncio.sleep(min(delay, remaining))
+
+async def merge_queue_entry(entry: MergeQueueEntry, arguments: dict) -> None:
+    """PR merge edilebilir olunca merge et; 405/409 yarışlarında yeniden yoklayıp tekrar dene"""
+    deadline = time.monotonic() + arguments["pr_timeout"]
+    while True:
+        pr = await wait_until_mergeable(entry, deadline, arguments["update_branch"])
+        if pr is None:
+            return
+        entry.attempts += 1
+        # sha verilince yoklanandan farklı bir head merge edilmez (409)
+        data = {"merge_method": arguments["merge_method"], "sha": pr["head"]["sha"]}
+        try:
+            result = await github_request(
+                "PUT", f"/repos/{entry.owner}/{entry.repo}/pulls/{entry.pr_number}/merge", json=data
+            )
+        except GitHubAPIError as e:
+            # 405: base az önce değişti ya da mergeable yeniden hesaplanıyor, 409: head değişti
+            if e.status_code in (405, 409) and entry.attempts < arguments["max_attempts"]:
+                # GitHub'ın mergeable'ı yeniden hesaplaması beklenir; her denemede bekleme katlanır
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    delay = min(MERGE_POLL_INTERVAL * 2 ** (entry.attempts - 1), MERGE_POLL_MAX_INTERVAL)
+                    await asyncio.sleep(min(delay, remaining))
+                    continue
+            entry.status, entry.note = "failed", str(e)
+            return
+        entry.status, entry.sha = "merged", result.get("sha")
+        return
+
+def format_merge_queue(result: Dict[str, Any], arguments: dict) -> str:
+    """Kuyruk sonucunu formatla"""
+    status_emoji = {"merged": "🎉", "failed": "❌", "skipped": "⏭️", "pending": "⏸️"}
+    counts: Dict[str, int] = {}
+    lines = []
+    for item in result["entries"]:
+        counts[item["status"]] = counts.get(item["status"], 0) + 1
+        line = f"{status_emoji[item['status']]} {item['repo']}#{item['pr_number']}"
+        if item["sha"]:
+            line += f" → {item['sha'][:7]}"
+        if item["note"]:
+            line += f" ({item['note']})"
+        line += f" | {item['polls']} yoklama, {item['attempts']} deneme"
+        lines.append(line)
+    
+    return (
+        f"🚦 Merge kuyruğu: {counts.get('merged', 0)} merge edildi, {counts.get('failed', 0)} hatalı, "
+        f"{counts.get('skipped', 0)} atlandı, {counts.get('pending', 0)} bekliyor "
+        f"({result['elapsed']:.1f} sn)\n\n" + "\n".join(lines)
+    )
+
+@tool(
+    name="merge_queue",
+    description="Birden fazla PR'ı sırayla merge et; mergeable durumunu yoklar, yarışlarda yeniden dener, farklı repository'leri paralel işler",
+    properties={
+        "pulls": {
+            "type": "array",
+            "description": "Merge edilecek PR'lar; aynı repository'dekiler bu sırayla merge edilir",
+            "items": {
                 "type": "object",
                 "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si"
-                    },
-                    "pr_number": {
-                        "type": "integer",
-                        "description": "Pull request numarası"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "Yeni başlık (opsiyonel)"
-                    },
-                    "body": {
-                        "type": "string",
-                        "description": "Yeni açıklama (opsiyonel)"
-                    },
-                    "state": {
-                        "type": "string",
-                        "description": "Durum: open veya closed",
-                        "enum": ["open", "closed"]
-                    }
+                    "repo_url": REPO_URL_PROPERTY,
+                    "pr_number": PR_NUMBER_PROPERTY
                 },
                 "required": ["repo_url", "pr_number"]
             }
-        ),
-        types.Tool(
-            name="add_pr_reviewers",
-            description="Pull request'e reviewer ekle",
-            inputSchema={
+        },
+        "merge_method": {
+            "type": "string",
+            "description": "Merge yöntemi: merge, squash, rebase",
+            "enum": ["merge", "squash", "rebase"],
+            "default": "merge"
+        },
+        "pr_timeout": {
+            "type": "number",
+            "description": "PR başına merge edilebilir olmasının en fazla beklenme süresi (sn)",
+            "default": 600
+        },
+        "max_attempts": {
+            "type": "integer",
+            "description": "405/409 yarışlarında PR başına en fazla merge denemesi",
+            "default": 3
+        },
+        "update_branch": {
+            "type": "boolean",
+            "description": "Base'in gerisinde kalan (behind) branch'leri güncelle",
+            "default": False
+        },
+        "stop_on_failure": {
+            "type": "boolean",
+            "description": "Bir PR merge edilemezse aynı repository'deki sonraki PR'ları bekletme",
+            "default": False
+        },
+        "max_concurrency": {
+            "type": "integer",
+            "description": "Aynı anda işlenen en fazla repository sayısı",
+            "default": MULTI_REPO_CONCURRENCY
+        }
+    },
+    required=("pulls",),
+    formatter=format_merge_queue,
+    background=True
+)
+async def merge_queue(arguments: dict) -> Dict[str, Any]:
+    """PR'ları repository başına sırayla, repository'leri paralel merge et"""
+    entries: List[MergeQueueEntry] = []
+    queues: Dict[Tuple[str, str], List[MergeQueueEntry]] = {}
+    for item in arguments["pulls"]:
+        owner, repo = parse_repo_url(item["repo_url"])
+        entry = MergeQueueEntry(owner, repo, item["pr_number"])
+        entries.append(entry)
+        # GitHub adları büyük/küçük harf duyarsızdır
+        queues.setdefault((owner.lower(), repo.lower()), []).append(entry)
+    
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(max(1, arguments["max_concurrency"]))
+    done = 0
+    
+    async def run_queue(queue: List[MergeQueueEntry]) -> None:
+        nonlocal done
+        stopped_by = None
+        async with semaphore:
+            for entry in queue:
+                if stopped_by is not None:
+                    entry.note = f"#{stopped_by} merge edilemediği için bekletildi"
+                else:
+                    try:
+                        await merge_queue_entry(entry, arguments)
+                    except Exception as e:
+                        entry.status, entry.note = "failed", str(e)
+                    if entry.status == "failed" and arguments["stop_on_failure"]:
+                        stopped_by = entry.pr_number
+                done += 1
+                # Her PR sonuçlandığında istemciye bildirilir
+                await report_progress(done, len(entries), f"{entry.owner}/{entry.repo}#{entry.pr_number}: {entry.status}")
+    
+    await asyncio.gather(*(run_queue(queue) for queue in queues.values()))
+    return {"entries": [entry.to_dict() for entry in entries], "elapsed": time.monotonic() - started}
+
+def format_close_pull_request(result: Dict[str, Any], arguments: dict) -> str:
+    """Kapatılan PR'ı formatla"""
+    return (
+        f"🔒 Pull Request #{arguments['pr_number']} kapatıldı.\n\n"
+        f"**Başlık:** {result['title']}\n"
+        f"**URL:** {result['html_url']}"
+    )
+
+@tool(
+    name="close_pull_request",
+    description="Pull request'i kapat",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY
+    },
+    required=("repo_url", "pr_number"),
+    formatter=format_close_pull_request
+)
+async def close_pull_request(arguments: dict) -> Dict[str, Any]:
+    """PR'ı kapat"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    
+    data = {
+        "state": "closed"
+    }
+    
+    return await github_request(
+        "PATCH",
+        f"/repos/{owner}/{repo}/pulls/{arguments['pr_number']}",
+        json=data
+    )
+
+def format_update_pull_request(result: Dict[str, Any], arguments: dict) -> str:
+    """Güncellenen PR'ı formatla"""
+    return (
+        f"✏️ Pull Request #{arguments['pr_number']} güncellendi!\n\n"
+        f"**Başlık:** {result['title']}\n"
+        f"**Durum:** {result['state']}\n"
+        f"**URL:** {result['html_url']}"
+    )
+
+@tool(
+    name="update_pull_request",
+    description="Pull request bilgilerini güncelle",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY,
+        "title": {
+            "type": "string",
+            "description": "Yeni başlık (opsiyonel)"
+        },
+        "body": {
+            "type": "string",
+            "description": "Yeni açıklama (opsiyonel)"
+        },
+        "state": {
+            "type": "string",
+            "description": "Durum: open veya closed",
+            "enum": ["open", "closed"]
+        }
+    },
+    required=("repo_url", "pr_number"),
+    formatter=format_update_pull_request
+)
+async def update_pull_request(arguments: dict) -> Dict[str, Any]:
+    """PR bilgilerini güncelle"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    
+    data = {}
+    if "title" in arguments:
+        data["title"] = arguments["title"]
+    if "body" in arguments:
+        data["body"] = arguments["body"]
+    if "state" in arguments:
+        data["state"] = arguments["state"]
+    
+    return await github_request(
+        "PATCH",
+        f"/repos/{owner}/{repo}/pulls/{arguments['pr_number']}",
+        json=data
+    )
+
+def format_add_pr_reviewers(result: Dict[str, Any], arguments: dict) -> str:
+    """Eklenen reviewer'ları formatla"""
+    # Yanıt PR'ın kendisidir; bekleyen tüm reviewer istekleri listelenir
+    reviewers = [r['login'] for r in result.get('requested_reviewers', [])]
+    teams = [t.get('name') or t['slug'] for t in result.get('requested_teams', [])]
+    
+    return (
+        f"👥 Reviewer'lar eklendi!\n\n"
+        f"**PR #:** {arguments['pr_number']}\n"
+        f"**Kullanıcılar:** {', '.join(reviewers) if reviewers else 'Yok'}\n"
+        f"**Takımlar:** {', '.join(teams) if teams else 'Yok'}"
+    )
+
+@tool(
+    name="add_pr_reviewers",
+    description="Pull request'e reviewer ekle",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY,
+        "reviewers": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            },
+            "description": "Eklenecek reviewer kullanıcı adları"
+        },
+        "team_reviewers": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            },
+            "description": "Eklenecek takım adları (opsiyonel)"
+        }
+    },
+    required=("repo_url", "pr_number", "reviewers"),
+    formatter=format_add_pr_reviewers
+)
+async def add_pr_reviewers(arguments: dict) -> Dict[str, Any]:
+    """PR'a reviewer ekle"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    
+    data = {
+        "reviewers": arguments["reviewers"]
+    }
+    
+    if "team_reviewers" in arguments:
+        data["team_reviewers"] = arguments["team_reviewers"]
+    
+    return await github_request(
+        "POST",
+        f"/repos/{owner}/{repo}/pulls/{arguments['pr_number']}/requested_reviewers",
+        json=data
+    )
+
+# auto_assign_reviewers'ın CODEOWNERS dosyasını aradığı yollar (GitHub'ın sırasıyla)
+CODEOWNERS_PATHS = (".github/CODEOWNERS", "CODEOWNERS", "docs/CODEOWNERS")
+# Search API dakikada 30 istekle sınırlı; reviewer yükü sorguları en fazla bu kadar eşzamanlı gönderilir
+REVIEW_LOAD_CONCURRENCY = 5
+
+def compile_codeowners_pattern(pattern: str) -> re.Pattern:
+    """CODEOWNERS (gitignore sözdizimi) desenini dosya yoluyla eşleşen regex'e çevir"""
+    # Başta ya da ortada "/" içeren desenler köke bağlıdır, diğerleri her dizinde eşleşir
+    anchored = "/" in pattern.rstrip("/")
+    directory = pattern.endswith("/")
+    body = pattern.strip("/")
+    regex, index = "", 0
+    while index < len(body):
+        if body.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+        elif body.startswith("**", index):
+            regex += ".*"
+            index += 2
+        elif body[index] == "*":
+            regex += "[^/]*"
+            index += 1
+        elif body[index] == "?":
+            regex += "[^/]"
+            index += 1
+        else:
+            regex += re.escape(body[index])
+            index += 1
+    prefix = "^" if anchored else "^(?:.*/)?"
+    # Dizinle eşleşen desen dizinin içeriğini de kapsar; "docs/*" yalnızca doğrudan dosyalarla eşleşir
+    if directory:
+        suffix = "/.*$"
+    elif body.endswith("*"):
+        suffix = "$"
+    else:
+        suffix = "(?:/.*)?$"
+    return re.compile(prefix + regex + suffix)
+
+def parse_codeowners(lines: List[str]) -> List[Tuple[re.Pattern, List[str]]]:
+    """CODEOWNERS satırlarını (desen, kullanıcı adları) kurallarına çevir; takım ve e-postalar atlanır"""
+    rules = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        pattern, *owners = line.split()
+        logins = [owner[1:] for owner in owners if owner.startswith("@") and "/" not in owner]
+        rules.append((compile_codeowners_pattern(pattern), logins))
+    return rules
+
+def codeowners_for(rules: List[Tuple[re.Pattern, List[str]]], paths: List[str]) -> Optional[set]:
+    """Dosyaların sahipleri; her dosya için son eşleşen kural geçerlidir, hiç eşleşme yoksa None"""
+    owners, matched = set(), False
+    for path in paths:
+        for regex, logins in reversed(rules):
+            if regex.match(path):
+                owners.update(login.lower() for login in logins)
+                matched = True
+                break
+    return owners if matched else None
+
+async def fetch_codeowners(owner: str, repo: str) -> List[str]:
+    """Repository'nin CODEOWNERS dosyasını oku; yoksa boş liste"""
+    for path in CODEOWNERS_PATHS:
+        try:
+            data, _ = await github_request_page(
+                "GET", f"/repos/{owner}/{repo}/contents/{path}", headers={"Accept": RAW_MEDIA_TYPE}, raw=True
+            )
+        except GitHubAPIError as e:
+            if e.status_code != 404:
+                raise
+            continue
+        return data.decode("utf-8", "replace").splitlines()
+    return []
+
+async def fetch_pr_filenames(owner: str, repo: str, pr_number: int) -> List[str]:
+    """PR'daki tüm dosya yolları; get_pr_files ile aynı depo kaydını kullanır"""
+    if pr_store is not None:
+        stored = await pr_store.get_files(owner, repo, pr_number)
+        if stored is not None:
+            return [file["filename"] for file in stored]
+    files = [f async for f in paginate(f"/repos/{owner}/{repo}/pulls/{pr_number}/files", projection=FILE_SUMMARY)]
+    if pr_store is not None:
+        pr_store.save_files(owner, repo, pr_number, files)
+    return [file["filename"] for file in files]
+
+async def count_review_requests(login: str, scope: Optional[str]) -> int:
+    """Kullanıcıdan doğrudan review beklenen açık PR sayısı"""
+    terms = ["is:pr", "is:open", search_qualifier("user-review-requested", login)]
+    if scope:
+        terms.append(search_qualifier("org", scope))
+    data = await github_request("GET", "/search/issues", params={"q": " ".join(terms), "per_page": 1})
+    return data["total_count"]
+
+class ReviewerScheduler:
+    """Reviewer'ları güncel yüklerine göre min-heap'te tutan atayıcı
+    
+    Heap girdileri (yük, havuz sırası, kullanıcı) üçlüleridir; yükü değişen kullanıcı yeni
+    girdiyle eklenir, eskimiş girdiler çekilirken atlanır.
+    """
+
+    def __init__(self, loads: Dict[str, int]):
+        self.loads = dict(loads)
+        self.order = {login: index for index, login in enumerate(loads)}
+        self.heap = [(load, self.order[login], login) for login, load in self.loads.items()]
+        heapq.heapify(self.heap)
+
+    def assign(self, count: int, allowed: Optional[set] = None, excluded: Optional[set] = None) -> List[str]:
+        """allowed içinden (excluded hariç) en az yüklü count kişiyi seçip yüklerini artır"""
+        chosen, skipped = [], []
+        while self.heap and len(chosen) < count:
+            entry = heapq.heappop(self.heap)
+            load, _, login = entry
+            if load != self.loads[login]:
+                continue
+            key = login.lower()
+            if (allowed is not None and key not in allowed) or (excluded and key in excluded):
+                skipped.append(entry)
+                continue
+            chosen.append(login)
+        for entry in skipped:
+            heapq.heappush(self.heap, entry)
+        for login in chosen:
+            self.loads[login] += 1
+            heapq.heappush(self.heap, (self.loads[login], self.order[login], login))
+        return chosen
+
+    def release(self, logins: List[str]) -> None:
+        """Gönderilemeyen atamaların yükünü geri al"""
+        for login in logins:
+            self.loads[login] -= 1
+            heapq.heappush(self.heap, (self.loads[login], self.order[login], login))
+
+def format_auto_assign_reviewers(result: Dict[str, Any], arguments: dict) -> str:
+    """Atama planını ve reviewer yüklerini formatla"""
+    status_emoji = {"assigned": "✅", "planned": "📝", "skipped": "⏭️", "failed": "❌"}
+    lines = []
+    for item in result["assignments"]:
+        reviewers = ", ".join(f"@{login}" for login in item["reviewers"]) or "-"
+        line = f"{status_emoji[item['status']]} {item['repo']}#{item['pr_number']}: {reviewers}"
+        if item["note"]:
+            line += f" ({item['note']})"
+        lines.append(line)
+    
+    unknown = set(result["unknown_loads"])
+    loads = [
+        f"- @{login}: bilinmiyor (+{after - before} atama)" if login in unknown else f"- @{login}: {before} → {after}"
+        for login, (before, after) in sorted(result["loads"].items(), key=lambda item: (item[1][1], item[0]))
+    ]
+    title = "📝 Reviewer atama planı (dry run)" if arguments["dry_run"] else "👥 Reviewer'lar atandı"
+    text = (
+        f"{title}:\n\n" + "\n".join(lines) +
+        "\n\n**Bekleyen review yükü (önce → sonra):**\n" + "\n".join(loads)
+    )
+    if unknown:
+        text += (
+            f"\n\n⚠️ {len(unknown)} reviewer'ın yükü alınamadı (arama hız sınırı olabilir); "
+            f"en yüklü reviewer kadar yüklü kabul edildi"
+        )
+    return text
+
+@tool(
+    name="auto_assign_reviewers",
+    description="PR kümesine reviewer havuzundan, açık review yükünü dengeleyerek ve CODEOWNERS kurallarına uyarak reviewer ata",
+    properties={
+        "pulls": {
+            "type": "array",
+            "description": "Reviewer atanacak PR'lar",
+            "items": {
                 "type": "object",
                 "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "GitHub repository URL'si"
-                    },
-                    "pr_number": {
-                        "type": "integer",
-                        "description": "Pull request numarası"
-                    },
-                    "reviewers": {
-                        "type": "array",
-                        "items": {
-                            "type": "string"
-                        },
-                        "description": "Eklenecek reviewer kullanıcı adları"
-                    },
-                    "team_reviewers": {
-                        "type": "array",
-                        "items": {
-                            "type": "string"
-                        },
-                        "description": "Eklenecek takım adları (opsiyonel)"
-                    }
+                    "repo_url": REPO_URL_PROPERTY,
+                    "pr_number": PR_NUMBER_PROPERTY
                 },
-                "required": ["repo_url", "pr_number", "reviewers"]
+                "required": ["repo_url", "pr_number"]
             }
-        ),
-        types.Tool(
-            name="get_pr_files",
-            description="Pull request'teki değişen dosyaları listele",
-            inputSchema={
+        },
+        "reviewers": {
+            "type": "array",
+            "description": "Reviewer havuzu (kullanıcı adları)",
+            "items": {"type": "string"}
+        },
+        "reviewers_per_pr": {
+            "type": "integer",
+            "description": "PR başına hedef reviewer sayısı (zaten istenmiş olanlar dahil)",
+            "default": 1
+        },
+        "rules": {
+            "type": "array",
+            "description": "CODEOWNERS biçiminde yol kuralları (örn: 'src/api/ @alice @bob'); son eşleşen kural geçerlidir",
+            "items": {"type": "string"}
+        },
+        "use_codeowners": {
+            "type": "boolean",
+            "description": "rules verilmemişse repository'nin CODEOWNERS dosyasını kullan",
+            "default": False
+        },
+        "load_scope": {
+            "type": "string",
+            "description": "Mevcut review yükünün sayılacağı org (boşsa tüm GitHub)"
+        },
+        "dry_run": {
+            "type": "boolean",
+            "description": "Yalnızca planı göster, reviewer isteği gönderme",
+            "default": False
+        }
+    },
+    required=("pulls", "reviewers"),
+    formatter=format_auto_assign_reviewers,
+    background=True
+)
+async def auto_assign_reviewers(arguments: dict) -> Dict[str, Any]:
+    """Yükleri ve PR verilerini eşzamanlı topla, heap ile dengeli ata, istekleri paralel gönder"""
+    pool = list(dict.fromkeys(arguments["reviewers"]))
+    if not pool:
+        raise ValueError("reviewers havuzu boş olamaz")
+    pulls = []
+    for entry in arguments["pulls"]:
+        owner, repo = parse_repo_url(entry["repo_url"])
+        pulls.append((owner, repo, entry["pr_number"]))
+    per_pr = max(1, arguments["reviewers_per_pr"])
+    rule_lines = arguments.get("rules")
+    use_codeowners = not rule_lines and arguments["use_codeowners"]
+    repos = list(dict.fromkeys((owner, repo) for owner, repo, _ in pulls))
+    load_semaphore = asyncio.Semaphore(REVIEW_LOAD_CONCURRENCY)
+    
+    async def load_of(login: str) -> int:
+        async with load_semaphore:
+            return await count_review_requests(login, arguments.get("load_scope"))
+    
+    async def load_pull(owner: str, repo: str, pr_number: int):
+        pr = await github_request("GET", f"/repos/{owner}/{repo}/pulls/{pr_number}", projection=PULL_DETAIL)
+        paths = await fetch_pr_filenames(owner, repo, pr_number) if rule_lines or use_codeowners else []
+        return pr, paths
+    
+    async def load_rules():
+        if rule_lines:
+            rules = parse_codeowners(rule_lines)
+            return {r: rules for r in repos}
+        if not use_codeowners:
+            return {}
+        files = await asyncio.gather(*(fetch_codeowners(owner, repo) for owner, repo in repos))
+        return {r: parse_codeowners(lines) for r, lines in zip(repos, files)}
+    
+    # Yükler, PR'lar, dosya listeleri ve CODEOWNERS dosyaları birlikte istenir
+    load_counts, pull_data, repo_rules = await asyncio.gather(
+        asyncio.gather(*(load_of(login) for login in pool), return_exceptions=True),
+        asyncio.gather(*(load_pull(*pull) for pull in pulls), return_exceptions=True),
+        load_rules()
+    )
+    # Sayılamayan yük (örn. arama hız sınırı) bilinmiyor kabul edilir; kişi en yüklü reviewer kadar yüklü sayılır
+    unknown = [login for login, count in zip(pool, load_counts) if isinstance(count, Exception)]
+    assumed = max((count for count in load_counts if not isinstance(count, Exception)), default=0)
+    loads = {
+        login: assumed if isinstance(count, Exception) else count
+        for login, count in zip(pool, load_counts)
+    }
+    scheduler = ReviewerScheduler(loads)
+    
+    plans, pending = [], []
+    for (owner, repo, pr_number), data in zip(pulls, pull_data):
+        plan = {"repo": f"{owner}/{repo}", "pr_number": pr_number, "reviewers": [], "status": "skipped", "note": None}
+        plans.append(plan)
+        if isinstance(data, Exception):
+            plan.update(status="failed", note=str(data))
+            continue
+        pr, paths = data
+        requested = {r["login"].lower() for r in pr.get("requested_reviewers") or []}
+        needed = per_pr - len(requested)
+        if pr["state"] != "open":
+            plan["note"] = "PR açık değil"
+            continue
+        if needed <= 0:
+            plan["note"] = "yeterli reviewer istenmiş"
+            continue
+        # PR sahibi ve zaten istenmiş reviewer'lar seçilmez
+        excluded = requested | {((pr.get("user") or {}).get("login") or "").lower()}
+        owners = codeowners_for(repo_rules.get((owner, repo), []), paths)
+        pending.append((plan, needed, excluded, owners))
+    
+    # Adayı az olan PR'lar önce atanır ki geniş havuzlu PR'lar dar kod sahibi kümelerini tüketmesin
+    pending.sort(key=lambda item: len(item[3]) if item[3] is not None else len(pool))
+    for plan, needed, excluded, owners in pending:
+        chosen = scheduler.assign(needed, owners, excluded)
+        if owners is not None and len(chosen) < needed:
+            # Havuzda yeterli kod sahibi yoksa kalanlar tüm havuzdan seçilir
+            fallback = scheduler.assign(needed - len(chosen), None, excluded | {login.lower() for login in chosen})
+            if fallback:
+                plan["note"] = "kod sahipleri yetersiz, havuzdan tamamlandı"
+            chosen += fallback
+        plan["reviewers"] = chosen
+        if chosen:
+            plan["status"] = "planned"
+        else:
+            plan["note"] = "uygun reviewer yok"
+    
+    targets = [plan for plan in plans if plan["status"] == "planned"]
+    if not arguments["dry_run"] and targets:
+        async def request_reviewers(plan: Dict[str, Any]) -> None:
+            try:
+                await github_request(
+                    "POST",
+                    f"/repos/{plan['repo']}/pulls/{plan['pr_number']}/requested_reviewers",
+                    json={"reviewers": plan["reviewers"]}
+                )
+                plan["status"] = "assigned"
+            except Exception as e:
+                plan["status"], plan["note"] = "failed", str(e)
+                scheduler.release(plan["reviewers"])
+    
+        # İstekler paralel başlatılır; eşzamanlılık ve bütçe hız sınırı zamanlayıcısınca sınırlanır
+        tasks = [asyncio.ensure_future(request_reviewers(plan)) for plan in targets]
+        try:
+            for done, future in enumerate(asyncio.as_completed(tasks), start=1):
+                await future
+                await report_progress(done, len(tasks), "reviewer istekleri")
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    return {
+        "assignments": plans,
+        "loads": {login: (loads[login], scheduler.loads[login]) for login in pool},
+        "unknown_loads": unknown
+    }
+
+def format_file_line(file: Dict[str, Any]) -> str:
+    """Tek dosya değişikliğini satır olarak formatla"""
+    status_emoji = FILE_STATUS_EMOJI.get(file['status'], "❓")
+    return f"{status_emoji} {file['filename']} (+{file['additions']}/-{file['deletions']})"
+
+def format_get_pr_files(result: Dict[str, Any], arguments: dict) -> List[str]:
+    """Değişen dosyaları boyutu sınırlı parçalar halinde formatla"""
+    files = result["files"]
+    first, last = result["offset"] + 1, result["offset"] + len(files)
+    lines = [f"📁 Pull Request #{arguments['pr_number']} Dosya Değişiklikleri:", ""]
+    lines.extend(format_file_line(file) for file in files)
+    lines.append("")
+    if result["next_cursor"] is not None:
+        lines.append(
+            f"**Gösterilen:** {first}-{last}. dosyalar | "
+            f"⏭️ Devamı için cursor: `{result['next_cursor']}`"
+        )
+    elif result["offset"]:
+        lines.append(f"**Gösterilen:** {first}-{last}. dosyalar (son)")
+    else:
+        lines.append(f"**Toplam:** {len(files)} dosya değişti")
+    return chunk_lines(lines)
+
+@tool(
+    name="get_pr_files",
+    description="Pull request'teki değişen dosyaları listele",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY,
+        "limit": {
+            "type": "integer",
+            "description": "Maksimum dosya sayısı (varsayılan: bayt bütçesine sığan tümü)"
+        },
+        "max_bytes": {
+            "type": "integer",
+            "description": "Çıktının en fazla boyutu (bayt); aşılırsa devam imleci döner",
+            "default": OUTPUT_MAX_BYTES
+        },
+        "cursor": {
+            "type": "string",
+            "description": "Önceki çağrının döndürdüğü devam imleci"
+        },
+        "max_age": MAX_AGE_PROPERTY
+    },
+    required=("repo_url", "pr_number"),
+    formatter=format_get_pr_files,
+    background=True
+)
+async def get_pr_files(arguments: dict) -> Dict[str, Any]:
+    """PR'daki değişen dosyaları bütçe dolana kadar sayfa sayfa getir"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    pr_number = arguments["pr_number"]
+    offset, _ = parse_cursor(arguments.get("cursor"))
+    limit = arguments.get("limit")
+    budget = OutputBudget(arguments["max_bytes"], max(1, limit) if limit is not None else None)
+    
+    # Depoda yalnızca tam dosya listeleri tutulur
+    stored = None
+    if pr_store is not None:
+        stored = await pr_store.get_files(
+            owner, repo, pr_number, arguments.get("max_age", PR_STORE_MAX_AGE)
+        )
+    
+    async def from_store():
+        for file in stored[offset:]:
+            yield file
+    
+    if stored is not None:
+        source = from_store()
+    else:
+        source = paginate(
+            f"/repos/{owner}/{repo}/pulls/{pr_number}/files", projection=FILE_SUMMARY, start=offset
+        )
+    
+    files = []
+    next_cursor = None
+    try:
+        async for file in source:
+            if not budget.next_file(format_file_line(file)):
+                # Kalan sayfalar istenmez; sonraki çağrı bu dosyadan devam eder
+                next_cursor = str(offset + len(files))
+                break
+            files.append(file)
+            if len(files) % PAGE_SIZE == 0:
+                await report_progress(offset + len(files), message=f"{offset + len(files)} dosya")
+    finally:
+        await source.aclose()
+    
+    if pr_store is not None and stored is None and offset == 0 and next_cursor is None:
+        pr_store.save_files(owner, repo, pr_number, files)
+    return {"files": files, "offset": offset, "next_cursor": next_cursor}
+
+def format_get_pr_diff(result: Dict[str, Any], arguments: dict) -> List[str]:
+    """Diff satırlarını boyutu sınırlı parçalar halinde formatla"""
+    lines = [f"🧾 Pull Request #{arguments['pr_number']} Diff:", ""]
+    lines.extend(result["lines"] or ["Eşleşen dosya değişikliği yok."])
+    lines.append("")
+    if result["next_cursor"] is not None:
+        lines.append(f"**Gösterilen:** {result['files']} dosya | ⏭️ Devamı için cursor: `{result['next_cursor']}`")
+    else:
+        lines.append(f"**Gösterilen:** {result['files']} dosya (son)")
+    return chunk_lines(lines)
+
+def diff_header(file: Dict[str, Any]) -> List[str]:
+    """Dosya için git diff başlık satırlarını üret"""
+    new_path = file["filename"]
+    old_path = file.get("previous_filename") or new_path
+    return [
+        f"diff --git a/{old_path} b/{new_path}",
+        "--- /dev/null" if file["status"] == "added" else f"--- a/{old_path}",
+        "+++ /dev/null" if file["status"] == "removed" else f"+++ b/{new_path}",
+    ]
+
+async def diff_sections(
+    owner: str,
+    repo: str,
+    pr_number: int,
+    arguments: dict,
+    start_file: int
+) -> AsyncIterator[Tuple[int, str, List[str], Callable[[], List[str]]]]:
+    """PR diff'ini (sıra, yol, başlık satırları, gövde satırları) bölümleri olarak üret
+    
+    Ham diff repo ve SHA'larla anahtarlanan disk önbelleğinden ya da tek compare isteğiyle alınır.
+    GitHub diff'i çok büyük bulup reddederse dosya listesindeki patch'lere dönülür.
+    Gövde yalnızca çağrıldığında çözülür; atlanan dosyalar kopyalanmaz.
+    """
+    head_sha, base_sha = arguments.get("head_sha"), arguments.get("base_sha")
+    if not head_sha or not base_sha:
+        pr = await github_request("GET", f"/repos/{owner}/{repo}/pulls/{pr_number}", projection=PULL_DETAIL)
+        head_sha, base_sha = head_sha or pr["head"]["sha"], base_sha or pr["base"]["sha"]
+    
+    diff = None
+    try:
+        diff = await fetch_raw(
+            f"/repos/{owner}/{repo}/compare/{base_sha}...{head_sha}",
+            DIFF_MEDIA_TYPE,
+            # Erişim repo başına denetlendiğinden aynı SHA'lar başka repo'nun kaydından sunulmaz
+            f"diff:{RepoRef(GITHUB_HOST, owner, repo).slug}:{base_sha}...{head_sha}"
+        )
+    except GitHubAPIError as e:
+        # 406/422: diff GitHub'ın tek yanıt sınırını aşıyor
+        if e.status_code not in (406, 422):
+            raise
+    
+    if diff is not None:
+        try:
+            for index, (path, section_start, section_end) in enumerate(split_diff(diff)):
+                if index < start_file:
+                    continue
+                section = diff[section_start:section_end]
+                header, _, body = section.decode("utf-8", "replace").rstrip("\n").partition("\n")
+                yield index, path, [header], (lambda body=body: body.split("\n") if body else [])
+        finally:
+            if isinstance(diff, mmap.mmap):
+                diff.close()
+        return
+    
+    pages = paginate(
+        f"/repos/{owner}/{repo}/pulls/{pr_number}/files", projection=FILE_PATCH, start=start_file
+    )
+    try:
+        index = start_file
+        async for file in pages:
+            patch = file.get("patch")
+            if patch is None:
+                body = [f"(patch yok: ikili dosya ya da GitHub'ın gösterim sınırını aşan değişiklik; blob {file.get('sha')})"]
+            else:
+                body = patch.split("\n")
+            yield index, file["filename"], diff_header(file), (lambda body=body: body)
+            index += 1
+    finally:
+        await pages.aclose()
+
+@tool(
+    name="get_pr_diff",
+    description="Pull request'teki değişikliklerin patch içeriğini bayt bütçesiyle ve devam imleciyle getir",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "pr_number": PR_NUMBER_PROPERTY,
+        "paths": {
+            "type": "array",
+            "description": "Yalnızca bu glob desenlerine uyan dosyalar (örn: src/*.py)",
+            "items": {"type": "string"}
+        },
+        "max_files": {
+            "type": "integer",
+            "description": "Bir çağrıda en fazla dosya sayısı"
+        },
+        "max_bytes": {
+            "type": "integer",
+            "description": "Çıktının en fazla boyutu (bayt); aşılırsa devam imleci döner",
+            "default": OUTPUT_MAX_BYTES
+        },
+        "cursor": {
+            "type": "string",
+            "description": "Önceki çağrının döndürdüğü devam imleci"
+        },
+        "head_sha": {
+            "type": "string",
+            "description": "Head commit SHA'sı (verilirse PR detayı istenmez)"
+        },
+        "base_sha": {
+            "type": "string",
+            "description": "Base commit SHA'sı (verilirse PR detayı istenmez)"
+        }
+    },
+    required=("repo_url", "pr_number"),
+    formatter=format_get_pr_diff,
+    background=True
+)
+async def get_pr_diff(arguments: dict) -> Dict[str, Any]:
+    """Diff bölümlerini okuyup bütçe dolunca dosya/satır imleciyle dur"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    pr_number = arguments["pr_number"]
+    start_file, start_line = parse_cursor(arguments.get("cursor"))
+    max_files = arguments.get("max_files")
+    budget = OutputBudget(arguments["max_bytes"], max(1, max_files) if max_files is not None else None)
+    paths = arguments.get("paths", [])
+    
+    lines: List[str] = []
+    next_cursor = None
+    emitted = False
+    sections = diff_sections(owner, repo, pr_number, arguments, start_file)
+    try:
+        async for index, path, header, body in sections:
+            if paths and not any(fnmatch.fnmatchcase(path, p) for p in paths):
+                continue
+            first_line = start_line if index == start_file else 0
+            if first_line:
+                header = header + [f"... (önceki {first_line} satır atlandı)"]
+            if not budget.next_file("\n".join(header)):
+                next_cursor = f"{index}:{first_line}" if first_line else str(index)
+                break
+            lines.extend(header)
+            
+            body_lines = body()
+            for line_index in range(first_line, len(body_lines)):
+                # Bütçeden uzun tek satırda takılmamak için her çağrı en az bir satır ilerler
+                if not budget.fits(body_lines[line_index], force=not emitted):
+                    next_cursor = f"{index}:{line_index}"
+                    break
+                lines.append(body_lines[line_index])
+                emitted = True
+            if next_cursor is not None:
+                break
+    finally:
+        await sections.aclose()
+    
+    return {"lines": lines, "files": budget.files, "next_cursor": next_cursor}
+
+BLOB_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+def format_get_blob(result: Dict[str, Any], arguments: dict) -> List[str]:
+    """Blob içeriğini boyutu sınırlı parçalar halinde formatla"""
+    lines = [f"📄 Blob `{arguments['sha'][:12]}` ({result['size']} bayt):", ""]
+    if result["binary"]:
+        lines.append("(ikili içerik gösterilmiyor)")
+    else:
+        lines.extend(result["lines"])
+    lines.append("")
+    if result["next_cursor"] is not None:
+        lines.append(f"⏭️ Devamı için cursor: `{result['next_cursor']}`")
+    return chunk_lines(lines)
+
+@tool(
+    name="get_blob",
+    description="Dosya içeriğini blob SHA'sıyla getir (değişmez olduğu için disk önbelleğinden sunulur)",
+    properties={
+        "repo_url": REPO_URL_PROPERTY,
+        "sha": {
+            "type": "string",
+            "description": "Blob SHA'sı (örn. get_pr_files/get_pr_diff çıktısından)"
+        },
+        "max_bytes": {
+            "type": "integer",
+            "description": "Çıktının en fazla boyutu (bayt); aşılırsa devam imleci döner",
+            "default": OUTPUT_MAX_BYTES
+        },
+        "cursor": {
+            "type": "string",
+            "description": "Önceki çağrının döndürdüğü devam imleci (satır numarası)"
+        }
+    },
+    required=("repo_url", "sha"),
+    formatter=format_get_blob
+)
+async def get_blob(arguments: dict) -> Dict[str, Any]:
+    """Blob'u ham medya türüyle getirip satır bütçesiyle döndür"""
+    owner, repo = parse_repo_url(arguments["repo_url"])
+    sha = arguments["sha"].lower()
+    if not BLOB_SHA_PATTERN.match(sha):
+        raise ValueError(f"Geçersiz blob SHA'sı: {arguments['sha']}")
+    start_line, _ = parse_cursor(arguments.get("cursor"))
+    
+    data = await fetch_raw(
+        f"/repos/{owner}/{repo}/git/blobs/{sha}", RAW_MEDIA_TYPE, f"blob:{RepoRef(GITHUB_HOST, owner, repo).slug}:{sha}"
+    )
+    try:
+        size = len(data)
+        if b"\0" in data[:8192]:
+            return {"size": size, "binary": True, "lines": [], "next_cursor": None}
+        content_lines = data[:].decode("utf-8", "replace").split("\n")
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    
+    budget = OutputBudget(arguments["max_bytes"])
+    lines: List[str] = []
+    next_cursor = None
+    for line_index in range(start_line, len(content_lines)):
+        if not budget.fits(content_lines[line_index]):
+            next_cursor = str(line_index)
+            break
+        lines.append(content_lines[line_index])
+    return {"size": size, "binary": False, "lines": lines, "next_cursor": next_cursor}
+
+def format_batch_pr_operations(results: List[Tuple[str, str, str]], arguments: dict) -> str:
+    """Toplu işlem sonuçlarını formatla"""
+    counts = {"✅": 0, "❌": 0, "⏭️": 0}
+    sections = []
+    for index, (tool_name, status, text) in enumerate(results, start=1):
+        counts[status] += 1
+        sections.append(f"**[{index}] {status} {tool_name}**\n{text}")
+    
+    return (
+        f"📦 Toplu işlem tamamlandı: {counts['✅']} başarılı, "
+        f"{counts['❌']} hatalı, {counts['⏭️']} atlandı\n\n" +
+        "\n\n".join(sections)
+    )
+
+@tool(
+    name="batch_pr_operations",
+    description="Birden fazla PR işlemini tek çağrıda, sınırlı eşzamanlılıkla çalıştır",
+    properties={
+        "operations": {
+            "type": "array",
+            "description": "Çalıştırılacak işlemler (diğer tool adları ve argümanları)",
+            "items": {
                 "type": "object",
                 "properties": {
-                    "repo_url": {
+                    "tool": {
                         "type": "string",
-                        "description": "GitHub repository URL'si"
+                        "description": "Tool adı (örn: add_pr_comment)"
                     },
-                    "pr_number": {
-                        "type": "integer",
-                        "description": "Pull request numarası"
+                    "arguments": {
+                        "type": "object",
+                        "description": "Tool argümanları"
                     }
                 },
-                "required": ["repo_url", "pr_number"]
+                "required": ["tool", "arguments"]
             }
+        },
+        "max_concurrency": {
+            "type": "integer",
+            "description": "Aynı anda çalışacak en fazla işlem sayısı",
+            "default": 5
+        },
+        "stop_on_failure": {
+            "type": "boolean",
+            "description": "İlk hatada kalan işlemleri başlatma",
+            "default": False
+        }
+    },
+    required=("operations",),
+    formatter=format_batch_pr_operations,
+    background=True
+)
+async def batch_pr_operations(arguments: dict) -> List[Tuple[str, str, str]]:
+    """Alt işlemleri sınırlı eşzamanlılıkla dispatch_tool üzerinden çalıştır"""
+    semaphore = asyncio.Semaphore(max(1, arguments["max_concurrency"]))
+    stop_on_failure = arguments["stop_on_failure"]
+    stopped = asyncio.Event()
+    
+    async def run_one(operation: dict) -> Tuple[str, str, str]:
+        tool_name = operation["tool"]
+        async with semaphore:
+            if stopped.is_set():
+                return tool_name, "⏭️", "Önceki bir hata nedeniyle atlandı"
+            try:
+                if tool_name == "batch_pr_operations":
+                    raise ValueError("İç içe toplu işlem desteklenmiyor")
+                contents = await dispatch_tool(tool_name, operation["arguments"])
+                return tool_name, "✅", "\n".join(c.text for c in contents if c.type == "text")
+            except Exception as e:
+                if stop_on_failure:
+                    stopped.set()
+                return tool_name, "❌", f"Hata: {str(e)}"
+    
+    return await asyncio.gather(*(run_one(op) for op in arguments["operations"]))
+
+def format_rate_limit_status(pool: TokenPool, arguments: dict) -> str:
+    """Hız sınırı durumunu token başına formatla"""
+    now = time.time()
+    sections = []
+    for credential in pool.credentials:
+        lines = []
+        for resource, bucket in sorted(credential.scheduler.buckets.items()):
+            if bucket.remaining is None:
+                continue
+            line = (
+                f"**{resource}:** {bucket.remaining}/{bucket.limit} kalan, "
+                f"sıfırlanma {max(bucket.reset - now, 0):.0f} sn sonra"
+            )
+            if bucket.blocked_until > now:
+                line += f" (🚫 {bucket.blocked_until - now:.0f} sn beklemede)"
+            lines.append(line)
+        text = "\n".join(lines) if lines else "Henüz hız sınırı bilgisi yok"
+        if len(pool.credentials) > 1:
+            scope = ", ".join(credential.scopes) if credential.scopes else "tüm repository'ler"
+            kind = "GitHub App" if credential.is_app else "PAT"
+            text = f"🔑 **{credential.name}** ({kind}, {scope}, {credential.requests} istek)\n{text}"
+            if not credential.usable:
+                text += (
+                    f"\n⚠️ Kullanılamıyor, {credential.disabled_until - now:.0f} sn sonra yeniden denenecek: "
+                    f"{credential.error}"
+                )
+        sections.append(text)
+    
+    stats = pool.stats()
+    return (
+        f"📊 GitHub API Hız Sınırı Durumu:\n\n" +
+        ("\n\n".join(sections) if sections else "Tanımlı token yok") + "\n\n"
+        f"**Kuyruk:** {stats['queued']} bekleyen, {stats['in_flight']} uçuşta\n"
+        f"**Yavaşlatılan istek:** {stats['throttled']} | "
+        f"**Hız sınırı yanıtı:** {stats['rate_limited']}"
+    )
+
+@tool(
+    name="rate_limit_status",
+    description="GitHub API hız sınırı bütçesini (token başına) ve istek kuyruğunu göster",
+    properties={
+        "refresh": {
+            "type": "boolean",
+            "description": "Güncel değerleri her token için /rate_limit uç noktasından çek (bütçeden düşmez)",
+            "default": False
+        }
+    },
+    formatter=format_rate_limit_status
+)
+async def rate_limit_status(arguments: dict) -> TokenPool:
+    """Token havuzunu, istenirse her token'ı tazeleyerek döndür"""
+    if arguments["refresh"]:
+        async def refresh(credential: Credential) -> None:
+            # Önbellek token'ı ayırt etmediğinden istek doğrudan ilgili token'la gönderilir
+            response = await send_request("GET", f"{GITHUB_API_BASE}/rate_limit", credential=credential)
+            if response.status_code >= 400:
+                raise GitHubAPIError(
+                    f"GitHub API hatası ({credential.name}): {response.status_code} - {response.text[:200]}",
+                    response.status_code
+                )
+            credential.scheduler.update_from_rate_limit(json_loads(response.content).get("resources", {}))
+        
+        usable = [c for c in token_pool.credentials if c.usable]
+        results = await asyncio.gather(*(refresh(c) for c in usable), return_exceptions=True)
+        for credential, result in zip(usable, results):
+            # Token'ı alınamayan App kimlikleri işaretlenip listede gösterilir, diğer hatalar iletilir
+            if isinstance(result, BaseException) and credential.usable:
+                raise result
+    return token_pool
+
+def format_server_metrics(snapshot: Metrics, arguments: dict) -> str:
+    """Sunucu metriklerini formatla"""
+    if arguments["format"] == "prometheus":
+        return snapshot.to_prometheus()
+    if not snapshot.enabled:
+        return "📈 Metrikler kapalı (GITHUB_METRICS=0)"
+    
+    def latency(hist: LatencyHistogram) -> str:
+        return (
+            f"p50 {hist.percentile(0.5) * 1000:.0f} ms / "
+            f"p95 {hist.percentile(0.95) * 1000:.0f} ms / "
+            f"p99 {hist.percentile(0.99) * 1000:.0f} ms"
         )
+    
+    def table(title: str, rows: Dict[str, OperationStats], with_bytes: bool = False) -> str:
+        if not rows:
+            return f"**{title}:** Henüz kayıt yok"
+        lines = [f"**{title}:**"]
+        for key, stats in sorted(rows.items(), key=lambda item: -item[1].count):
+            line = f"- {key}: {stats.count} çağrı, {stats.errors} hata, {latency(stats.latency)}"
+            if with_bytes:
+                line += f", {stats.bytes_received / 1024:.1f} KB alındı"
+            lines.append(line)
+        return "\n".join(lines)
+    
+    elapsed = max(time.time() - snapshot.started_at, 1e-9)
+    total_calls = sum(s.count for s in snapshot.tools.values())
+    phases = [f"- {phase}: {latency(hist)}" for phase, hist in sorted(snapshot.phases.items())]
+    counters = [
+        f"- {group}: " + ", ".join(f"{k}={v}" for k, v in values.items())
+        for group, values in snapshot.counters().items()
     ]
+    
+    return (
+        f"📈 Sunucu Metrikleri ({elapsed:.0f} sn, {total_calls / elapsed:.2f} çağrı/sn):\n\n" +
+        table("Tool'lar", snapshot.tools) + "\n\n" +
+        table("Uç noktalar", snapshot.endpoints, with_bytes=True) + "\n\n" +
+        "**Aşamalar:**\n" + ("\n".join(phases) if phases else "Henüz kayıt yok") + "\n\n" +
+        "**Sayaçlar:**\n" + "\n".join(counters)
+    )
+
+@tool(
+    name="server_metrics",
+    description="Tool ve GitHub uç noktası bazında çağrı, hata, gecikme ve önbellek metriklerini göster",
+    properties={
+        "format": {
+            "type": "string",
+            "description": "Çıktı biçimi: text veya prometheus",
+            "enum": ["text", "prometheus"],
+            "default": "text"
+        },
+        "reset": {
+            "type": "boolean",
+            "description": "Gösterdikten sonra ölçümleri sıfırla",
+            "default": False
+        }
+    },
+    formatter=format_server_metrics
+)
+async def server_metrics(arguments: dict) -> Metrics:
+    """Metrikleri döndür, istenirse yeni bir ölçüm dönemi başlat"""
+    if not arguments["reset"]:
+        return metrics
+    # Gösterilecek kopya korunur, canlı ölçümler sıfırlanır
+    snapshot = Metrics(metrics.enabled)
+    snapshot.tools, snapshot.endpoints = metrics.tools, metrics.endpoints
+    snapshot.phases, snapshot.started_at = metrics.phases, metrics.started_at
+    metrics.reset()
+    return snapshot
+
+# Arka plan işleri
+class Job:
+    """Arka planda çalışan tek bir tool çağrısı"""
+
+    # Saklanan en fazla ilerleme mesajı
+    MESSAGE_LIMIT = 50
+
+    def __init__(self, tool_name: str, arguments: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.tool = tool_name
+        self.arguments = arguments
+        self.status = "running"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.progress: Optional[float] = None
+        self.total: Optional[float] = None
+        self.messages: List[str] = []
+        self.result: Optional[List[str]] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def report(self, progress: float, total: Optional[float], message: Optional[str]) -> None:
+        """report_progress'ten gelen ilerlemeyi kaydet"""
+        self.progress, self.total = progress, total
+        if message:
+            self.messages.append(message)
+            del self.messages[:-self.MESSAGE_LIMIT]
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def elapsed(self) -> float:
+        """Başlangıçtan bitişe (ya da şu ana) geçen süre"""
+        return (self.finished_at or time.time()) - self.created_at
+
+class JobRegistry:
+    """Arka plan işlerinin kaydı; bitenler JOB_TTL sonra ilk erişimde silinir"""
+
+    def __init__(self, ttl: float = JOB_TTL, max_running: int = JOB_MAX_RUNNING):
+        self.ttl = ttl
+        self.max_running = max_running
+        self.jobs: Dict[str, Job] = {}
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.expired = 0
+
+    def sweep(self) -> None:
+        """Süresi dolan bitmiş işleri sil"""
+        cutoff = time.time() - self.ttl
+        for job_id in [j.id for j in self.jobs.values() if j.done and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+            self.expired += 1
+
+    def running(self) -> int:
+        return sum(1 for job in self.jobs.values() if not job.done)
+
+    def start(self, spec: ToolSpec, arguments: dict) -> Job:
+        """Tool'u arka plan görevi olarak başlat"""
+        self.sweep()
+        if self.running() >= self.max_running:
+            raise ValueError(f"Aynı anda en fazla {self.max_running} iş çalışabilir; önce bitmelerini bekleyin")
+        job = Job(spec.name, arguments)
+        self.jobs[job.id] = job
+        job.task = asyncio.ensure_future(self._run(job, spec, arguments))
+        return job
+
+    async def _run(self, job: Job, spec: ToolSpec, arguments: dict) -> None:
+        # Görev kendi bağlam kopyasında çalışır; değişken yalnızca bu işi etkiler
+        current_job.set(job)
+        try:
+            text = await run_tool(spec, arguments)
+            job.result = [text] if isinstance(text, str) else text
+            job.status = "completed"
+            self.completed += 1
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            self.cancelled += 1
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+            self.failed += 1
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Job:
+        """İşi bul; yoksa ya da süresi dolduysa hata ver"""
+        self.sweep()
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"Job bulunamadı: {job_id} (süresi dolmuş olabilir)")
+        return job
+
+    def cancel_all(self) -> None:
+        """Kapanışta çalışan tüm işleri iptal et"""
+        for job in self.jobs.values():
+            if job.task is not None and not job.done:
+                job.task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """İş sayaçlarını döndür"""
+        return {
+            "running": self.running(),
+            "stored": len(self.jobs),
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+        }
+
+jobs = JobRegistry()
+
+JOB_STATUS_EMOJI = {"running": "⏳", "completed": "✅", "failed": "❌", "cancelled": "🚫"}
+
+def format_job_started(job: Job) -> str:
+    """Başlatılan işi formatla"""
+    return (
+        f"🕒 {job.tool} arka planda başlatıldı.\n\n"
+        f"**Job ID:** {job.id}\n"
+        f"Durum için get_job_status, sonuç için get_job_result kullanın."
+    )
+
+def format_job_line(job: Job) -> str:
+    """İşin tek satırlık özeti"""
+    line = f"{JOB_STATUS_EMOJI[job.status]} {job.id} - {job.tool} ({job.status}, {job.elapsed():.1f} sn)"
+    if job.progress is not None:
+        line += f" | ilerleme: {job.progress:g}" + (f"/{job.total:g}" if job.total is not None else "")
+    return line
+
+def format_get_job_status(result: List[Job], arguments: dict) -> str:
+    """İş durumlarını formatla"""
+    if not result:
+        return "Kayıtlı iş yok."
+    if "job_id" not in arguments:
+        return "🗂️ İşler:\n\n" + "\n".join(format_job_line(job) for job in result)
+    
+    job = result[0]
+    lines = [format_job_line(job)]
+    if job.error:
+        lines.append(f"**Hata:** {job.error}")
+    if job.messages:
+        lines.append("\n**Son ilerleme mesajları:**")
+        lines.extend(f"- {message}" for message in job.messages[-10:])
+    return "\n".join(lines)
+
+@tool(
+    name="get_job_status",
+    description="Arka plan işinin (job) durumunu ve ilerlemesini göster; job_id verilmezse tüm işleri listele",
+    properties={
+        "job_id": JOB_ID_PROPERTY
+    },
+    formatter=format_get_job_status
+)
+async def get_job_status(arguments: dict) -> List[Job]:
+    """İşi ya da tüm işleri döndür"""
+    if "job_id" in arguments:
+        return [jobs.get(arguments["job_id"])]
+    jobs.sweep()
+    return sorted(jobs.jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+def format_get_job_result(job: Job, arguments: dict) -> Union[str, List[str]]:
+    """Biten işin çıktısını aynen, bitmeyenin ara durumunu döndür"""
+    if job.status == "completed":
+        return job.result
+    if job.status == "failed":
+        return f"❌ Job {job.id} ({job.tool}) başarısız: {job.error}"
+    if job.status == "cancelled":
+        return f"🚫 Job {job.id} ({job.tool}) iptal edildi."
+    
+    lines = [f"⏳ Job {job.id} ({job.tool}) henüz bitmedi.", "", format_job_line(job)]
+    if job.messages:
+        lines.append("\n**Ara çıktı:**")
+        lines.extend(f"- {message}" for message in job.messages)
+    return "\n".join(lines)
+
+@tool(
+    name="get_job_result",
+    description="Arka plan işinin sonucunu getir; bitmediyse ilerleme ve ara çıktıyı göster",
+    properties={
+        "job_id": JOB_ID_PROPERTY,
+        "wait": {
+            "type": "number",
+            "description": f"İş bitmediyse en fazla bu kadar saniye bekle (üst sınır {JOB_MAX_WAIT:g})",
+            "default": 0
+        }
+    },
+    required=("job_id",),
+    formatter=format_get_job_result
+)
+async def get_job_result(arguments: dict) -> Job:
+    """İşi döndür; istenirse bitmesini bir süre bekle"""
+    job = jobs.get(arguments["job_id"])
+    wait = min(arguments["wait"], JOB_MAX_WAIT)
+    if not job.done and wait > 0:
+        # wait görevi iptal etmez, yalnızca bekler
+        await asyncio.wait({job.task}, timeout=wait)
+    return job
+
+def format_cancel_job(job: Job, arguments: dict) -> str:
+    """İptal sonucunu formatla"""
+    if job.status == "cancelled":
+        return f"🚫 Job {job.id} ({job.tool}) iptal edildi."
+    return f"ℹ️ Job {job.id} zaten bitmiş: {job.status}"
+
+@tool(
+    name="cancel_job",
+    description="Çalışan arka plan işini iptal et",
+    properties={
+        "job_id": JOB_ID_PROPERTY
+    },
+    required=("job_id",),
+    formatter=format_cancel_job
+)
+async def cancel_job(arguments: dict) -> Job:
+    """İşi iptal et ve görevin durmasını bekle"""
+    job = jobs.get(arguments["job_id"])
+    if not job.done:
+        job.task.cancel()
+        await asyncio.wait({job.task})
+    return job
+
+# MCP handler'ları
+_tool_list: Optional[List[types.Tool]] = None
+
+async def handle_list_tools() -> list[types.Tool]:
+    """Mevcut tool'ları listele"""
+    global _tool_list
+    # Kayıt içe aktarma sırasında tamamlanır, liste bir kez oluşturulur
+    if _tool_list is None:
+        _tool_list = [
+            types.Tool(name=spec.name, description=spec.description, inputSchema=spec.input_schema)
+            for spec in TOOLS.values()
+        ]
+    return _tool_list
 
-# Tool handler'ları
-@app.call_tool()
 async def handle_call_tool(
     name: str, arguments: dict | None
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     """Tool çağrılarını işle"""
-    
-    if not arguments:
-        raise ValueError("Argüman gerekli")
-    
     try:
-        if name == "create_pull_request":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            
-            data = {
-                "title": arguments["title"],
-                "body": arguments["body"],
-                "head": arguments["head"],
-                "base": arguments.get("base", "main"),
-                "draft": arguments.get("draft", False)
-            }
-            
-            result = await github_request(
-                "POST",
-                f"/repos/{owner}/{repo}/pulls",
-                json=data
-            )
-            
-            return [types.TextContent(
-                type="text",
-                text=f"✅ Pull Request #{result['number']} oluşturuldu!\n\n"
-                     f"**Başlık:** {result['title']}\n"
-                     f"**URL:** {result['html_url']}\n"
-                     f"**Durum:** {result['state']}\n"
-                     f"**Draft:** {'Evet' if result['draft'] else 'Hayır'}"
-            )]
-        
-        elif name == "list_pull_requests":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            state = arguments.get("state", "open")
-            limit = arguments.get("limit", 10)
-            
-            params = {
-                "state": state,
-                "per_page": limit,
-                "sort": "created",
-                "direction": "desc"
-            }
-            
-            result = await github_request(
-                "GET",
-                f"/repos/{owner}/{repo}/pulls",
-                params=params
-            )
-            
-            if not result:
-                return [types.TextContent(
-                    type="text",
-                    text=f"Repository'de {state} durumunda pull request bulunamadı."
-                )]
-            
-            pr_list = []
-            for pr in result:
-                pr_list.append(
-                    f"#{pr['number']} - {pr['title']}\n"
-                    f"   Durum: {pr['state']} | Oluşturan: {pr['user']['login']}\n"
-                    f"   URL: {pr['html_url']}"
-                )
-            
-            return [types.TextContent(
-                type="text",
-                text=f"📋 {owner}/{repo} repository'sindeki {state} pull request'ler:\n\n" + 
-                     "\n\n".join(pr_list)
-            )]
-        
-        elif name == "get_pull_request":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            pr_number = arguments["pr_number"]
-            
-            result = await github_request(
-                "GET",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}"
-            )
-            
-            # Review'ları da al
-            reviews = await github_request(
-                "GET",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
-            )
-            
-            review_summary = []
-            for review in reviews:
-                review_summary.append(f"- {review['user']['login']}: {review['state']}")
-            
-            return [types.TextContent(
-                type="text",
-                text=f"🔍 Pull Request #{pr_number} Detayları:\n\n"
-                     f"**Başlık:** {result['title']}\n"
-                     f"**Açıklama:** {result['body'] or 'Açıklama yok'}\n"
-                     f"**Durum:** {result['state']}\n"
-                     f"**Oluşturan:** {result['user']['login']}\n"
-                     f"**Branch:** {result['head']['ref']} → {result['base']['ref']}\n"
-                     f"**Oluşturulma:** {result['created_at']}\n"
-                     f"**Değişiklik:** +{result['additions']} / -{result['deletions']}\n"
-                     f"**Review'lar:**\n" + ("\n".join(review_summary) if review_summary else "Henüz review yok") + "\n"
-                     f"**URL:** {result['html_url']}"
-            )]
-        
-        elif name == "add_pr_comment":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            pr_number = arguments["pr_number"]
-            
-            data = {
-                "body": arguments["comment"]
-            }
-            
-            result = await github_request(
-                "POST",
-                f"/repos/{owner}/{repo}/issues/{pr_number}/comments",
-                json=data
-            )
-            
-            return [types.TextContent(
-                type="text",
-                text=f"💬 Yorum eklendi!\n\n"
-                     f"**PR #:** {pr_number}\n"
-                     f"**Yorum:** {result['body']}\n"
-                     f"**URL:** {result['html_url']}"
-            )]
-        
-        elif name == "add_pr_review":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            pr_number = arguments["pr_number"]
-            
-            data = {
-                "body": arguments["body"],
-                "event": arguments.get("event", "COMMENT")
-            }
-            
-            result = await github_request(
-                "POST",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/reviews",
-                json=data
-            )
-            
-            event_map = {
-                "APPROVE": "✅ Onaylandı",
-                "REQUEST_CHANGES": "❌ Değişiklik İstendi",
-                "COMMENT": "💭 Yorum"
-            }
-            
-            return [types.TextContent(
-                type="text",
-                text=f"📝 Review eklendi!\n\n"
-                     f"**PR #:** {pr_number}\n"
-                     f"**Durum:** {event_map.get(data['event'], data['event'])}\n"
-                     f"**Yorum:** {result['body']}\n"
-                     f"**URL:** {result['html_url']}"
-            )]
-        
-        elif name == "merge_pull_request":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            pr_number = arguments["pr_number"]
-            
-            data = {
-                "merge_method": arguments.get("merge_method", "merge")
-            }
-            
-            if "commit_title" in arguments:
-                data["commit_title"] = arguments["commit_title"]
-            
-            result = await github_request(
-                "PUT",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/merge",
-                json=data
-            )
-            
-            return [types.TextContent(
-                type="text",
-                text=f"🎉 Pull Request #{pr_number} başarıyla merge edildi!\n\n"
-                     f"**SHA:** {result['sha']}\n"
-                     f"**Mesaj:** {result['message']}"
-            )]
-        
-        elif name == "close_pull_request":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            pr_number = arguments["pr_number"]
-            
-            data = {
-                "state": "closed"
-            }
-            
-            result = await github_request(
-                "PATCH",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}",
-                json=data
-            )
-            
-            return [types.TextContent(
-                type="text",
-                text=f"🔒 Pull Request #{pr_number} kapatıldı.\n\n"
-                     f"**Başlık:** {result['title']}\n"
-                     f"**URL:** {result['html_url']}"
-            )]
-        
-        elif name == "update_pull_request":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            pr_number = arguments["pr_number"]
-            
-            data = {}
-            if "title" in arguments:
-                data["title"] = arguments["title"]
-            if "body" in arguments:
-                data["body"] = arguments["body"]
-            if "state" in arguments:
-                data["state"] = arguments["state"]
-            
-            result = await github_request(
-                "PATCH",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}",
-                json=data
-            )
-            
-            return [types.TextContent(
-                type="text",
-                text=f"✏️ Pull Request #{pr_number} güncellendi!\n\n"
-                     f"**Başlık:** {result['title']}\n"
-                     f"**Durum:** {result['state']}\n"
-                     f"**URL:** {result['html_url']}"
-            )]
-        
-        elif name == "add_pr_reviewers":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            pr_number = arguments["pr_number"]
-            
-            data = {
-                "reviewers": arguments["reviewers"]
-            }
-            
-            if "team_reviewers" in arguments:
-                data["team_reviewers"] = arguments["team_reviewers"]
-            
-            result = await github_request(
-                "POST",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/requested_reviewers",
-                json=data
-            )
-            
-            reviewers = [r['login'] for r in result['users']]
-            teams = [t['name'] for t in result['teams']]
-            
-            return [types.TextContent(
-                type="text",
-                text=f"👥 Reviewer'lar eklendi!\n\n"
-                     f"**PR #:** {pr_number}\n"
-                     f"**Kullanıcılar:** {', '.join(reviewers) if reviewers else 'Yok'}\n"
-                     f"**Takımlar:** {', '.join(teams) if teams else 'Yok'}"
-            )]
-        
-        elif name == "get_pr_files":
-            owner, repo = await parse_repo_url(arguments["repo_url"])
-            pr_number = arguments["pr_number"]
-            
-            result = await github_request(
-                "GET",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
-            )
-            
-            files_summary = []
-            for file in result:
-                status_emoji = {
-                    "added": "➕",
-                    "modified": "📝",
-                    "removed": "➖",
-                    "renamed": "📋"
-                }.get(file['status'], "❓")
-                
-                files_summary.append(
-                    f"{status_emoji} {file['filename']} "
-                    f"(+{file['additions']}/-{file['deletions']})"
-                )
-            
-            return [types.TextContent(
-                type="text",
-                text=f"📁 Pull Request #{pr_number} Dosya Değişiklikleri:\n\n" +
-                     "\n".join(files_summary) +
-                     f"\n\n**Toplam:** {len(result)} dosya değişti"
-            )]
-        
-        else:
-            raise ValueError(f"Bilinmeyen tool: {name}")
-    
+        return await dispatch_tool(name, arguments or {})
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"❌ Hata: {str(e)}"
         )]
 
+async def dispatch_tool(
+    name: str, arguments: dict
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Tool'u doğrula, çalıştır ve formatla; hataları çağırana bırak"""
+    spec = TOOLS.get(name)
+    if spec is None:
+        raise ValueError(f"Bilinmeyen tool: {name}")
+    
+    if spec.background and arguments.get("async"):
+        # Argüman hataları job açılmadan hemen bildirilir
+        job = jobs.start(spec, spec.validate(arguments, ""))
+        return text_contents(format_job_started(job))
+    return text_contents(await run_tool(spec, arguments))
+
+async def run_tool(spec: ToolSpec, arguments: dict) -> Union[str, List[str]]:
+    """Tool'u doğrula, çalıştır ve formatlayıcı çıktısını döndür"""
+    if not metrics.enabled:
+        arguments = spec.validate(arguments, "")
+        result = await spec.handler(arguments)
+        return spec.formatter(result, arguments)
+    
+    name = spec.name
+    started = time.perf_counter()
+    try:
+        arguments = spec.validate(arguments, "")
+        result = await spec.handler(arguments)
+        format_started = time.perf_counter()
+        text = spec.formatter(result, arguments)
+        metrics.observe_phase("format", time.perf_counter() - format_started)
+    except BaseException:
+        metrics.observe_tool(name, time.perf_counter() - started, error=True)
+        raise
+    metrics.observe_tool(name, time.perf_counter() - started, error=False)
+    return text
+
+def text_contents(text: Union[str, List[str]]) -> list[types.TextContent]:
+    """Formatlayıcı çıktısını (tek metin ya da parça listesi) TextContent listesine çevir"""
+    chunks = [text] if isinstance(text, str) else text
+    return [types.TextContent(type="text", text=chunk) for chunk in chunks]
+
+def create_app():
+    """MCP sunucusunu oluşturup handler'ları kaydet"""
+    from mcp.server import Server
+    
+    server = Server(SERVER_NAME)
+    server.list_tools()(handle_list_tools)
+    server.call_tool()(handle_call_tool)
+    return server
+
+def answer_initialize() -> None:
+    """stdin'deki initialize isteğini mcp sunucusu yüklenmeden yanıtla (GITHUB_FAST_INITIALIZE=1)
+    
+    Yanıt, mcp'nin ServerSession'ının ürettiğiyle aynıdır; desteklenen protokol sürümleri
+    elle tutulmaz, mcp paketinden okunur. Oturumun geri kalanı stateless modda mcp'ye devredilir.
+    """
+    # Yalnızca sürüm sabitleri yüklenir (mcp.types); sunucu ve stdio katmanı sonra içe aktarılır
+    from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
+    from mcp.types import LATEST_PROTOCOL_VERSION
+    
+    line = b""
+    while not line.strip():
+        line = sys.stdin.buffer.readline()
+        if not line:
+            sys.exit(0)
+    message = json.loads(line)
+    if message.get("method") != "initialize" or "id" not in message:
+        # MCP yaşam döngüsünde ilk mesaj initialize olmak zorundadır
+        print(f"Hata: ilk mesaj initialize değil: {message.get('method')}", file=sys.stderr)
+        sys.exit(1)
+    requested = (message.get("params") or {}).get("protocolVersion")
+    result = {
+        "protocolVersion": requested if requested in SUPPORTED_PROTOCOL_VERSIONS else LATEST_PROTOCOL_VERSION,
+        "capabilities": {"experimental": {}, "tools": {"listChanged": False}},
+        "serverInfo": {"name": SERVER_NAME, "version": SERVER_VERSION},
+    }
+    sys.stdout.buffer.write(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}).encode() + b"\n")
+    sys.stdout.buffer.flush()
+
 # Ana fonksiyon
 async def main():
-    # Sunucuyu stdio üzerinden çalıştır
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="github-pr-server",
-                server_version="0.1.0",
-                capabilities=app.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    global app
+    if not token_pool.credentials:
+        print("Hata: GITHUB_TOKEN, GITHUB_TOKENS veya GITHUB_TOKEN_POOL_FILE tanımlanmamış", file=sys.stderr)
+        sys.exit(1)
+    if any(c.is_app for c in token_pool.credentials) and importlib.util.find_spec("jwt") is None:
+        print("Uyarı: GitHub App token'ları için PyJWT yüklü değil (pip install \"pyjwt[crypto]\")", file=sys.stderr)
+    if FAST_INITIALIZE:
+        answer_initialize()
+    # mcp burada içe aktarılır; HTTP client ilk tool çağrısında oluşturulur
+    import mcp.server.stdio
+    from mcp.server import NotificationOptions
+    from mcp.server.models import InitializationOptions
+    
+    app = create_app()
+    background_tasks = []
+    metrics_server = None
+    if METRICS_FILE:
+        background_tasks.append(asyncio.create_task(write_metrics_file(METRICS_FILE, METRICS_FILE_INTERVAL)))
+    if METRICS_PORT:
+        metrics_server = await start_metrics_server(METRICS_PORT)
+    if WEBHOOK_PORT and not WEBHOOK_SECRET:
+        print("Uyarı: GITHUB_WEBHOOK_SECRET olmadan webhook dinleyicisi başlatılmaz", file=sys.stderr)
+    if webhook_listener is not None:
+        await webhook_listener.start(WEBHOOK_HOST, WEBHOOK_PORT)
+    try:
+        # Sunucuyu stdio üzerinden çalıştır
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name=SERVER_NAME,
+                    server_version=SERVER_VERSION,
+                    capabilities=app.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+                stateless=FAST_INITIALIZE,
+            )
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        if metrics_server is not None:
+            metrics_server.close()
+        if webhook_listener is not None:
+            webhook_listener.close()
+        jobs.cancel_all()
+        await cleanup()
 
 # Cleanup
 async def cleanup():
-    await http_client.aclose()
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+# Başlangıç profili
+# İlk içe aktarmada yüklenmemesi gereken ağır bağımlılıklar
+DEFERRED_MODULES = ("mcp.server.stdio", "mcp.types", "httpx")
+
+def profile_startup(runs: int = 5) -> None:
+    """Modül içe aktarma dökümünü ve süreç başlangıcından ilk initialize yanıtına kadar geçen süreyi raporla"""
+    import subprocess
+    
+    script = os.path.abspath(__file__)
+    module_dir, module_name = os.path.split(os.path.splitext(script)[0])
+    env = dict(os.environ, GITHUB_TOKEN=GITHUB_TOKEN or "profile-startup")
+    
+    # 1) -X importtime çıktısından bu modülün doğrudan içe aktarmaları
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys; sys.path.insert(0, {module_dir!r}); import {module_name}"],
+        env=env, capture_output=True, text=True, check=True
+    )
+    rows, total, loaded_modules = [], 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # Girinti derinliği: " ad" en üst seviye, "   ad" onun doğrudan içe aktarması
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        loaded_modules.add(name.strip())
+        if depth == 0:
+            if name.strip() == module_name:
+                total = int(cumulative)
+                break
+            # Alt içe aktarmalar üst modülden önce yazılır; başka modülünküler atılır
+            rows = []
+        elif depth == 1:
+            rows.append((int(cumulative), name.strip()))
+    print(f"⏱️ {module_name} içe aktarma: {total / 1000:.1f} ms")
+    for cumulative, name in sorted(rows, reverse=True)[:10]:
+        print(f"  {name:<28} {cumulative / 1000:8.1f} ms")
+    loaded = [name for name in DEFERRED_MODULES if name in loaded_modules]
+    print(f"  Ertelenen modüller içe aktarmada yüklendi: {', '.join(loaded) or 'hiçbiri'}")
+    
+    # 2) Süreç başlangıcından initialize yanıtına kadar geçen süre (GITHUB_FAST_INITIALIZE ortamdan alınır)
+    from mcp.types import LATEST_PROTOCOL_VERSION
+    
+    # Betik olarak çalıştırılan dosya her seferinde derlenir; -m ile önbellekteki .pyc kullanılır
+    request = json.dumps({
+        "jsonrpc": "2.0", "id": 1, "method": "initialize",
+        "params": {
+            "protocolVersion": LATEST_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "profile-startup", "version": "0"}
+        }
+    }).encode() + b"\n"
+    launches = {
+        "betik": [sys.executable, script],
+        "-m": [sys.executable, "-m", module_name],
+    }
+    for label, command in launches.items():
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            process = subprocess.Popen(
+                command, env=env, cwd=module_dir,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+            try:
+                process.stdin.write(request)
+                process.stdin.flush()
+                response = process.stdout.readline()
+                timings.append(time.perf_counter() - started)
+            finally:
+                process.stdin.close()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            if b'"result"' not in response:
+                print(f"❌ initialize yanıtı alınamadı ({label}): {response[:200]!r}")
+                return
+        timings.sort()
+        print(
+            f"⏱️ Başlangıçtan initialize yanıtına ({label}, {runs} çalıştırma): "
+            f"en iyi {timings[0] * 1000:.1f} ms | medyan {timings[len(timings) // 2] * 1000:.1f} ms"
+        )
+    
+    # 3) İlk kullanıma ertelenen içe aktarmaların maliyeti
+    for name in DEFERRED_MODULES:
+        if name in sys.modules:
+            continue
+        started = time.perf_counter()
+        importlib.import_module(name)
+        print(f"  {name:<28} {(time.perf_counter() - started) * 1000:8.1f} ms (ilk kullanımda)")
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv[1:]:
+        profile_startup()
+        sys.exit(0)
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        pass
-    finally:
-        asyncio.run(cleanup())
\ No newline at end of file
+        pass
\ No newline at end of file